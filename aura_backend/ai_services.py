@@ -5,7 +5,7 @@ Maintains backward compatibility while adding multi-provider support
 """
 
 from providers.provider_registry import provider_registry, ServiceType
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, AsyncIterator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -129,6 +129,58 @@ class LLMService(AIServiceAdapter):
             logger.error(f"LLM service error: {str(e)}")
             return None
 
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Chat completion with provider selection"""
+        try:
+            result = await self._execute_with_fallback(
+                method_name="chat_completion",
+                provider=provider,
+                model=model,
+                messages=messages,
+                **kwargs
+            )
+            
+            if result.get("success"):
+                return result["result"]
+            else:
+                return {"success": False, "error": result.get("error", "Chat completion failed")}
+                
+        except Exception as e:
+            logger.error(f"LLM service error: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream chat completion text with provider selection.
+        Falls back to another provider only before the first chunk; raises ProviderError
+        if no provider could start the stream.
+        """
+        stream = self.registry.stream_with_fallback(
+            service_type=self.service_type,
+            method_name="stream_chat_completion",
+            provider_name=provider,
+            model=model,
+            messages=messages,
+            **kwargs
+        )
+        try:
+            async for chunk in stream:
+                yield chunk["delta"]
+        finally:
+            await stream.aclose()
+
 class VLMService(AIServiceAdapter):
     """Vision-Language Model service adapter"""
     
@@ -223,6 +275,33 @@ class TTSService(AIServiceAdapter):
         except Exception as e:
             logger.error(f"TTS service error: {str(e)}")
             return None
+    
+    async def stream_speech(
+        self,
+        text: str,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        voice: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream speech audio chunks with provider selection.
+        Falls back to another provider only before the first chunk.
+        """
+        stream = self.registry.stream_with_fallback(
+            service_type=self.service_type,
+            method_name="stream_speech",
+            provider_name=provider,
+            model=model,
+            text=text,
+            voice=voice,
+            **kwargs
+        )
+        try:
+            async for chunk in stream:
+                yield chunk["delta"]
+        finally:
+            await stream.aclose()
 
 # Global service instances for backward compatibility
 stt_service = STTService()
@@ -37,15 +37,26 @@ class ProviderResponse(BaseModel):
     data: Optional[Dict[str, Any]] = None
 
 @provider_router.get("/health", response_model=Dict[str, Any])
-async def check_providers_health():
-    """Check health status of all AI providers"""
+async def check_providers_health(
+    refresh: bool = Query(False, description="Probe providers now instead of serving the cached status")
+):
+    """Check health status of all AI providers (cached by the background prober)"""
     try:
-        health_status = await provider_registry.health_check()
+        health_status = await provider_registry.health_check(refresh=refresh)
         return health_status
     except Exception as e:
         logger.error(f"Health check error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@provider_router.get("/metrics", response_model=Dict[str, Any])
+async def get_provider_metrics():
+    """Get provider call metrics (hedging, latency percentiles)"""
+    try:
+        return provider_registry.get_metrics()
+    except Exception as e:
+        logger.error(f"Provider metrics error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @provider_router.get("/info", response_model=Dict[str, Any])
 async def get_providers_info():
     """Get detailed information about all providers"""
@@ -1,28 +1,62 @@
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph, START, END
+from checkpointers import BoundedMemorySaver, SQLiteWALSaver
 from langsmith import Client, traceable
 from langchain_core.tracers.langchain import LangChainTracer
-from typing import Dict, Any, Literal
+from typing import Callable, Dict, Any, Literal, Optional
+from collections import OrderedDict, deque
+from functools import partial
+import asyncio
 import logging
 import time
 import traceback
-import json
+import uuid
 import os
 
 from nodes import (
     stt_node, intent_node, ui_check_node, 
     vlm_node, action_planner_node, tts_node
 )
+from graph_state import AuraState, new_turn
+from providers.deadline import deadline_scope
+from optimized_intent_analyzer import optimized_intent_analyzer
+from utils.speculation import speculative_vlm
+from utils.blob_store import blob_store
+from utils.prepared_inputs import prepared_screenshots
+from utils.logging_config import lazy_json
+from utils.request_tasks import RequestCancelled
+from utils.session_lanes import SessionLanes
 
 logger = logging.getLogger(__name__)
 
+# Input shapes that get their own compiled graph
+GRAPH_SHAPES = ("text", "text_screen", "voice", "voice_screen")
+
 class AuraGraph:
     """LangGraph orchestrator for AURA voice assistant with LangSmith tracing"""
     
     def __init__(self):
         # Initialize LangSmith if configured
         self._setup_langsmith()
-        self.graph = self._build_graph()
+        
+        # Conversation state checkpointer, shared by every compiled graph
+        self.checkpointer = self._build_checkpointer()
+        
+        # One compiled graph per input shape, so a request only walks nodes it can use
+        self.graphs = {shape: self._build_graph(shape) for shape in GRAPH_SHAPES}
+        self.shape_stats = {shape: 0 for shape in GRAPH_SHAPES}
+        self.graph = self.graphs["voice_screen"]
+        
+        # Turns on a session share its checkpointer thread, so they are queued rather than raced
+        self.session_lanes = SessionLanes()
+        
+        # Instant/cached text intents are answered without invoking the graph
+        self.fast_path_enabled = os.getenv("GRAPH_FAST_PATH", "true").lower() == "true"
+        self.fast_path_stats = {"hits": 0, "misses": 0}
+        
+        # Recent turns per session, bounded in both turns and sessions
+        self.history_turns = int(os.getenv("SESSION_HISTORY_TURNS", "20"))
+        self.history_max_sessions = int(os.getenv("SESSION_HISTORY_MAX_SESSIONS", "1000"))
+        self._session_history: OrderedDict = OrderedDict()
         logger.info("AURA Graph initialized with LangGraph orchestration and LangSmith tracing")
         
     def _setup_langsmith(self):
@@ -51,109 +85,153 @@ class AuraGraph:
             self.langsmith_client = None
             self.project_name = None
         
-    def _build_graph(self):
-        """Build the LangGraph workflow"""
+    def _build_graph(self, shape: str = "voice_screen"):
+        """Build the LangGraph workflow for an input shape, with only the nodes that shape can use"""
+        has_audio, has_screen = shape.startswith("voice"), shape.endswith("_screen")
         
-        # Create state graph with proper typing
-        workflow = StateGraph(dict)
+        # Typed state: one channel per key, so nodes return deltas and checkpoints store only what changed
+        workflow = StateGraph(AuraState)
         
-        # Add all nodes
-        workflow.add_node("stt", stt_node.run)
-        workflow.add_node("intent", intent_node.run)
+        # Add the nodes this input shape can reach
+        if has_audio:
+            workflow.add_node("stt", stt_node.run)
+        workflow.add_node("intent_analysis", intent_node.run)  # "intent" is a state key
         workflow.add_node("ui_check", ui_check_node.run)
-        workflow.add_node("vlm", vlm_node.run)
+        if has_screen:
+            workflow.add_node("vlm", vlm_node.run)
         workflow.add_node("action_planner", action_planner_node.run)
-        workflow.add_node("tts", tts_node.run)
+        # Text input is answered in text (/chat), so that shape only builds the response text
+        workflow.add_node("tts", tts_node.run if has_audio else partial(tts_node.run, synthesize=False))
         
-        # Set entry point
-        workflow.set_entry_point("stt")
-        
-        # Add sequential edges
-        workflow.add_edge("stt", "intent")
-        workflow.add_edge("intent", "ui_check")
+        # Set entry point (text input is already transcribed)
+        if has_audio:
+            workflow.set_entry_point("stt")
+            workflow.add_edge("stt", "intent_analysis")
+        else:
+            workflow.set_entry_point("intent_analysis")
+        workflow.add_edge("intent_analysis", "ui_check")
         
-        # Add conditional routing from ui_check
+        # Add conditional routing from ui_check; without a screenshot there is nothing for the VLM
+        # to look at, so the plan comes from the intent alone
         workflow.add_conditional_edges(
             "ui_check",
             self._route_after_ui_check,
             {
-                "use_vlm": "vlm",
+                "use_vlm": "vlm" if has_screen else "action_planner",
                 "has_action_plan": "tts",
                 "error": "tts"
             }
         )
         
         # VLM path
-        workflow.add_edge("vlm", "action_planner")
+        if has_screen:
+            workflow.add_edge("vlm", "action_planner")
         workflow.add_edge("action_planner", "tts")
         
         # Final edge
         workflow.add_edge("tts", END)
         
-        # Add memory for conversation state
-        memory = MemorySaver()
-        
-        # Compile with memory and automatic LangSmith tracing
-        # The environment variables set in _setup_langsmith() enable automatic tracing
-        compiled_graph = workflow.compile(checkpointer=memory)
+        # Compile with the shared checkpointer (every shape continues the same session thread)
+        # and automatic LangSmith tracing, enabled by the environment variables set in _setup_langsmith()
+        compiled_graph = workflow.compile(checkpointer=self.checkpointer)
         
         if self.langsmith_client:
-            logger.info("Graph compiled with LangSmith automatic tracing enabled")
+            logger.info(f"Graph '{shape}' compiled with LangSmith automatic tracing enabled")
         else:
-            logger.info("Graph compiled without LangSmith tracing")
+            logger.info(f"Graph '{shape}' compiled without LangSmith tracing")
             
         return compiled_graph
     
+    @staticmethod
+    def _input_shape(state: Dict[str, Any]) -> str:
+        """Which compiled graph a request needs: text or voice, with or without a screenshot"""
+        has_audio = state.get("audio_blob") or state.get("_audio_bytes")
+        has_screen = (state.get("screenshot_blob") or state.get("_screenshot_bytes")
+                      or prepared_screenshots.has(state.get("request_id")))
+        return ("voice" if has_audio else "text") + ("_screen" if has_screen else "")
+    
+    def _graph_for(self, state: Dict[str, Any]):
+        """Compiled graph for the request's input shape"""
+        shape = self._input_shape(state)
+        self.shape_stats[shape] += 1
+        return self.graphs[shape]
+    
+    def _build_checkpointer(self):
+        """Checkpointer selected by CHECKPOINTER: bounded in-memory (default) or SQLite shared by all workers"""
+        max_per_session = int(os.getenv("CHECKPOINT_MAX_PER_SESSION", "10"))
+        ttl_seconds = float(os.getenv("CHECKPOINT_SESSION_TTL_SECONDS", "1800"))
+        backend = os.getenv("CHECKPOINTER", "memory").lower()
+        
+        if backend == "sqlite":
+            return SQLiteWALSaver(
+                path=os.getenv("CHECKPOINT_SQLITE_PATH", "aura_checkpoints.db"),
+                max_checkpoints_per_session=max_per_session,
+                session_ttl_seconds=ttl_seconds
+            )
+        if backend != "memory":
+            logger.warning(f"Unknown CHECKPOINTER '{backend}', using memory")
+        
+        # Bounded so sessions don't accumulate for the life of the worker
+        return BoundedMemorySaver(
+            max_sessions=int(os.getenv("CHECKPOINT_MAX_SESSIONS", "1000")),
+            max_checkpoints_per_session=max_per_session,
+            session_ttl_seconds=ttl_seconds,
+            max_bytes=int(float(os.getenv("CHECKPOINT_MAX_MB", "256")) * 1024 * 1024)
+        )
+    
     def _route_after_ui_check(self, state: Dict[str, Any]) -> Literal["use_vlm", "has_action_plan", "error"]:
         """Determine next step after UI check"""
         
-        logger.info(f"🔀 Routing: UI check completed, analyzing state...")
-        logger.info(f"🔀 Routing: State keys: {list(state.keys())}")
-        logger.info(f"🔀 Routing: Error: {state.get('error')}")
-        logger.info(f"🔀 Routing: Action plan: {state.get('action_plan')}")
-        logger.info(f"🔀 Routing: Use VLM: {state.get('use_vlm', False)}")
+        logger.debug("🔀 Routing: error=%s, use_vlm=%s, action plan=%s",
+                     state.get("error"), state.get("use_vlm"), lazy_json(state.get("action_plan")))
         
         # Check for errors first
         if state.get("error"):
-            logger.info("🔀 Routing: Error detected, going to TTS")
+            logger.debug("🔀 Routing: Error detected, going to TTS")
             return "error"
         
         # Check if we already have an action plan from UI tree
         if state.get("action_plan"):
-            logger.info("🔀 Routing: Action plan available from UI tree, going to TTS")
+            logger.debug("🔀 Routing: Action plan available from UI tree, going to TTS")
             return "has_action_plan"
         
         # Check if we should use VLM
         if state.get("use_vlm", False):
-            logger.info("🔀 Routing: UI check requires VLM analysis")
+            logger.debug("🔀 Routing: UI check requires VLM analysis")
             return "use_vlm"
         
         # Default to VLM if uncertain
-        logger.info("🔀 Routing: Default path - using VLM")
+        logger.debug("🔀 Routing: Default path - using VLM")
         return "use_vlm"
     
     @traceable(name="aura_graph_process")
-    async def process(self, state: Dict[str, Any], session_id: str = "default") -> Dict[str, Any]:
-        """Process a request through the LangGraph"""
+    async def process(
+        self,
+        state: Dict[str, Any],
+        session_id: str = "default",
+        on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+        preemptible: bool = True
+    ) -> Dict[str, Any]:
+        """Process a request through the LangGraph; on_update receives each node's output as it finishes
+
+        preemptible=False (async jobs) keeps the turn from being dropped by a newer one while it waits.
+        """
         start_time = time.time()
         
-        # Ensure session_id is a valid UUID for LangGraph checkpointer
-        import uuid
-        try:
-            # Validate if it's already a valid UUID
-            uuid.UUID(session_id)
-            graph_session_id = session_id
-        except ValueError:
-            # Generate a valid UUID if the session_id is not UUID format
-            graph_session_id = str(uuid.uuid4())
-            logger.info(f"🔄 Generated UUID for graph session: {session_id} -> {graph_session_id}")
+        if self.fast_path_enabled:
+            fast_result = await self._try_fast_path(state, session_id, start_time)
+            if fast_result is not None:
+                return fast_result
+        
+        graph_session_id = self._graph_thread_id(session_id)
         
         try:
             # Add processing metadata
             state["processing_start_time"] = start_time
             state["session_id"] = session_id  # Keep original session_id in state
             state["graph_session_id"] = graph_session_id  # Store UUID for graph
-            state["node_execution_times"] = {}
+            state.setdefault("request_id", str(uuid.uuid4()))  # Scopes speculative work to this run
+            self._store_media(state)
             
             # Configure session for LangGraph checkpointer
             config = {
@@ -164,41 +242,51 @@ class AuraGraph:
             # No need to manually add LangChainTracer as callback when LANGCHAIN_TRACING_V2=true
             
             logger.info(f"🚀 Graph: Starting processing for session {session_id}")
-            logger.info(f"🚀 Graph: Initial state keys: {list(state.keys())}")
-            
-            # Clean state for logging (exclude bytes data)
-            clean_state = {k: str(v)[:100] if isinstance(v, str) else v 
-                          for k, v in state.items() 
-                          if k not in ['_audio_bytes', '_screenshot_bytes']}
-            logger.info(f"🚀 Graph: Initial state: {json.dumps(clean_state, indent=2)}")
+            # Rendered only if DEBUG is enabled (and the record survives sampling); the UI tree is too big to log
+            logger.debug("🚀 Graph: Initial state: %s", lazy_json(state, exclude=("ui_tree",)))
             
             # Execute the graph with tracing
-            logger.info("🚀 Graph: Executing LangGraph workflow...")
-            result = await self.graph.ainvoke(state, config=config)
+            # Nodes and provider calls inherit the request deadline through the task context
+            with deadline_scope(state.get("deadline")):
+                # One turn at a time per checkpointer thread; a newer turn drops an unpinned one still waiting here
+                async with self.session_lanes.turn(graph_session_id, preemptible=preemptible):
+                    result = await self._run_graph(self._graph_for(state), new_turn(state), config, on_update)
             
-            # Clean up temporary bytes storage from final result
-            if "_audio_bytes" in result:
-                del result["_audio_bytes"]
-            if "_screenshot_bytes" in result:
-                del result["_screenshot_bytes"]
+            # Keys no node set this turn come back as None
+            result = {k: v for k, v in result.items() if v is not None}
             
             # Add total processing time
             total_time = time.time() - start_time
             result["total_processing_time"] = total_time
             
-            logger.info(f"✅ Graph: Processing completed for session {session_id} in {total_time:.2f}s")
-            logger.info(f"✅ Graph: Final result keys: {list(result.keys())}")
-            logger.info(f"✅ Graph: Response text: '{result.get('response_text', 'None')}'")
-            logger.info(f"✅ Graph: Intent: '{result.get('intent', 'None')}'")
+            logger.info(f"✅ Graph: Processing completed for session {session_id} in {total_time:.2f}s "
+                        f"(intent: '{result.get('intent', 'None')}')")
+            logger.debug("✅ Graph: Final result keys: %s, response text: '%s'",
+                         list(result.keys()), result.get("response_text"))
             
+            # Speculative screenshot analysis the graph never claimed (e.g. UI tree had the answer)
+            speculative_vlm.discard(state["request_id"])
+            self._record_turn(session_id, result)
             return result
             
+        except RequestCancelled:
+            logger.info(f"🛑 Graph: Turn for session {session_id} superseded by a newer one before it started")
+            speculative_vlm.discard(state.get("request_id"))
+            raise
+            
+        except asyncio.CancelledError:
+            # Client went away or a newer request took over; in-flight provider calls are cancelled with us
+            logger.info(f"🛑 Graph: Processing cancelled for session {session_id} after {time.time() - start_time:.2f}s")
+            speculative_vlm.discard(state.get("request_id"))
+            raise
+            
         except Exception as e:
             error_time = time.time() - start_time
             error_trace = traceback.format_exc()
             logger.error(f"❌ Graph: Processing error for session {session_id}: {str(e)}")
             logger.error(f"❌ Graph: Error traceback: {error_trace}")
             
+            speculative_vlm.discard(state.get("request_id"))
             return {
                 **state,
                 "error": f"Graph processing failed: {str(e)}",
@@ -206,27 +294,132 @@ class AuraGraph:
                 "total_processing_time": error_time,
                 "success": False
             }
+        finally:
+            blob_store.release(state.get("request_id"))
+    
+    @staticmethod
+    async def _run_graph(graph, state: Dict[str, Any], config: Dict[str, Any],
+                         on_update: Optional[Callable[[Dict[str, Any]], None]]) -> Dict[str, Any]:
+        """Run the graph to completion, reporting node outputs as they land when asked to"""
+        if on_update is None:
+            return await graph.ainvoke(state, config=config)
+        result = None
+        async for mode, chunk in graph.astream(state, config=config, stream_mode=["updates", "values"]):
+            if mode == "values":
+                result = chunk
+            else:
+                for delta in chunk.values():
+                    if delta:
+                        on_update(delta)
+        return result
+    
+    @staticmethod
+    def _graph_thread_id(session_id: str) -> str:
+        """Checkpointer thread for a session: the id itself if it is a UUID, else a stable UUID derived from it"""
+        try:
+            uuid.UUID(session_id)
+            return session_id
+        except ValueError:
+            # Same session, same thread - a random UUID per turn would start a new thread every time
+            return str(uuid.uuid5(uuid.NAMESPACE_URL, f"aura-session:{session_id}"))
+    
+    def _store_media(self, state: Dict[str, Any]):
+        """Move raw media into the blob store so the graph and its checkpoints only carry handles"""
+        for raw_key, handle_key in (("_audio_bytes", "audio_blob"), ("_screenshot_bytes", "screenshot_blob")):
+            data = state.pop(raw_key, None)
+            if data:
+                state[handle_key] = blob_store.put(data, owner=state["request_id"])
+    
+    async def _try_fast_path(self, state: Dict[str, Any], session_id: str, start_time: float) -> Optional[Dict[str, Any]]:
+        """Answer an instant or cached text intent directly, or None if the graph is needed"""
+        transcript = state.get("transcript")
+        if not transcript or state.get("_audio_bytes") or state.get("audio_blob") or state.get("tts_streaming"):
+            return None
+        
+        intent_data = optimized_intent_analyzer.lookup_fast_intent(transcript, start_time)
+        if not intent_data or intent_data.get("requires_screen_analysis", True):
+            self.fast_path_stats["misses"] += 1
+            return None
+        
+        # Same plan and wording the ui_check -> tts path would produce
+        intent = intent_data.get("intent", "Unknown intent")
+        action_plan = ui_check_node.create_simple_action_plan(intent_data)
+        response_text = await tts_node.generate_success_response(action_plan, intent)
+        
+        result = {
+            **state,
+            "session_id": session_id,
+            "intent": intent,
+            "intent_data": intent_data,
+            "use_vlm": False,
+            "action_plan": action_plan,
+            "response_text": response_text,
+            "complete": True,
+            "fast_path": True,
+            "total_processing_time": time.time() - start_time
+        }
+        self.fast_path_stats["hits"] += 1
+        self._record_turn(session_id, result)
+        logger.info(f"⚡ Graph: Fast path answered '{intent}' for session {session_id}")
+        return result
+    
+    def _record_turn(self, session_id: str, result: Dict[str, Any]):
+        """Append a completed turn to the session's bounded history"""
+        turns = self._session_history.pop(session_id, None)
+        if turns is None:
+            turns = deque(maxlen=self.history_turns)
+            while len(self._session_history) >= self.history_max_sessions:
+                self._session_history.popitem(last=False)
+        self._session_history[session_id] = turns
+        turns.append({
+            "timestamp": time.time(),
+            "transcript": result.get("transcript"),
+            "intent": result.get("intent"),
+            "response_text": result.get("response_text"),
+            "fast_path": result.get("fast_path", False),
+            "processing_time": result.get("total_processing_time")
+        })
+    
+    async def clear_session(self, session_id: str) -> bool:
+        """Free a session's checkpoints and history; False if nothing was stored for it"""
+        had_history = self._session_history.pop(session_id, None) is not None
+        # The SQLite saver deletes in a worker thread, keeping disk I/O off the event loop
+        had_checkpoints = await self.checkpointer.adelete_session(self._graph_thread_id(session_id))
+        return had_history or had_checkpoints
     
     async def get_conversation_history(self, session_id: str) -> Dict[str, Any]:
         """Get conversation history for a session"""
         try:
-            config = {"configurable": {"thread_id": session_id}}
-            # This would require implementing history retrieval from checkpointer
-            # For now, return empty history
-            return {"session_id": session_id, "history": []}
+            return {"session_id": session_id, "history": list(self._session_history.get(session_id, []))}
         except Exception as e:
             logger.error(f"History retrieval error: {str(e)}")
             return {"error": str(e)}
     
+    @staticmethod
+    def _describe(graph) -> Dict[str, Any]:
+        """Nodes and entry point of a compiled graph"""
+        return {
+            "nodes": [node for node in graph.nodes if node != START],
+            "entry_point": next(target for source, target in graph.builder.edges if source == START)
+        }
+    
     def get_graph_info(self) -> Dict[str, Any]:
-        """Get information about the graph structure"""
+        """Get information about the graph structure (top level: the full voice + screenshot pipeline)"""
         return {
-            "nodes": ["stt", "intent", "ui_check", "vlm", "action_planner", "tts"],
-            "entry_point": "stt",
+            **self._describe(self.graphs["voice_screen"]),
             "conditional_edges": {
                 "ui_check": ["use_vlm", "has_action_plan", "error"]
             },
-            "description": "AURA voice assistant processing pipeline"
+            "description": "AURA voice assistant processing pipeline",
+            "shapes": {
+                shape: {**self._describe(graph), "runs": self.shape_stats[shape]}
+                for shape, graph in self.graphs.items()
+            },
+            "fast_path": {"enabled": self.fast_path_enabled, **self.fast_path_stats},
+            "speculative_vlm": speculative_vlm.snapshot(),
+            "blob_store": blob_store.snapshot(),
+            "checkpointer": self.checkpointer.snapshot(),
+            "session_lanes": self.session_lanes.snapshot()
         }
 
 # Global instance
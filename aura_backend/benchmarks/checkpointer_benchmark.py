@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Checkpointer write/read latency benchmark
+Runs turns of the six-hop graph against the bounded in-memory checkpointer and
+the SQLite/WAL one and reports, per turn, the time spent writing checkpoints
+(put + put_writes), reading them back (get_tuple) and the whole turn
+
+Usage:
+    python benchmarks/checkpointer_benchmark.py --turns 200 --sessions 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.state_reducer_benchmark import build_graph, delta_node
+from checkpointers import BoundedMemorySaver, SQLiteWALSaver
+from graph_state import AuraState, new_turn
+
+def instrument(saver) -> dict:
+    """Accumulate the time spent in the saver's sync methods (the async ones call them)"""
+    spent = {"write": 0.0, "read": 0.0}
+    for method_name, bucket in (("put", "write"), ("put_writes", "write"), ("get_tuple", "read")):
+        method = getattr(saver, method_name)
+
+        def timed(*args, _method=method, _bucket=bucket, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _method(*args, **kwargs)
+            finally:
+                spent[_bucket] += time.perf_counter() - start
+
+        setattr(saver, method_name, timed)
+    return spent
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * fraction) - 1)]
+
+async def run_backend(label: str, saver, args) -> dict:
+    """Run turns round-robin over the sessions and collect per-turn checkpoint latencies"""
+    graph, _ = build_graph(AuraState, delta_node)
+    graph.checkpointer = saver
+    spent = instrument(saver)
+    sessions = [str(uuid.uuid4()) for _ in range(args.sessions)]
+    ui_tree = "<node text='Settings' bounds='[0,0][100,100]'/>" * args.ui_tree_nodes
+
+    writes, reads, turns = [], [], []
+    for turn in range(args.turns):
+        config = {"configurable": {"thread_id": sessions[turn % len(sessions)]}}
+        state = new_turn({"session_id": "bench", "request_id": str(uuid.uuid4()), "ui_tree": ui_tree})
+        spent["write"] = spent["read"] = 0.0
+        start = time.perf_counter()
+        await graph.ainvoke(state, config=config)
+        turns.append(time.perf_counter() - start)
+        writes.append(spent["write"])
+        reads.append(spent["read"])
+
+    return {
+        "backend": label,
+        "write_p50_ms": statistics.median(writes) * 1000,
+        "write_p95_ms": percentile(writes, 0.95) * 1000,
+        "read_p50_ms": statistics.median(reads) * 1000,
+        "turn_p50_ms": statistics.median(turns) * 1000,
+        "stored_kb": saver.snapshot()["bytes"] / 1024,
+    }
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [
+            ("memory (bounded)", BoundedMemorySaver()),
+            ("sqlite (WAL)", SQLiteWALSaver(path=args.db or os.path.join(tmp, "checkpoints.db"))),
+        ]
+
+        print("🚀 Checkpointer benchmark")
+        print(f"   {args.turns} turns over {args.sessions} sessions, UI tree of {args.ui_tree_nodes} nodes")
+        print("=" * 84)
+        print(f"{'backend':<18}{'write p50':>11}{'write p95':>11}{'read p50':>10}{'turn p50':>10}{'stored KB':>12}")
+
+        for label, saver in backends:
+            result = await run_backend(label, saver, args)
+            print(f"{result['backend']:<18}{result['write_p50_ms']:>11.2f}{result['write_p95_ms']:>11.2f}"
+                  f"{result['read_p50_ms']:>10.2f}{result['turn_p50_ms']:>10.2f}{result['stored_kb']:>12.0f}")
+        backends[1][1].close()
+
+        print("=" * 84)
+        print("   latencies in ms per turn")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--ui-tree-nodes", type=int, default=200)
+    parser.add_argument("--db", help="SQLite file to use (default: a temporary file)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+HTTP/1.1 pool vs HTTP/2 multiplexing benchmark for provider traffic
+Fires concurrent chat completions at the local mock provider server and
+compares throughput, latency and the number of sockets each transport opens
+
+Usage:
+    python benchmarks/http_transport_benchmark.py --requests 400 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks import mock_provider_server
+from providers.base import ProviderConfig, HTTP2_AVAILABLE
+from providers.groq_provider import GroqProvider
+from providers.gemini_provider import GeminiProvider
+
+async def run_transport(provider_cls, base_url: str, http2: bool, total: int, concurrency: int) -> dict:
+    """Run one load pass against the mock server with a single provider instance"""
+    config = ProviderConfig(
+        name=provider_cls.__name__,
+        api_key="mock-key",
+        base_url=base_url,
+        http2=http2
+    )
+    provider = provider_cls(config)
+    provider.base_url = base_url  # Gemini pins its production URL in __init__
+    await provider.startup()
+    
+    async with httpx.AsyncClient(base_url=base_url.split("/openai")[0].split("/v1beta")[0]) as control:
+        await control.post("/stats/reset")
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+    
+    async def one_call():
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            result = await provider.chat_completion(
+                messages=[{"role": "user", "content": "open settings"}],
+                max_tokens=60
+            )
+            latencies.append(time.perf_counter() - start)
+            if not result.get("success"):
+                failures += 1
+    
+    # Warm the pool so both transports start from open connections
+    await asyncio.gather(*(one_call() for _ in range(min(concurrency, total))))
+    latencies.clear()
+    failures = 0
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    
+    async with httpx.AsyncClient(base_url=base_url.split("/openai")[0].split("/v1beta")[0]) as control:
+        connections = (await control.get("/stats")).json()["connections"]
+    
+    await provider.shutdown()
+    
+    latencies.sort()
+    return {
+        "provider": provider_cls.__name__,
+        "transport": "HTTP/2" if http2 else "HTTP/1.1",
+        "requests": total,
+        "failures": failures,
+        "throughput_rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "connections": connections
+    }
+
+async def main(args):
+    if not HTTP2_AVAILABLE:
+        print("❌ HTTP/2 needs the 'h2' package: pip install 'httpx[http2]'")
+        return
+    
+    shutdown_event = asyncio.Event()
+    server = asyncio.create_task(
+        mock_provider_server.serve(port=args.port, shutdown_event=shutdown_event)
+    )
+    await asyncio.sleep(0.5)
+    
+    root = f"http://127.0.0.1:{args.port}"
+    targets = [
+        (GroqProvider, f"{root}/openai/v1"),
+        (GeminiProvider, f"{root}/v1beta")
+    ]
+    
+    print("🚀 Provider transport benchmark")
+    print(f"   {args.requests} requests, concurrency {args.concurrency}, "
+          f"mock latency {mock_provider_server.MOCK_LATENCY * 1000:.0f}ms")
+    print("=" * 78)
+    print(f"{'provider':<16}{'transport':<11}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'sockets':>10}{'failed':>9}")
+    
+    try:
+        for provider_cls, base_url in targets:
+            for http2 in (False, True):
+                result = await run_transport(provider_cls, base_url, http2, args.requests, args.concurrency)
+                print(f"{result['provider']:<16}{result['transport']:<11}"
+                      f"{result['throughput_rps']:>9.1f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                      f"{result['connections']:>10}{result['failures']:>9}")
+    finally:
+        shutdown_event.set()
+        await server
+    
+    print("=" * 78)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(main(parser.parse_args()))
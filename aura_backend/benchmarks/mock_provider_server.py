@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Local mock of the Groq and Gemini HTTP APIs for benchmarks
+Answers chat, vision, speech and model-list calls after a configurable delay
+and counts the client connections it sees, without spending real quota
+"""
+
+import asyncio
+import os
+import sys
+from typing import Set, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+# Simulated provider latency in seconds
+MOCK_LATENCY = float(os.getenv("MOCK_PROVIDER_LATENCY", "0.05"))
+
+# Fake 16-bit PCM WAV (header + 0.1s of silence) returned by the speech endpoint
+_WAV_BYTES = (
+    b"RIFF" + (36 + 3200).to_bytes(4, "little") + b"WAVEfmt "
+    + (16).to_bytes(4, "little") + (1).to_bytes(2, "little") + (1).to_bytes(2, "little")
+    + (16000).to_bytes(4, "little") + (32000).to_bytes(4, "little")
+    + (2).to_bytes(2, "little") + (16).to_bytes(2, "little")
+    + b"data" + (3200).to_bytes(4, "little") + b"\x00" * 3200
+)
+
+app = FastAPI(title="AURA mock provider server")
+
+# Distinct (host, port) pairs seen since the last reset - one per TCP connection
+seen_connections: Set[Tuple[str, int]] = set()
+
+def _track(request: Request):
+    if request.client:
+        seen_connections.add((request.client.host, request.client.port))
+
+@app.get("/stats")
+async def stats():
+    return {"connections": len(seen_connections)}
+
+@app.post("/stats/reset")
+async def reset_stats():
+    seen_connections.clear()
+    return {"connections": 0}
+
+@app.get("/openai/v1/models")
+async def groq_models(request: Request):
+    _track(request)
+    return {"data": [{"id": "llama-3.3-70b-versatile"}]}
+
+@app.post("/openai/v1/chat/completions")
+async def groq_chat(request: Request):
+    _track(request)
+    payload = await request.json()
+    await asyncio.sleep(MOCK_LATENCY)
+    return {
+        "model": payload.get("model"),
+        "choices": [{"message": {"role": "assistant", "content": '{"intent": "mock", "confidence": 0.9}'}}]
+    }
+
+@app.post("/openai/v1/audio/transcriptions")
+async def groq_transcribe(request: Request):
+    _track(request)
+    await request.body()
+    await asyncio.sleep(MOCK_LATENCY)
+    return Response(content="open settings", media_type="text/plain")
+
+@app.post("/openai/v1/audio/speech")
+async def groq_speech(request: Request):
+    _track(request)
+    await request.json()
+    await asyncio.sleep(MOCK_LATENCY)
+    return Response(content=_WAV_BYTES, media_type="audio/wav")
+
+@app.get("/v1beta/models")
+async def gemini_models(request: Request):
+    _track(request)
+    return {"models": [{"name": "models/gemini-1.5-flash"}]}
+
+@app.post("/v1beta/models/{model_action}")
+async def gemini_generate(model_action: str, request: Request):
+    _track(request)
+    await request.json()
+    await asyncio.sleep(MOCK_LATENCY)
+    return {"candidates": [{"content": {"parts": [{"text": '{"intent": "mock", "confidence": 0.9}'}]}}]}
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, shutdown_event: asyncio.Event = None):
+    """Serve the mock API with Hypercorn (HTTP/1.1 and cleartext HTTP/2)"""
+    try:
+        from hypercorn.asyncio import serve as hypercorn_serve
+        from hypercorn.config import Config
+    except ImportError:
+        raise RuntimeError("The mock provider server needs hypercorn: pip install -r benchmarks/requirements.txt")
+    
+    config = Config()
+    config.bind = [f"{host}:{port}"]
+    config.accesslog = None
+    config.loglevel = "WARNING"
+    shutdown_event = shutdown_event or asyncio.Event()
+    await hypercorn_serve(app, config, shutdown_trigger=shutdown_event.wait)
+
+if __name__ == "__main__":
+    asyncio.run(serve(port=int(os.getenv("MOCK_PROVIDER_PORT", "8765"))))
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Full-state copies vs delta-returning nodes vs blob handles benchmark
+Runs the same six-hop graph with the legacy dict state (every node returns
+{**state, ...}), with typed deltas but media still inline, and with typed
+deltas plus blob store handles (what AuraGraph runs). Compares time per turn,
+memory allocated per turn and the bytes the MemorySaver checkpointer holds
+for a turn carrying a screenshot and an audio clip
+
+Usage:
+    python benchmarks/state_reducer_benchmark.py --turns 50 --screenshot-kb 500 --audio-kb 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from typing import Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph, END
+
+from graph_state import AuraState, new_turn
+from utils.blob_store import BlobStore
+
+class InlineMediaState(AuraState, total=False):
+    """AuraState with the media bytes carried in state, as before the blob store"""
+    _audio_bytes: Optional[bytes]
+    _screenshot_bytes: Optional[bytes]
+
+# (node, key it writes, value) - same hops as the AURA graph's VLM path
+HOPS = [
+    ("stt", "transcript", "open the settings app"),
+    ("intent_analysis", "intent_data", {"intent": "open settings", "action_type": "open_app", "confidence": 0.9}),
+    ("ui_check", "use_vlm", True),
+    ("vlm", "vlm_result", {"found": True, "x": 540, "y": 1200, "confidence": 0.92}),
+    ("action_planner", "action_plan", [{"type": "tap", "x": 540, "y": 1200}]),
+    ("tts", "response_text", "Opening settings"),
+]
+
+def legacy_node(name: str, key: str, value):
+    """Node in the old style: copy the whole state and merge timings by hand"""
+    async def run(state: dict) -> dict:
+        return {
+            **state,
+            key: value,
+            "node_execution_times": {**state.get("node_execution_times", {}), name: 0.001}
+        }
+    return run
+
+def delta_node(name: str, key: str, value):
+    """Node in the new style: return only the changed keys, the reducer merges timings"""
+    async def run(state: dict) -> dict:
+        return {key: value, "node_execution_times": {name: 0.001}}
+    return run
+
+def build_graph(schema, make_node):
+    """Linear six-hop graph over the given schema"""
+    workflow = StateGraph(schema)
+    for name, key, value in HOPS:
+        workflow.add_node(name, make_node(name, key, value))
+    workflow.set_entry_point(HOPS[0][0])
+    for (current, _, _), (following, _, _) in zip(HOPS, HOPS[1:]):
+        workflow.add_edge(current, following)
+    workflow.add_edge(HOPS[-1][0], END)
+    saver = MemorySaver()
+    return workflow.compile(checkpointer=saver), saver
+
+def stored_bytes(value) -> int:
+    """Serialized bytes held anywhere inside a checkpointer structure"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(stored_bytes(v) for v in value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(stored_bytes(v) for v in value)
+    return 0
+
+def with_handles(store: BlobStore):
+    """Swap the media for blob store handles, as AuraGraph.process does"""
+    def prepare(state: dict) -> dict:
+        owner = state["request_id"]
+        state["audio_blob"] = store.put(state.pop("_audio_bytes"), owner=owner)
+        state["screenshot_blob"] = store.put(state.pop("_screenshot_bytes"), owner=owner)
+        return new_turn(state)
+    return prepare
+
+async def run_variant(label: str, schema, make_node, prepare, args) -> dict:
+    """Run `args.turns` turns on one session and measure time, allocations and checkpoint size"""
+    graph, saver = build_graph(schema, make_node)
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    screenshot = os.urandom(args.screenshot_kb * 1024)
+    audio = os.urandom(args.audio_kb * 1024)
+
+    def request_state():
+        return prepare({
+            "session_id": "bench",
+            "request_id": str(uuid.uuid4()),
+            "ui_tree": None,
+            "_screenshot_bytes": screenshot,
+            "_audio_bytes": audio,
+        })
+
+    await graph.ainvoke(request_state(), config=config)  # Warm up compilation caches
+
+    timings = []
+    allocated = []
+    for _ in range(args.turns):
+        state = request_state()
+        tracemalloc.start()
+        start = time.perf_counter()
+        await graph.ainvoke(state, config=config)
+        timings.append(time.perf_counter() - start)
+        allocated.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    checkpoint_bytes = stored_bytes(saver.storage) + stored_bytes(saver.blobs) + stored_bytes(saver.writes)
+    return {
+        "variant": label,
+        "p50_ms": statistics.median(timings) * 1000,
+        "peak_kb_per_turn": statistics.median(allocated) / 1024,
+        "checkpoint_mb": checkpoint_bytes / (1024 * 1024),
+        "checkpoint_kb_per_hop": checkpoint_bytes / 1024 / ((args.turns + 1) * len(HOPS)),
+    }
+
+async def main(args):
+    variants = [
+        ("dict + full copies", dict, legacy_node, lambda state: state),
+        ("deltas + inline media", InlineMediaState, delta_node, new_turn),
+        ("deltas + blob handles", AuraState, delta_node, with_handles(BlobStore(spill_dir=None))),
+    ]
+
+    print("🚀 Graph state benchmark")
+    print(f"   {args.turns} turns x {len(HOPS)} hops, screenshot {args.screenshot_kb}KB, audio {args.audio_kb}KB")
+    print("=" * 78)
+    print(f"{'variant':<22}{'p50 ms':>10}{'peak KB/turn':>15}{'checkpoint MB':>16}{'KB/hop':>12}")
+
+    for label, schema, make_node, prepare in variants:
+        result = await run_variant(label, schema, make_node, prepare, args)
+        print(f"{result['variant']:<22}{result['p50_ms']:>10.2f}{result['peak_kb_per_turn']:>15.0f}"
+              f"{result['checkpoint_mb']:>16.1f}{result['checkpoint_kb_per_hop']:>12.1f}")
+
+    print("=" * 78)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--screenshot-kb", type=int, default=500)
+    parser.add_argument("--audio-kb", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
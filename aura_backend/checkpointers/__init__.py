@@ -0,0 +1,7 @@
+from .bounded_memory import BoundedMemorySaver
+from .sqlite_wal import SQLiteWALSaver
+
+__all__ = [
+    "BoundedMemorySaver",
+    "SQLiteWALSaver"
+]
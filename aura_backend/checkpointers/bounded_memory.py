@@ -0,0 +1,179 @@
+"""
+In-memory LangGraph checkpointer with bounded occupancy.
+MemorySaver keeps every checkpoint of every thread for the life of the
+process. This one keeps the last few checkpoints per session, evicts idle
+sessions after a TTL and the least recently used ones past a session count or
+byte budget, and can drop a session on request.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from langgraph.checkpoint.memory import MemorySaver
+
+logger = logging.getLogger(__name__)
+
+def _size(value: Any) -> int:
+    """Serialized bytes inside a stored checkpoint/blob/write tuple"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, tuple):
+        return sum(_size(item) for item in value)
+    return 0
+
+class BoundedMemorySaver(MemorySaver):
+    """MemorySaver with per-session checkpoint caps, LRU/TTL eviction and a byte budget"""
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        max_checkpoints_per_session: int = 10,
+        session_ttl_seconds: float = 1800.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.max_sessions = max_sessions
+        self.max_checkpoints_per_session = max_checkpoints_per_session
+        self.session_ttl_seconds = session_ttl_seconds
+        self.max_bytes = max_bytes
+        # thread_id -> last write time, least recently used first
+        self._last_used: "OrderedDict[str, float]" = OrderedDict()
+        self._thread_bytes: Dict[str, int] = {}
+        self._blob_keys: Dict[str, Set[Tuple]] = {}
+        self._write_keys: Dict[str, Set[Tuple]] = {}
+        # (thread_id, ns, checkpoint_id) -> channel versions it references
+        self._checkpoint_refs: Dict[Tuple[str, str, str], Set[Tuple[str, Any]]] = {}
+        self.total_bytes = 0
+        self.evictions = {"lru": 0, "ttl": 0, "bytes": 0, "deleted": 0}
+        self.pruned_checkpoints = 0
+
+    def get_tuple(self, config):
+        # The base class indexes a defaultdict, which would register unknown threads
+        if config["configurable"]["thread_id"] not in self.storage:
+            return None
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        result = super().put(config, checkpoint, metadata, new_versions)
+
+        self._blob_keys.setdefault(thread_id, set()).update(
+            (thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items()
+        )
+        self._checkpoint_refs[(thread_id, checkpoint_ns, checkpoint["id"])] = set(
+            checkpoint["channel_versions"].items()
+        )
+        self._prune(thread_id, checkpoint_ns)
+        self._touch(thread_id)
+        self._enforce_limits(current=thread_id)
+        return result
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        super().put_writes(config, writes, task_id, task_path)
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        self._write_keys.setdefault(thread_id, set()).add(
+            (thread_id, configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"])
+        )
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self._forget(thread_id)
+
+    def delete_session(self, thread_id: str) -> bool:
+        """Free every checkpoint of a session; False if it had none"""
+        existed = thread_id in self._last_used
+        self.delete_thread(thread_id)
+        if existed:
+            self.evictions["deleted"] += 1
+        return existed
+
+    async def adelete_session(self, thread_id: str) -> bool:
+        # In memory, so it runs on the event loop like the other async methods
+        return self.delete_session(thread_id)
+
+    def _prune(self, thread_id: str, checkpoint_ns: str):
+        """Keep only the newest checkpoints of a thread and the blobs they reference"""
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        excess = len(checkpoints) - self.max_checkpoints_per_session
+        if excess > 0:
+            for checkpoint_id in list(checkpoints)[:excess]:
+                del checkpoints[checkpoint_id]
+                key = (thread_id, checkpoint_ns, checkpoint_id)
+                self.writes.pop(key, None)
+                self._write_keys.get(thread_id, set()).discard(key)
+                self._checkpoint_refs.pop(key, None)
+            self.pruned_checkpoints += excess
+
+            referenced = set()
+            for checkpoint_id in checkpoints:
+                referenced |= self._checkpoint_refs.get((thread_id, checkpoint_ns, checkpoint_id), set())
+            blob_keys = self._blob_keys.get(thread_id, set())
+            for key in [key for key in blob_keys if key[1] == checkpoint_ns and (key[2], key[3]) not in referenced]:
+                self.blobs.pop(key, None)
+                blob_keys.discard(key)
+
+        size = sum(_size(saved) for ns in self.storage[thread_id].values() for saved in ns.values())
+        size += sum(_size(self.blobs.get(key)) for key in self._blob_keys.get(thread_id, ()))
+        size += sum(_size(write) for key in self._write_keys.get(thread_id, ())
+                    for write in self.writes.get(key, {}).values())
+        self.total_bytes += size - self._thread_bytes.get(thread_id, 0)
+        self._thread_bytes[thread_id] = size
+
+    def _touch(self, thread_id: str):
+        self._last_used[thread_id] = time.monotonic()
+        self._last_used.move_to_end(thread_id)
+
+    def _enforce_limits(self, current: Optional[str] = None):
+        """Evict idle sessions, then least recently used ones past the session or byte limits"""
+        now = time.monotonic()
+        while self._last_used:
+            thread_id, last_used = next(iter(self._last_used.items()))
+            if now - last_used <= self.session_ttl_seconds or thread_id == current:
+                break
+            self._evict(thread_id, "ttl")
+
+        while len(self._last_used) > 1:
+            if len(self._last_used) > self.max_sessions:
+                reason = "lru"
+            elif self.total_bytes > self.max_bytes:
+                reason = "bytes"
+            else:
+                break
+            thread_id = next(iter(self._last_used))
+            if thread_id == current:
+                break
+            self._evict(thread_id, reason)
+
+    def _evict(self, thread_id: str, reason: str):
+        logger.info(f"Checkpointer evicting session {thread_id} ({reason})")
+        self.delete_thread(thread_id)
+        self.evictions[reason] += 1
+
+    def _forget(self, thread_id: str):
+        self._last_used.pop(thread_id, None)
+        self.total_bytes -= self._thread_bytes.pop(thread_id, 0)
+        self._blob_keys.pop(thread_id, None)
+        self._write_keys.pop(thread_id, None)
+        for key in [key for key in self._checkpoint_refs if key[0] == thread_id]:
+            del self._checkpoint_refs[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Occupancy and eviction counters"""
+        self._enforce_limits()
+        return {
+            "backend": "memory",
+            "sessions": len(self._last_used),
+            "max_sessions": self.max_sessions,
+            "checkpoints": sum(len(ns) for thread in self.storage.values() for ns in thread.values()),
+            "max_checkpoints_per_session": self.max_checkpoints_per_session,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "session_ttl_seconds": self.session_ttl_seconds,
+            "pruned_checkpoints": self.pruned_checkpoints,
+            "evictions": dict(self.evictions)
+        }
@@ -0,0 +1,381 @@
+"""
+Disk-backed LangGraph checkpointer on SQLite in WAL mode.
+Conversation state survives restarts and is shared by every uvicorn worker on
+the host. Channel values are stored once per version (unchanged channels are
+not rewritten), large values are zlib-compressed, every write is committed
+straight away (no transaction is left holding the write lock between calls),
+and idle sessions are expired with incremental vacuum reclaiming the space.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    WRITES_IDX_MAP,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS threads_last_used ON threads (last_used);
+"""
+
+COMPRESSED_SUFFIX = "+zlib"
+
+class SQLiteWALSaver(BaseCheckpointSaver):
+    """Checkpointer on a SQLite file in WAL mode, safe to share between worker processes"""
+
+    def __init__(
+        self,
+        path: str = "aura_checkpoints.db",
+        max_checkpoints_per_session: int = 10,
+        session_ttl_seconds: float = 1800.0,
+        maintenance_interval_seconds: float = 60.0,
+        compress_min_bytes: int = 1024,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.path = path
+        self.max_checkpoints_per_session = max_checkpoints_per_session
+        self.session_ttl_seconds = session_ttl_seconds
+        self.maintenance_interval_seconds = maintenance_interval_seconds
+        self.compress_min_bytes = compress_min_bytes
+        self._lock = threading.Lock()
+        self._last_maintenance = time.monotonic()
+        self.evictions = {"ttl": 0, "deleted": 0}
+        self.pruned_checkpoints = 0
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # Only takes effect on a new file
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; fsync happens at checkpoint
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        logger.info(f"SQLite checkpointer ready at {path}")
+
+    # Serialization
+
+    def _dump(self, value: Any) -> Tuple[str, bytes]:
+        value_type, data = self.serde.dumps_typed(value)
+        if len(data) >= self.compress_min_bytes:
+            compressed = zlib.compress(data, 1)
+            if len(compressed) < len(data):
+                return value_type + COMPRESSED_SUFFIX, compressed
+        return value_type, data
+
+    def _load(self, value_type: str, data: bytes) -> Any:
+        if value_type.endswith(COMPRESSED_SUFFIX):
+            value_type = value_type[:-len(COMPRESSED_SUFFIX)]
+            data = zlib.decompress(data)
+        return self.serde.loads_typed((value_type, data))
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Zero-padded so versions of a channel sort as text
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # Reads
+
+    def get_tuple(self, config) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        query = "SELECT checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata FROM checkpoints " \
+                "WHERE thread_id = ? AND checkpoint_ns = ?"
+        params: Tuple = (thread_id, checkpoint_ns)
+        if checkpoint_id:
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            return self._to_tuple(thread_id, checkpoint_ns, row) if row else None
+
+    def list(self, config, *, filter: Optional[Dict[str, Any]] = None, before=None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        query = "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata " \
+                "FROM checkpoints WHERE 1 = 1"
+        params: Tuple = ()
+        if config:
+            query += " AND thread_id = ?"
+            params += (config["configurable"]["thread_id"],)
+            if config["configurable"].get("checkpoint_ns") is not None:
+                query += " AND checkpoint_ns = ?"
+                params += (config["configurable"]["checkpoint_ns"],)
+            if get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params += (get_checkpoint_id(config),)
+        if before and get_checkpoint_id(before):
+            query += " AND checkpoint_id < ?"
+            params += (get_checkpoint_id(before),)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                metadata = self._load(row[4], row[5])
+                if filter and not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+                results.append(self._to_tuple(thread_id, checkpoint_ns, row))
+        yield from results
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row) -> CheckpointTuple:
+        checkpoint_id, parent_id, checkpoint_type, checkpoint_data, metadata_type, metadata_data = row
+        checkpoint = self._load(checkpoint_type, checkpoint_data)
+        versions = checkpoint["channel_versions"]
+        channel_values = {}
+        if versions:
+            placeholders = ", ".join("(?, ?)" for _ in versions)
+            blob_rows = self._conn.execute(
+                f"SELECT channel, type, value FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+                f"AND (channel, version) IN (VALUES {placeholders})",
+                (thread_id, checkpoint_ns, *[item for pair in versions.items() for item in pair])
+            ).fetchall()
+            channel_values = {
+                channel: self._load(value_type, value)
+                for channel, value_type, value in blob_rows if value_type != "empty"
+            }
+        writes = self._conn.execute(
+            "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+            "AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+
+        def ref(target_id):
+            return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": target_id}}
+
+        return CheckpointTuple(
+            config=ref(checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self._load(metadata_type, metadata_data),
+            parent_config=ref(parent_id) if parent_id else None,
+            pending_writes=[(task_id, channel, self._load(value_type, value)) for task_id, channel, value_type, value in writes]
+        )
+
+    # Writes
+
+    def put(self, config, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: ChannelVersions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+        checkpoint_type, checkpoint_data = self._dump(stored)
+        metadata_type, metadata_data = self._dump(get_checkpoint_metadata(config, metadata))
+        blob_rows = [
+            (thread_id, checkpoint_ns, channel, version, *(self._dump(values[channel]) if channel in values else ("empty", None)))
+            for channel, version in new_versions.items()
+        ]
+
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blob_rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                 checkpoint_type, checkpoint_data, metadata_type, metadata_data)
+            )
+            self._conn.execute("INSERT OR REPLACE INTO threads VALUES (?, ?)", (thread_id, time.time()))
+            self._prune(thread_id, checkpoint_ns)
+            self._conn.commit()
+            self._maybe_maintain()
+
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        configurable = config["configurable"]
+        key = (configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"])
+        special = any(channel in WRITES_IDX_MAP for channel, _ in writes)
+        rows = [
+            (*key, task_id, WRITES_IDX_MAP.get(channel, idx), channel, *self._dump(value), task_path)
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        with self._lock:
+            # Special writes (errors, interrupts) replace earlier ones; a regular write is kept as first written
+            self._conn.executemany(
+                f"INSERT OR {'REPLACE' if special else 'IGNORE'} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            # Committed now: an open transaction would hold the database-wide write lock against every
+            # other worker until this process's next put, which a cancelled run may never reach.
+            # WAL with synchronous=NORMAL keeps the commit cheap (no fsync)
+            self._conn.commit()
+
+    def _prune(self, thread_id: str, checkpoint_ns: str):
+        """Drop checkpoints beyond the per-session cap and the blobs only they referenced"""
+        stale = self._conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.max_checkpoints_per_session)
+        ).fetchall()
+        if not stale:
+            return
+        newest_stale = stale[0][0]
+        for table in ("checkpoints", "writes"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id <= ?",
+                (thread_id, checkpoint_ns, newest_stale)
+            )
+        self.pruned_checkpoints += len(stale)
+
+        # Versions grow per channel, so anything older than what the oldest remaining checkpoint uses is unreferenced
+        row = self._conn.execute(
+            "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id ASC LIMIT 1",
+            (thread_id, checkpoint_ns)
+        ).fetchone()
+        if row:
+            versions = self._load(*row)["channel_versions"]
+            self._conn.executemany(
+                "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version < ?",
+                [(thread_id, checkpoint_ns, channel, version) for channel, version in versions.items()]
+            )
+
+    def _maybe_maintain(self):
+        """Expire idle sessions and give freed pages back to the filesystem, at most once per interval"""
+        now = time.monotonic()
+        if now - self._last_maintenance < self.maintenance_interval_seconds:
+            return
+        self._last_maintenance = now
+        expired = [row[0] for row in self._conn.execute(
+            "SELECT thread_id FROM threads WHERE last_used < ?", (time.time() - self.session_ttl_seconds,)
+        ).fetchall()]
+        for thread_id in expired:
+            self._delete(thread_id)
+        self.evictions["ttl"] += len(expired)
+        self._conn.commit()
+        self._conn.execute("PRAGMA incremental_vacuum")
+        self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        if expired:
+            logger.info(f"SQLite checkpointer expired {len(expired)} idle sessions")
+
+    def maintain(self):
+        """Run expiry and vacuum now"""
+        with self._lock:
+            self._last_maintenance = float("-inf")
+            self._maybe_maintain()
+
+    # Deletion
+
+    def _delete(self, thread_id: str) -> bool:
+        existed = self._conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,)).rowcount > 0
+        for table in ("checkpoints", "blobs", "writes"):
+            self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+        return existed
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._delete(thread_id)
+            self._conn.commit()
+
+    def delete_session(self, thread_id: str) -> bool:
+        """Free every checkpoint of a session; False if it had none"""
+        with self._lock:
+            existed = self._delete(thread_id)
+            self._conn.commit()
+        if existed:
+            self.evictions["deleted"] += 1
+        return existed
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    # Async API - SQLite calls run in a worker thread so disk waits don't block the event loop
+
+    async def aget_tuple(self, config) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in results:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def adelete_session(self, thread_id: str) -> bool:
+        return await asyncio.to_thread(self.delete_session, thread_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Occupancy and eviction counters"""
+        with self._lock:
+            sessions = self._conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0]
+            checkpoints = self._conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+            page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        wal_path = self.path + "-wal"
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "sessions": sessions,
+            "checkpoints": checkpoints,
+            "max_checkpoints_per_session": self.max_checkpoints_per_session,
+            "bytes": page_count * page_size,
+            "wal_bytes": os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+            "session_ttl_seconds": self.session_ttl_seconds,
+            "pruned_checkpoints": self.pruned_checkpoints,
+            "evictions": dict(self.evictions)
+        }
@@ -0,0 +1,56 @@
+"""
+Typed state schema for the AURA LangGraph.
+Each key is its own channel, so nodes return only the keys they change and
+the checkpointer stores only the channels that were written.
+"""
+
+from typing import Annotated, Any, Dict, List, Optional, TypedDict
+
+def merge_timings(current: Optional[Dict[str, float]], update: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """Reducer for node_execution_times: merge per-node timings; None starts a new turn"""
+    if update is None:
+        return {}
+    return {**(current or {}), **update}
+
+class AuraState(TypedDict, total=False):
+    """Graph state for one turn (request inputs plus node outputs)"""
+    # Request inputs
+    session_id: str
+    graph_session_id: str
+    request_id: str
+    ui_tree: Optional[str]
+    provider_preferences: Dict[str, Any]
+    has_audio: bool
+    has_screenshot: bool
+    audio_size: int
+    screenshot_size: int
+    tts_streaming: Optional[bool]
+    speculative_vlm: Optional[bool]
+    deadline: Optional[float]
+    processing_start_time: float
+    audio_blob: Optional[str]  # blob_store handles; raw media never enters the state
+    screenshot_blob: Optional[str]
+
+    # Node outputs
+    transcript: Optional[str]
+    intent: Optional[str]
+    intent_data: Optional[Dict[str, Any]]
+    use_vlm: Optional[bool]
+    vlm_result: Optional[Dict[str, Any]]
+    ui_element_coords: Optional[Dict[str, Any]]
+    action_plan: Optional[List[Dict[str, Any]]]
+    response_text: Optional[str]
+    complete: Optional[bool]
+    tts_audio_available: Optional[bool]
+    tts_audio_size: Optional[int]
+    tts_error: Optional[str]
+    tts_stream_id: Optional[str]
+    error: Optional[str]
+    node_execution_times: Annotated[Dict[str, float], merge_timings]
+
+def new_turn(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Graph input for a new turn: every key the caller did not set is cleared, so
+    nothing from the previous turn in the same session (errors, plans, media) leaks in
+    """
+    return {**{key: None for key in AuraState.__annotations__}, **state, "node_execution_times": None}
@@ -1,18 +1,27 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 import base64
 import uuid
 import logging
 import time
 import os
-from typing import Optional
+from typing import Any, Dict, Optional
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
-from models.request_models import ProcessResponse, ActionStep, ChatRequest, ChatResponse
+from models.request_models import ProcessResponse, ActionStep, ChatRequest, ChatResponse, JobResponse
 from aura_graph import aura_graph
-from utils.image_utils import validate_image, optimize_image, validate_audio, get_image_info
+from providers.provider_registry import provider_registry
+from providers.deadline import deadline_from_budget
+from utils.image_utils import validate_audio, validate_image_header
+from utils.audio_streams import audio_streams
+from utils.prepared_inputs import prepared_screenshots, prepare_screenshot
+from utils.blob_store import blob_store, BlobStoreFullError
+from utils.logging_config import configure_logging, get_logging_stats
+from utils.request_tasks import session_requests, RequestCancelled
+from utils.jobs import Job, JobStoreFullError, job_store
 from api.provider_routes import provider_router
 from api.langsmith_routes import langsmith_router
 
@@ -36,11 +45,8 @@ if not env_loaded:
     # Fallback: load any .env file found
     load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Configure logging (queued to a background writer; LOG_FORMAT=json for structured output)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Dependency to check API keys
@@ -80,10 +86,16 @@ async def lifespan(app: FastAPI):
     except HTTPException as e:
         logger.error(f"❌ Environment verification failed: {e.detail}")
     
+    # Open shared keep-alive connection pools for all providers
+    await provider_registry.startup()
+    logger.info("🔌 Provider connection pools ready")
+    
     yield
     
     # Shutdown
     logger.info("🛑 AURA Backend Agent shutting down...")
+    await job_store.shutdown()
+    await provider_registry.shutdown()
 
 # Initialize FastAPI with lifespan
 app = FastAPI(
@@ -133,7 +145,13 @@ async def health_check():
                 "vlm": "operational",
                 "tts": "operational"
             },
-            "graph_info": aura_graph.get_graph_info()
+            "providers": {
+                name: status.get("status") for name, status in provider_registry.health_prober.snapshot().items()
+            },
+            "graph_info": aura_graph.get_graph_info(),
+            "logging": get_logging_stats(),
+            "requests": session_requests.snapshot(),
+            "jobs": job_store.snapshot()
         }
     except HTTPException:
         return JSONResponse(
@@ -144,8 +162,78 @@ async def health_check():
             }
         )
 
+def get_request_deadline(budget_header: Optional[str], env_var: str, default_ms: str) -> Optional[float]:
+    """Absolute deadline from the X-Latency-Budget-Ms header, else the endpoint's configured budget (0 = none)"""
+    budget_ms = budget_header or os.getenv(env_var, default_ms)
+    try:
+        return deadline_from_budget(float(budget_ms))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid latency budget: {budget_ms}")
+
+def cancelled_response(cancelled: RequestCancelled, session_id: str, start_time: float) -> ProcessResponse:
+    """Response for a graph run that was cut short; a disconnected client gets nothing to read"""
+    if cancelled.reason == "disconnected":
+        # 499 (client closed request) - only shows up in access logs
+        raise HTTPException(status_code=499, detail="Client disconnected")
+    return ProcessResponse(
+        success=False,
+        error_message="Superseded by a newer request for this session",
+        session_id=session_id,
+        processing_time=time.time() - start_time
+    )
+
+def build_process_response(result: Dict[str, Any], session_id: str, start_time: float) -> ProcessResponse:
+    """ProcessResponse for a finished graph run"""
+    # Handle processing errors
+    if result.get("error"):
+        logger.error(f"Processing error: {result['error']}")
+        return ProcessResponse(
+            success=False,
+            error_message=result["error"],
+            session_id=session_id,
+            processing_time=time.time() - start_time
+        )
+    
+    # Convert action plan to ActionStep objects
+    action_steps = []
+    for step in result.get("action_plan", []):
+        action_steps.append(ActionStep(
+            type=step.get("type", "unknown"),
+            x=step.get("x"),
+            y=step.get("y"),
+            text=step.get("text"),
+            description=step.get("description", ""),
+            confidence=step.get("confidence")
+        ))
+    
+    # Encode TTS audio if available
+    tts_audio_b64 = None
+    tts_stream_url = None
+    # Note: TTS audio is no longer stored in state to avoid JSON serialization issues
+    if result.get("tts_stream_id"):
+        # Audio is still being synthesized; the client plays it from the stream URL
+        tts_stream_url = f"/tts/stream/{result['tts_stream_id']}"
+    
+    # Build successful response
+    return ProcessResponse(
+        success=True,
+        transcript=result.get("transcript"),
+        intent=result.get("intent"),
+        action_plan=action_steps,
+        tts_audio=tts_audio_b64,
+        tts_stream_url=tts_stream_url,
+        response_text=result.get("response_text"),
+        session_id=session_id,
+        processing_time=time.time() - start_time
+    )
+
+def job_response(job: Job) -> JobResponse:
+    """Pollable view of a /process?mode=async job"""
+    return JobResponse(**job.view(), status_url=f"/jobs/{job.job_id}")
+
 @app.post("/process", response_model=ProcessResponse)
 async def process_request(
+    http_request: Request,
     audio: UploadFile = File(...),
     screenshot: Optional[UploadFile] = File(None),
     ui_tree: Optional[str] = Form(None),
@@ -160,15 +248,30 @@ async def process_request(
     tts_provider: Optional[str] = Form(None),
     tts_model: Optional[str] = Form(None),
     tts_voice: Optional[str] = Form(None),
+    tts_stream: bool = Form(False),
+    callback_url: Optional[str] = Form(None),
+    mode: str = "sync",
+    x_latency_budget_ms: Optional[str] = Header(None),
     _env_check: None = Depends(verify_environment)
 ):
-    """Main endpoint to process voice commands with optional screenshot and UI tree"""
+    """Main endpoint to process voice commands with optional screenshot and UI tree (mode=async returns a job id)"""
+    if mode not in ("sync", "async"):
+        raise HTTPException(status_code=400, detail=f"Invalid mode: {mode}")
     
     # Generate session ID if not provided
     if not session_id:
         session_id = str(uuid.uuid4())
     
     start_time = time.time()
+    # The budget starts when the request arrives, so upload handling counts against it;
+    # async jobs aren't holding a connection open and get a longer one
+    if mode == "async":
+        deadline = get_request_deadline(x_latency_budget_ms, "PROCESS_ASYNC_LATENCY_BUDGET_MS", "30000")
+    else:
+        deadline = get_request_deadline(x_latency_budget_ms, "PROCESS_LATENCY_BUDGET_MS", "3000")
+    request_id = str(uuid.uuid4())
+    # Set once a job owns the request's media, which then outlives this handler
+    handed_to_job = False
     logger.info(f"Processing request for session: {session_id}")
     
     try:
@@ -182,23 +285,23 @@ async def process_request(
         
         logger.info(f"Audio data received: {len(audio_data)} bytes")
         
-        # Read and validate screenshot if provided
+        # Check the image header up front, then fully validate and optimize the screenshot in the
+        # background so STT doesn't wait on image work only the VLM needs; nodes await it through
+        # prepared_screenshots
         screenshot_data = None
         if screenshot:
             screenshot_data = await screenshot.read()
             if screenshot_data:
-                if not validate_image(screenshot_data):
+                # Reading the header is cheap; reject what isn't an image before spending any provider calls
+                if not validate_image_header(screenshot_data):
                     raise HTTPException(status_code=400, detail="Invalid image format")
-                
-                # Optimize image for VLM processing
-                screenshot_data = optimize_image(screenshot_data)
-                image_info = get_image_info(screenshot_data)
-                logger.info(f"Screenshot processed: {image_info}")
+                prepared_screenshots.start(request_id, prepare_screenshot(screenshot_data))
         
         # Build state for LangGraph (don't store bytes data to avoid JSON serialization issues)
         state = {
             "ui_tree": ui_tree,
             "session_id": session_id,
+            "request_id": request_id,
             # Store metadata instead of raw bytes
             "has_audio": bool(audio_data),
             "has_screenshot": bool(screenshot_data),
@@ -212,60 +315,55 @@ async def process_request(
                 "tts": {"provider": tts_provider, "model": tts_model, "voice": tts_voice}
             }
         }
+        if tts_stream:
+            state["tts_streaming"] = True
+        if deadline:
+            state["deadline"] = deadline
         
-        # Store bytes data separately for node access
+        # Audio stays out of the graph state (and its checkpoints); the STT node resolves the handle
         if audio_data:
-            state["_audio_bytes"] = audio_data  # Temporary storage for STT node
-        if screenshot_data:
-            state["_screenshot_bytes"] = screenshot_data  # Temporary storage for VLM node
+            try:
+                state["audio_blob"] = blob_store.put(audio_data, owner=request_id)
+            except BlobStoreFullError as e:
+                logger.warning(str(e))
+                raise HTTPException(status_code=503, detail="Server is busy, please retry")
         
-        # Process through LangGraph
-        result = await aura_graph.process(state, session_id)
+        if mode == "async":
+            async def run_job(job: Job) -> Dict[str, Any]:
+                try:
+                    # A later request for the session neither pre-empts this job nor drops it from the
+                    # session's queue; it runs after the job instead
+                    result = await session_requests.run(
+                        session_id,
+                        aura_graph.process(state, session_id, on_update=job.update, preemptible=False),
+                        preemptible=False
+                    )
+                    return jsonable_encoder(build_process_response(result, session_id, start_time))
+                finally:
+                    prepared_screenshots.release(request_id)
+                    blob_store.release(request_id)
+            
+            try:
+                job = job_store.submit(run_job, session_id=session_id, callback_url=callback_url)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except JobStoreFullError as e:
+                logger.warning(str(e))
+                raise HTTPException(status_code=503, detail="Server is busy, please retry")
+            handed_to_job = True
+            return JSONResponse(status_code=202, content=jsonable_encoder(job_response(job)))
         
-        # Handle processing errors
-        if result.get("error"):
-            logger.error(f"Processing error: {result['error']}")
-            return ProcessResponse(
-                success=False,
-                error_message=result["error"],
-                session_id=session_id,
-                processing_time=time.time() - start_time
+        # Process through LangGraph; cancelled if the client disconnects or the session sends a newer request
+        try:
+            result = await session_requests.run(
+                session_id, aura_graph.process(state, session_id), receive=http_request.receive
             )
+        except RequestCancelled as e:
+            return cancelled_response(e, session_id, start_time)
         
-        # Convert action plan to ActionStep objects
-        action_steps = []
-        for step in result.get("action_plan", []):
-            action_steps.append(ActionStep(
-                type=step.get("type", "unknown"),
-                x=step.get("x"),
-                y=step.get("y"),
-                text=step.get("text"),
-                description=step.get("description", ""),
-                confidence=step.get("confidence")
-            ))
-        
-        # Encode TTS audio if available
-        tts_audio_b64 = None
-        # Note: TTS audio is no longer stored in state to avoid JSON serialization issues
-        # For now, we'll indicate if TTS was generated
-        if result.get("tts_audio_available"):
-            # In a real implementation, you might store audio in a cache/file system
-            # and return a URL or handle the audio separately
-            pass
-        
-        # Build successful response
-        response = ProcessResponse(
-            success=True,
-            transcript=result.get("transcript"),
-            intent=result.get("intent"),
-            action_plan=action_steps,
-            tts_audio=tts_audio_b64,
-            response_text=result.get("response_text"),
-            session_id=session_id,
-            processing_time=time.time() - start_time
-        )
-        
-        logger.info(f"Successfully processed request for session: {session_id}")
+        response = build_process_response(result, session_id, start_time)
+        if response.success:
+            logger.info(f"Successfully processed request for session: {session_id}")
         return response
         
     except HTTPException:
@@ -273,16 +371,31 @@ async def process_request(
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        if not handed_to_job:
+            prepared_screenshots.release(request_id)
+            blob_store.release(request_id)
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Status and partial results of a /process?mode=async job"""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found (unknown or expired)")
+    return job_response(job)
 
 @app.post("/chat", response_model=ChatResponse)
 async def chat_only(
     request: ChatRequest,
+    http_request: Request,
     # New provider/model selection parameters for chat
     llm_provider: Optional[str] = None,
     llm_model: Optional[str] = None,
+    x_latency_budget_ms: Optional[str] = Header(None),
     _env_check: None = Depends(verify_environment)
 ):
     """Text-only chat endpoint for testing without audio"""
+    deadline = get_request_deadline(x_latency_budget_ms, "CHAT_LATENCY_BUDGET_MS", "10000")
     
     # Ensure we have a valid UUID session_id
     session_id = request.session_id
@@ -306,9 +419,18 @@ async def chat_only(
                 "llm": {"provider": llm_provider, "model": llm_model}
             }
         }
+        if deadline:
+            state["deadline"] = deadline
         
         # Process through LangGraph (skip STT node)
-        result = await aura_graph.process(state, session_id)
+        try:
+            result = await session_requests.run(
+                session_id, aura_graph.process(state, session_id), receive=http_request.receive
+            )
+        except RequestCancelled as e:
+            if e.reason == "disconnected":
+                raise HTTPException(status_code=499, detail="Client disconnected")
+            return ChatResponse(success=False, response="Superseded by a newer request", session_id=session_id)
         
         return ChatResponse(
             success=True,
@@ -317,10 +439,25 @@ async def chat_only(
             session_id=session_id
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Chat error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/tts/stream/{stream_id}")
+async def stream_tts_audio(stream_id: str):
+    """Stream TTS audio chunks progressively as they are synthesized"""
+    stream = audio_streams.get(stream_id)
+    if not stream:
+        raise HTTPException(status_code=404, detail="Audio stream not found or expired")
+    
+    return StreamingResponse(
+        stream.iter_chunks(),
+        media_type="audio/wav",
+        headers={"Cache-Control": "no-store"}
+    )
+
 @app.get("/graph/info")
 async def get_graph_info():
     """Get information about the LangGraph structure"""
@@ -338,11 +475,10 @@ async def get_session_history(session_id: str):
 
 @app.delete("/session/{session_id}")
 async def clear_session(session_id: str):
-    """Clear conversation history for a session"""
+    """Clear conversation history and checkpoints for a session"""
     try:
-        # This would clear the session from the checkpointer
-        # For now, just acknowledge the request
-        return {"message": f"Session {session_id} cleared", "success": True}
+        existed = await aura_graph.clear_session(session_id)
+        return {"message": f"Session {session_id} cleared", "success": True, "existed": existed}
     except Exception as e:
         logger.error(f"Session clear error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
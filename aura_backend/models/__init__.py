@@ -1,4 +1,4 @@
-from .request_models import ProcessRequest, ProcessResponse, ActionStep, UIElement, ChatRequest, ChatResponse
+from .request_models import ProcessRequest, ProcessResponse, ActionStep, UIElement, ChatRequest, ChatResponse, JobResponse
 from .action_plan import ActionPlan, GraphState, IntentClassification, VLMResult
 
 __all__ = [
@@ -8,6 +8,7 @@ __all__ = [
     "UIElement",
     "ChatRequest",
     "ChatResponse",
+    "JobResponse",
     "ActionPlan",
     "GraphState",
     "IntentClassification",
@@ -35,6 +35,7 @@ class ProcessResponse(BaseModel):
     intent: Optional[str] = None
     action_plan: List[ActionStep] = []
     tts_audio: Optional[str] = None  # base64 encoded
+    tts_stream_url: Optional[str] = None  # Chunked audio stream when tts_stream is requested
     response_text: Optional[str] = None
     error_message: Optional[str] = None
     session_id: Optional[str] = None
@@ -64,3 +65,17 @@ class ChatResponse(BaseModel):
     response: str
     intent: Optional[str] = None
     session_id: Optional[str] = None
+
+class JobResponse(BaseModel):
+    """Status of a /process?mode=async job; partial fills in as graph nodes finish"""
+    job_id: str
+    status: str  # "queued", "running", "completed", "failed", "cancelled"
+    session_id: Optional[str] = None
+    status_url: Optional[str] = None
+    partial: Dict[str, Any] = {}
+    result: Optional[ProcessResponse] = None
+    error: Optional[str] = None
+    callback_status: Optional[str] = None
+    created_at: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
@@ -15,9 +15,9 @@ class ActionPlannerNode:
         logger.info("Action Planner Node: Creating action plan")
         
         try:
-            intent_data = state.get("intent_data", {})
+            intent_data = state.get("intent_data") or {}
             ui_coords = state.get("ui_element_coords")
-            intent = state.get("intent", "Unknown action")
+            intent = state.get("intent") or "Unknown action"
             
             # Create action plan based on available information
             if ui_coords:
@@ -32,23 +32,15 @@ class ActionPlannerNode:
             logger.info(f"Action Planner Node: Action plan created with {len(action_plan)} steps")
             
             return {
-                **state,
                 "action_plan": action_plan,
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
             
         except Exception as e:
             logger.error(f"Action Planner Node error: {str(e)}")
             return {
-                **state,
                 "error": f"Action planning failed: {str(e)}",
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
     
     def _create_coordinate_based_plan(self, intent_data: dict, coords: dict, intent: str) -> list:
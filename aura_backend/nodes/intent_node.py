@@ -1,14 +1,20 @@
 # Generated by Copilot
-from ai_services import llm_service
+from ai_services import llm_service, vlm_service
 from optimized_intent_analyzer import optimized_intent_analyzer
+from optimized_vlm_analyzer import optimized_vlm_analyzer
+from utils.speculation import speculative_vlm
+from utils.prepared_inputs import prepared_screenshots, load_screenshot
+from utils.logging_config import lazy_json
 import logging
 import time
 import traceback
-import json
 import os
 
 logger = logging.getLogger(__name__)
 
+# Start screenshot analysis alongside intent analysis instead of after it
+SPECULATIVE_VLM = os.getenv("SPECULATIVE_VLM", "true").lower() == "true"
+
 class IntentNode:
     """Optimized Intent analysis node using advanced prompt templates"""
     
@@ -19,8 +25,7 @@ class IntentNode:
         """Analyze user intent from transcript with optimized processing"""
         start_time = time.time()
         logger.info("🎯 Intent Node: Starting optimized intent analysis")
-        logger.info(f"🎯 Intent Node: Input state keys: {list(state.keys())}")
-        logger.info(f"🎯 Intent Node: Transcript: '{state.get('transcript', 'None')}'")
+        logger.debug("🎯 Intent Node: Input state keys: %s", list(state.keys()))
         
         try:
             # Check if transcript is available
@@ -28,16 +33,22 @@ class IntentNode:
             if not transcript:
                 logger.error("❌ Intent Node: No transcript available")
                 return {
-                    **state,
                     "error": "No transcript available for intent analysis",
-                    "node_execution_times": {
-                        **state.get("node_execution_times", {}),
-                        self.name: time.time() - start_time
-                    }
+                    "node_execution_times": {self.name: time.time() - start_time}
                 }
                 
             logger.info(f"🎯 Intent Node: Processing transcript: '{transcript}'")
             
+            # Most UI commands end up needing the screen, so analyse it while the intent is classified
+            request_id = state.get("request_id")
+            has_screenshot = (state.get("screenshot_blob") or state.get("_screenshot_bytes")
+                              or prepared_screenshots.has(request_id))
+            speculate = state.get("speculative_vlm")
+            if speculate is None:
+                speculate = SPECULATIVE_VLM
+            if request_id and has_screenshot and speculate:
+                speculative_vlm.start(request_id, self._analyze_screen(state, transcript))
+            
             # Use optimized intent analyzer
             try:
                 intent_result = await optimized_intent_analyzer.analyze_intent_optimized(
@@ -46,13 +57,13 @@ class IntentNode:
                     llm_service=llm_service
                 )
                 
-                logger.info(f"🎯 Intent Node: Optimized analysis result: {json.dumps(intent_result, indent=2)}")
+                logger.debug("🎯 Intent Node: Optimized analysis result: %s", lazy_json(intent_result))
                 
             except Exception as opt_error:
                 logger.warning(f"🎯 Intent Node: Optimized analysis failed: {opt_error}, falling back to standard")
                 
                 # Fallback to standard LLM analysis
-                prefs = state.get("provider_preferences", {}).get("llm", {})
+                prefs = (state.get("provider_preferences") or {}).get("llm", {})
                 provider = prefs.get("provider") or os.getenv("LLM_PROVIDER", None)
                 model = prefs.get("model") or os.getenv("LLM_MODEL", None)
                 
@@ -66,18 +77,17 @@ class IntentNode:
             # Check for API errors
             if "error" in intent_result:
                 logger.error(f"❌ Intent Node: Analysis error - {intent_result['error']}")
+                speculative_vlm.discard(state.get("request_id"))
                 return {
-                    **state,
                     "error": intent_result["error"],
-                    "node_execution_times": {
-                        **state.get("node_execution_times", {}),
-                        self.name: time.time() - start_time
-                    }
+                    "node_execution_times": {self.name: time.time() - start_time}
                 }
                 
             # Extract intent information
             intent = intent_result.get("intent", "Unknown intent")
             requires_screen_analysis = intent_result.get("requires_screen_analysis", True)
+            if not requires_screen_analysis:
+                speculative_vlm.discard(state.get("request_id"))
             
             # Log analysis results with timing
             analysis_time = time.time() - start_time
@@ -89,17 +99,13 @@ class IntentNode:
             logger.info(f"✅ Intent Node: Requires screen analysis - {requires_screen_analysis}")
             
             result_state = {
-                **state,
                 "intent": intent,
                 "intent_data": intent_result,
                 "use_vlm": requires_screen_analysis,
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: analysis_time
-                }
+                "node_execution_times": {self.name: analysis_time}
             }
             
-            logger.info(f"✅ Intent Node: Output state keys: {list(result_state.keys())}")
+            logger.debug("✅ Intent Node: Output state keys: %s", list(result_state.keys()))
             return result_state
             
         except Exception as e:
@@ -107,13 +113,20 @@ class IntentNode:
             logger.error(f"❌ Intent Node error: {str(e)}")
             logger.error(f"❌ Intent Node traceback: {error_trace}")
             return {
-                **state,
                 "error": f"Intent analysis failed: {str(e)}",
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
-            }# Global instance
-intent_node = IntentNode()
+                "node_execution_times": {self.name: time.time() - start_time}
+            }
+    
+    async def _analyze_screen(self, state: dict, transcript: str) -> dict:
+        """Speculative screenshot analysis, prompted with the transcript"""
+        screenshot = await load_screenshot(state)
+        if "error" in screenshot:
+            return {"found": False, "error": screenshot["error"]}
+        return await optimized_vlm_analyzer.analyze_screenshot_optimized(
+            screenshot_bytes=screenshot["bytes"],
+            intent=transcript,
+            vlm_service=vlm_service
+        )
+
 # Create node instance
 intent_node = IntentNode()
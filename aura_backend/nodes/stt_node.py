@@ -1,5 +1,8 @@
 # Generated by Copilot
 from ai_services import stt_service
+from providers.auto_model_selector import auto_selector
+from providers.deadline import is_tight
+from utils.blob_store import blob_store
 import logging
 import time
 import os
@@ -18,35 +21,32 @@ class STTNode:
         logger.info("STT Node: Starting speech-to-text processing")
         
         # Check if transcript is already provided (text-only mode)
-        if state.get("transcript") and not state.get("_audio_bytes"):
+        if state.get("transcript") and not (state.get("audio_blob") or state.get("_audio_bytes")):
             logger.info("STT Node: Text already provided, skipping STT processing")
             return {
-                **state,
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
         
         # Check if audio data is available
-        audio_data = state.get("_audio_bytes")
+        audio_data = await blob_store.aget(state.get("audio_blob")) or state.get("_audio_bytes")
         if not audio_data:
             logger.error("STT Node: No audio data provided")
             return {
-                **state,
                 "error": "No audio data provided",
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
             
         try:
             # Perform speech-to-text conversion with configurable provider/model
-            prefs = state.get("provider_preferences", {}).get("stt", {})
+            prefs = (state.get("provider_preferences") or {}).get("stt", {})
             provider = prefs.get("provider") or os.getenv("STT_PROVIDER", None)
             model = prefs.get("model") or os.getenv("STT_MODEL", None)
             
+            # Tight request budget and no explicit choice: use the fastest transcription model
+            if not provider and not model and is_tight(state):
+                provider, model = auto_selector.select_model("stt", performance_mode="speed")
+                logger.info(f"STT Node: Request deadline is tight, using {provider}/{model}")
+            
             transcript = await stt_service.transcribe(
                 audio_data, 
                 provider=provider,
@@ -56,33 +56,21 @@ class STTNode:
             if transcript:
                 logger.info(f"STT Node: Transcription successful - '{transcript[:100]}...'")
                 return {
-                    **state,
                     "transcript": transcript,
-                    "node_execution_times": {
-                        **state.get("node_execution_times", {}),
-                        self.name: time.time() - start_time
-                    }
+                    "node_execution_times": {self.name: time.time() - start_time}
                 }
             else:
                 logger.error("STT Node: Failed to transcribe audio")
                 return {
-                    **state,
                     "error": "STT failed to transcribe audio",
-                    "node_execution_times": {
-                        **state.get("node_execution_times", {}),
-                        self.name: time.time() - start_time
-                    }
+                    "node_execution_times": {self.name: time.time() - start_time}
                 }
                 
         except Exception as e:
             logger.error(f"STT Node error: {str(e)}")
             return {
-                **state,
                 "error": f"STT processing failed: {str(e)}",
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
 
 # Create node instance
@@ -1,5 +1,8 @@
 # Generated by Copilot
 from ai_services import tts_service, llm_service
+from utils.audio_streams import audio_streams
+from providers.deadline import deadline_scope, is_expired
+from utils.logging_config import lazy_json
 import logging
 import time
 import traceback
@@ -14,24 +17,23 @@ class TTSNode:
     def __init__(self):
         self.name = "tts"
     
-    async def run(self, state: dict) -> dict:
-        """Generate TTS audio and finalize response"""
+    async def run(self, state: dict, synthesize: bool = True) -> dict:
+        """Generate TTS audio and finalize response; synthesize=False builds only the response text"""
         start_time = time.time()
         logger.info("🔊 TTS Node: Starting text-to-speech generation")
-        logger.info(f"🔊 TTS Node: Input state keys: {list(state.keys())}")
-        logger.info(f"🔊 TTS Node: Intent: '{state.get('intent', 'None')}'")
-        logger.info(f"🔊 TTS Node: Action plan: {state.get('action_plan', [])}")
+        logger.debug("🔊 TTS Node: Intent: '%s', action plan: %s",
+                     state.get("intent"), lazy_json(state.get("action_plan") or []))
         
         try:
-            action_plan = state.get("action_plan", [])
-            intent = state.get("intent", "")
+            action_plan = state.get("action_plan") or []
+            intent = state.get("intent") or ""
             error = state.get("error")
             
             logger.info(f"🔊 TTS Node: Processing - Error: {error}, Intent: {intent}")
             
             # Generate appropriate response text
             # Check if this is a simple action that doesn't need screen
-            action_plan = state.get("action_plan", [])
+            action_plan = state.get("action_plan") or []
             is_simple_action = any(
                 action.get("requires_screen") == False 
                 for action in action_plan
@@ -41,18 +43,62 @@ class TTSNode:
                 response_text = self._generate_error_response(error, intent)
                 logger.info(f"🔊 TTS Node: Generated error response: '{response_text}'")
             else:
-                response_text = await self._generate_success_response(action_plan, intent)
+                response_text = await self.generate_success_response(action_plan, intent)
                 logger.info(f"🔊 TTS Node: Generated success response: '{response_text}'")
                 # Clear error for simple actions that don't need screen
                 if is_simple_action:
                     error = None
             
+            # Text-only turns (/chat) never return audio, so don't spend TTS quota on one
+            if not synthesize:
+                logger.info("🔊 TTS Node: Text-only turn, skipping speech synthesis")
+                return {
+                    "response_text": response_text,
+                    "complete": True,
+                    "tts_audio_available": False,
+                    "node_execution_times": {self.name: time.time() - start_time}
+                }
+            
             # Generate TTS audio with configurable provider/model
-            prefs = state.get("provider_preferences", {}).get("tts", {})
+            prefs = (state.get("provider_preferences") or {}).get("tts", {})
             provider = prefs.get("provider") or os.getenv("TTS_PROVIDER", None)
             model = prefs.get("model") or os.getenv("TTS_MODEL", None)
             voice = prefs.get("voice") or os.getenv("TTS_VOICE", None)
             
+            # Streaming mode: start synthesis in the background and hand the client a
+            # stream id, so playback can begin before the whole WAV is generated
+            streaming = state.get("tts_streaming")
+            if streaming is None:
+                streaming = os.getenv("TTS_STREAMING", "false").lower() == "true"
+            if streaming:
+                # Synthesis outlives the request, so the producer runs without its deadline
+                with deadline_scope(None):
+                    stream_id = audio_streams.start(tts_service.stream_speech(
+                        response_text,
+                        provider=provider,
+                        model=model,
+                        voice=voice
+                    ))
+                logger.info(f"🔊 TTS Node: Streaming TTS started (stream {stream_id})")
+                return {
+                    "response_text": response_text,
+                    "complete": True,
+                    "tts_audio_available": True,
+                    "tts_stream_id": stream_id,
+                    "node_execution_times": {self.name: time.time() - start_time}
+                }
+            
+            # Out of time: answer with text only rather than holding the response for audio
+            if is_expired(state):
+                logger.warning("⏱️ TTS Node: Request deadline exceeded, returning text-only response")
+                return {
+                    "response_text": response_text,
+                    "complete": True,
+                    "tts_audio_available": False,
+                    "tts_error": "Skipped: request deadline exceeded",
+                    "node_execution_times": {self.name: time.time() - start_time}
+                }
+            
             logger.info("🔊 TTS Node: Calling TTS service...")
             tts_audio = await tts_service.generate_speech(
                 response_text,
@@ -67,13 +113,9 @@ class TTSNode:
             
             # Build final response
             result = {
-                **state,
                 "response_text": response_text,
                 "complete": True,
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
             
             # Handle TTS audio separately - don't store bytes in state
@@ -90,20 +132,16 @@ class TTSNode:
                 result["tts_audio_available"] = False
                 result["tts_error"] = "TTS generation failed"
             
-            logger.info(f"✅ TTS Node: Final result keys: {list(result.keys())}")
+            logger.debug("✅ TTS Node: Final result keys: %s", list(result.keys()))
             return result
                 
         except Exception as e:
             logger.error(f"TTS Node error: {str(e)}")
             return {
-                **state,
                 "response_text": "I encountered an issue processing your request.",
                 "error": f"TTS processing failed: {str(e)}",
                 "complete": True,
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
     
     def _generate_error_response(self, error: str, intent: str) -> str:
@@ -119,7 +157,7 @@ class TTSNode:
         else:
             return f"I'm sorry, I couldn't complete that action. {intent}"
     
-    async def _generate_success_response(self, action_plan: list, intent: str) -> str:
+    async def generate_success_response(self, action_plan: list, intent: str) -> str:
         """Generate appropriate success response"""
         if not action_plan:
             return "I'm ready to help, but I need more information about what you'd like me to do."
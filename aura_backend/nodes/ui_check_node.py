@@ -3,6 +3,8 @@ import xml.etree.ElementTree as ET
 import json
 import time
 
+from utils.speculation import speculative_vlm
+
 logger = logging.getLogger(__name__)
 
 class UICheckNode:
@@ -17,33 +19,26 @@ class UICheckNode:
         logger.info("UI Check Node: Starting UI tree analysis")
         
         ui_tree = state.get("ui_tree")
-        intent_data = state.get("intent_data", {})
+        intent_data = state.get("intent_data") or {}
         requires_screen_analysis = intent_data.get("requires_screen_analysis", True)
         
         # If intent doesn't require screen analysis, create simple action plan
         if not requires_screen_analysis:
             logger.info("UI Check Node: Intent doesn't require screen analysis, creating simple action plan")
-            action_plan = self._create_simple_action_plan(intent_data)
+            action_plan = self.create_simple_action_plan(intent_data)
+            speculative_vlm.discard(state.get("request_id"))
             return {
-                **state,
                 "action_plan": action_plan,
                 "use_vlm": False,
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
         
         # If no UI tree available, fall back to VLM
         if not ui_tree:
             logger.info("UI Check Node: No UI tree available, will use VLM")
             return {
-                **state,
                 "use_vlm": True,
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
             
         try:
@@ -54,36 +49,25 @@ class UICheckNode:
                 # Create action plan from UI tree
                 action_plan = self._create_action_plan_from_tree(ui_tree, intent_data)
                 logger.info("UI Check Node: Found elements in UI tree, created action plan")
+                speculative_vlm.discard(state.get("request_id"))
                 return {
-                    **state,
                     "action_plan": action_plan,
                     "use_vlm": False,
-                    "node_execution_times": {
-                        **state.get("node_execution_times", {}),
-                        self.name: time.time() - start_time
-                    }
+                    "node_execution_times": {self.name: time.time() - start_time}
                 }
             else:
                 logger.info("UI Check Node: Target elements not found in UI tree, will use VLM")
                 return {
-                    **state,
                     "use_vlm": True,
-                    "node_execution_times": {
-                        **state.get("node_execution_times", {}),
-                        self.name: time.time() - start_time
-                    }
+                    "node_execution_times": {self.name: time.time() - start_time}
                 }
                 
         except Exception as e:
             logger.error(f"UI Check Node error: {str(e)}")
             # Fallback to VLM on any error
             return {
-                **state,
                 "use_vlm": True,
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
     
     def _find_elements_in_tree(self, ui_tree: str, target_elements: list) -> bool:
@@ -112,7 +96,7 @@ class UICheckNode:
             logger.error(f"UI tree search error: {str(e)}")
             return False
     
-    def _create_simple_action_plan(self, intent_data: dict) -> list:
+    def create_simple_action_plan(self, intent_data: dict) -> list:
         """Create simple action plan for non-screen actions"""
         try:
             action_type = intent_data.get("action_type", "system_command")
@@ -1,12 +1,18 @@
 # Generated by Copilot
 from ai_services import vlm_service
 from optimized_vlm_analyzer import optimized_vlm_analyzer
+from providers.deadline import remaining, is_tight
+from utils.speculation import speculative_vlm
+from utils.prepared_inputs import load_screenshot
 import logging
 import time
 import os
 
 logger = logging.getLogger(__name__)
 
+# Screen analysis rarely finishes faster than this; with less budget left, skip it
+VLM_MIN_BUDGET_SECONDS = float(os.getenv("VLM_MIN_BUDGET_SECONDS", "0.5"))
+
 class VLMNode:
     """Optimized Vision-Language Model node for UI element detection"""
     
@@ -18,21 +24,35 @@ class VLMNode:
         start_time = time.time()
         logger.info("🔍 VLM Node: Starting optimized vision-language model analysis")
         
-        screenshot = state.get("_screenshot_bytes")
-        intent = state.get("intent", "")
-        intent_data = state.get("intent_data", {})
+        intent = state.get("intent") or ""
+        intent_data = state.get("intent_data") or {}
         action_type = intent_data.get("action_type", "")
         
-        # Check if screenshot is available
+        # Check if screenshot is available (waits for background preparation started by /process)
+        prepared = await load_screenshot(state)
+        screenshot = prepared.get("bytes")
         if not screenshot:
-            logger.error("❌ VLM Node: No screenshot data available")
+            logger.error(f"❌ VLM Node: {prepared['error']}")
+            return {
+                "error": prepared["error"],
+                "node_execution_times": {self.name: time.time() - start_time}
+            }
+            
+        # Reuse the analysis the intent node started speculatively, if any
+        speculative_result = await self._claim_speculative(state.get("request_id"))
+        if speculative_result is not None:
+            logger.info(f"✅ VLM Node: Used speculative analysis, waited {time.time() - start_time:.3f}s")
+            return {
+                "vlm_result": {**speculative_result, "_speculative": True},
+                "node_execution_times": {self.name: time.time() - start_time}
+            }
+        
+        time_left = remaining(state)
+        if time_left is not None and time_left < VLM_MIN_BUDGET_SECONDS:
+            logger.warning(f"⏱️ VLM Node: Only {time_left * 1000:.0f}ms of request budget left, skipping screen analysis")
             return {
-                **state,
-                "error": "No screenshot data available for VLM analysis",
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "vlm_result": {"found": False, "error": "Skipped: request deadline too close", "_deadline_skipped": True},
+                "node_execution_times": {self.name: time.time() - start_time}
             }
             
         try:
@@ -45,19 +65,19 @@ class VLMNode:
                     vlm_service=vlm_service
                 )
                 
-                logger.info(f"🔍 VLM Node: Optimized analysis result: {vlm_result}")
+                logger.debug("🔍 VLM Node: Optimized analysis result: %s", vlm_result)
                 
             except Exception as opt_error:
                 logger.warning(f"🔍 VLM Node: Optimized analysis failed: {opt_error}, falling back to standard")
                 
                 # Fallback to standard VLM analysis
-                prefs = state.get("provider_preferences", {}).get("vlm", {})
+                prefs = (state.get("provider_preferences") or {}).get("vlm", {})
                 provider = prefs.get("provider") or os.getenv("VLM_PROVIDER", None)
                 model = prefs.get("model") or os.getenv("VLM_MODEL", None)
                 
                 # Enable auto mode if no specific provider/model specified
                 auto_mode = not provider and not model
-                performance_mode = prefs.get("performance_mode", "balanced")
+                performance_mode = "speed" if is_tight(state) else prefs.get("performance_mode", "balanced")
                 cost_sensitive = prefs.get("cost_sensitive", True)
                 
                 vlm_result = await vlm_service.locate_ui_element(
@@ -80,24 +100,31 @@ class VLMNode:
                        f"Confidence: {vlm_result.get('confidence', 0):.2f}")
             
             return {
-                **state,
                 "vlm_result": vlm_result,
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: analysis_time
-                }
+                "node_execution_times": {self.name: analysis_time}
             }
             
         except Exception as e:
             logger.error(f"❌ VLM Node error: {str(e)}")
             return {
-                **state,
                 "error": f"VLM analysis failed: {str(e)}",
-                "node_execution_times": {
-                    **state.get("node_execution_times", {}),
-                    self.name: time.time() - start_time
-                }
+                "node_execution_times": {self.name: time.time() - start_time}
             }
 
+    async def _claim_speculative(self, request_id):
+        """Result of the speculative analysis for this request, or None if there was none or it failed"""
+        task = speculative_vlm.claim(request_id) if request_id else None
+        if task is None:
+            return None
+        try:
+            result = await task
+        except Exception as e:
+            logger.warning(f"🔍 VLM Node: Speculative analysis failed: {e}")
+            result = None
+        if not result or result.get("error"):
+            speculative_vlm.record_failure()
+            return None
+        return result
+
 # Create node instance
 vlm_node = VLMNode()
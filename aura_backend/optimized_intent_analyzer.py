@@ -11,6 +11,9 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from enum import Enum
 
+from providers.auto_model_selector import auto_selector
+from providers.deadline import is_expired, is_tight
+
 try:
     from performance_monitor import performance_monitor
     PERFORMANCE_TRACKING = True
@@ -468,24 +471,9 @@ BE FAST and ACCURATE.""",
         
         return result
 
-    async def analyze_intent_optimized(
-        self, 
-        transcript: str, 
-        ui_tree: Optional[str] = None,
-        llm_service = None
-    ) -> Dict[str, Any]:
-        """
-        Optimized intent analysis with fast classification and specialized prompts
-        """
-        start_time = time.time()
-        
-        if not transcript or not transcript.strip():
-            return {
-                "error": "Empty transcript",
-                "confidence": 0.0,
-                "requires_screen_analysis": False
-            }
-        
+    def lookup_fast_intent(self, transcript: str, start_time: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Instant-response or cached intent for a transcript without calling an LLM, else None"""
+        start_time = start_time or time.time()
         transcript_clean = transcript.lower().strip()
         
         # Step 0: Check for instant responses (ultra-fast)
@@ -536,6 +524,33 @@ BE FAST and ACCURATE.""",
             logger.info(f"Cache hit for '{transcript_clean[:30]}': {result['intent']}")
             return result
         
+        return None
+
+    async def analyze_intent_optimized(
+        self, 
+        transcript: str, 
+        ui_tree: Optional[str] = None,
+        llm_service = None
+    ) -> Dict[str, Any]:
+        """
+        Optimized intent analysis with fast classification and specialized prompts
+        """
+        start_time = time.time()
+        
+        if not transcript or not transcript.strip():
+            return {
+                "error": "Empty transcript",
+                "confidence": 0.0,
+                "requires_screen_analysis": False
+            }
+        
+        fast_result = self.lookup_fast_intent(transcript, start_time)
+        if fast_result:
+            return fast_result
+        
+        transcript_clean = transcript.lower().strip()
+        cache_key = transcript_clean[:50]  # Limit cache key size
+        
         try:
             # Step 1: Fast classification
             category = self.classify_intent_fast(transcript)
@@ -545,22 +560,28 @@ BE FAST and ACCURATE.""",
                 category = IntentCategory.UTILITY
                 logger.info(f"Using general analysis for: {transcript[:50]}")
             
+            # No request budget left for an LLM round trip: answer from patterns only
+            if is_expired():
+                logger.warning(f"Request deadline exceeded, skipping LLM intent analysis for '{transcript[:30]}'")
+                result = self._get_simple_response(transcript) or self._create_fallback_result(transcript, category)
+                result["_analysis_time"] = time.time() - start_time
+                result["_deadline_fallback"] = True
+                return result
+            
             # Step 2: Get optimal model for this category
             provider, model = self.get_optimized_model_for_category(category)
+            if is_tight():
+                # Little budget left: let the auto selector pick the fastest model instead
+                fast_provider, fast_model = auto_selector.select_model("llm", text=transcript, performance_mode="speed")
+                if fast_provider and fast_model:
+                    provider, model = fast_provider, fast_model
             
             # Step 3: Build optimized prompt
             prompt_config = self.build_optimized_prompt(transcript, category, ui_tree)
             
             # Step 4: Call LLM with optimized parameters
             if llm_service:
-                response = await llm_service.chat_completion(
-                    messages=prompt_config["messages"],
-                    provider=provider,
-                    model=model,
-                    temperature=prompt_config["temperature"],
-                    max_tokens=prompt_config["max_tokens"],
-                    response_format=prompt_config.get("response_format")
-                )
+                response = await self._request_intent_json(llm_service, prompt_config, provider, model)
                 
                 if response.get("success"):
                     try:
@@ -622,6 +643,79 @@ BE FAST and ACCURATE.""",
             
             return self._create_fallback_result(transcript, IntentCategory.UTILITY)
 
+    async def _request_intent_json(
+        self,
+        llm_service,
+        prompt_config: Dict[str, Any],
+        provider: str,
+        model: str
+    ) -> Dict[str, Any]:
+        """
+        Ask the LLM for the intent JSON. When the service can stream, stop reading
+        as soon as the first complete JSON object has arrived.
+        """
+        if not hasattr(llm_service, "stream_chat_completion"):
+            return await llm_service.chat_completion(
+                messages=prompt_config["messages"],
+                provider=provider,
+                model=model,
+                temperature=prompt_config["temperature"],
+                max_tokens=prompt_config["max_tokens"],
+                response_format=prompt_config.get("response_format")
+            )
+        
+        # JSON mode is not available while streaming; the prompts already demand bare JSON
+        stream = llm_service.stream_chat_completion(
+            messages=prompt_config["messages"],
+            provider=provider,
+            model=model,
+            temperature=prompt_config["temperature"],
+            max_tokens=prompt_config["max_tokens"]
+        )
+        content = ""
+        try:
+            async for delta in stream:
+                content += delta
+                complete = self._first_complete_json(content)
+                if complete is not None:
+                    return {"success": True, "content": complete}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        finally:
+            await stream.aclose()
+        
+        if not content.strip():
+            return {"success": False, "error": "Empty response"}
+        return {"success": True, "content": content}
+
+    def _first_complete_json(self, text: str) -> Optional[str]:
+        """Return the first balanced top-level JSON object in text, or None if still incomplete"""
+        start = text.find("{")
+        if start == -1:
+            return None
+        
+        depth = 0
+        in_string = False
+        escaped = False
+        for index in range(start, len(text)):
+            char = text[index]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:index + 1]
+        return None
+
     def _get_simple_response(self, transcript: str) -> Optional[Dict[str, Any]]:
         """Get simple response for common patterns without LLM"""
         transcript_lower = transcript.lower().strip()
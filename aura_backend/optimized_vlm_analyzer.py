@@ -10,6 +10,9 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from enum import Enum
 
+from providers.auto_model_selector import auto_selector
+from providers.deadline import is_tight
+
 logger = logging.getLogger(__name__)
 
 class VLMTaskType(Enum):
@@ -236,6 +239,11 @@ BE FAST, identify ONLY most important interactive elements.""",
             # Select optimal task type and model
             task_type = self.select_vlm_task_type(intent, action_type)
             provider, model = self.get_optimized_vlm_model(task_type)
+            if is_tight():
+                # Little request budget left: let the auto selector pick the fastest model instead
+                fast_provider, fast_model = auto_selector.select_model("vlm", text=intent, performance_mode="speed")
+                if fast_provider and fast_model:
+                    provider, model = fast_provider, fast_model
             
             # Build optimized prompt
             prompt_config = self.build_vlm_prompt(intent, task_type, action_type)
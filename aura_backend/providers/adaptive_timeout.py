@@ -0,0 +1,63 @@
+# Generated by Copilot
+"""
+Adaptive Timeouts for AI Providers
+Derives a per provider+model+method timeout from observed latency
+(p99 x factor, clamped to a floor and ceiling) instead of a fixed 30s
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+from .latency_tracker import LatencyTracker
+
+@dataclass
+class AdaptiveTimeoutConfig:
+    """How learned timeouts are derived"""
+    percentile: float = 0.99
+    factor: float = 3.0
+    floor: float = 1.0      # Never time out sooner than this
+    ceiling: float = 30.0   # Never wait longer than this (also used until enough samples exist)
+
+class AdaptiveTimeouts:
+    """Learned timeouts on top of the shared latency tracker"""
+
+    def __init__(self, tracker: LatencyTracker, config: AdaptiveTimeoutConfig = None):
+        self.tracker = tracker
+        self.config = config or AdaptiveTimeoutConfig()
+        self.timeouts_fired = 0
+
+    def get(self, provider: str, model: Optional[str], method: str, ceiling: Optional[float] = None) -> float:
+        """Timeout in seconds for the next call"""
+        ceiling = min(ceiling or self.config.ceiling, self.config.ceiling)
+        observed = self.tracker.percentile(provider, model, method, self.config.percentile)
+        if observed is None:
+            return ceiling
+        return max(self.config.floor, min(ceiling, observed * self.config.factor))
+
+    def record_timeout(self, provider: str, model: Optional[str], method: str, timeout: float):
+        """
+        Count a timed-out call as a sample at the timeout value, so a provider whose
+        normal latency has grown pushes its timeout up instead of failing forever
+        """
+        self.timeouts_fired += 1
+        self.tracker.record(provider, model, method, timeout)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current learned timeout per key"""
+        timeouts = {}
+        for name, stats in self.tracker.snapshot().items():
+            provider, rest = name.split("/", 1)
+            model, method = rest.rsplit("/", 1)
+            timeouts[name] = {
+                "timeout_seconds": round(self.get(provider, model, method), 3),
+                "p99_ms": stats["p99_ms"],
+                "samples": stats["samples"]
+            }
+        return {
+            "percentile": self.config.percentile,
+            "factor": self.config.factor,
+            "floor_seconds": self.config.floor,
+            "ceiling_seconds": self.config.ceiling,
+            "timeouts_fired": self.timeouts_fired,
+            "timeouts": timeouts
+        }
@@ -179,8 +179,8 @@ class AutoModelSelector:
             task_complexity=TaskComplexity.MEDIUM,
             performance_mode=PerformanceMode.BALANCED,
             context_length_needed=word_count * 4,  # Rough token estimate
-            has_images=bool(context.get("_screenshot_bytes") or context.get("image")),
-            has_audio=bool(context.get("audio_data") or context.get("_audio_bytes")),
+            has_images=bool(context.get("_screenshot_bytes") or context.get("screenshot_blob") or context.get("image")),
+            has_audio=bool(context.get("audio_data") or context.get("_audio_bytes") or context.get("audio_blob")),
             has_video=bool(context.get("video_data")),
             cost_sensitive=True
         )
@@ -5,9 +5,19 @@ Defines abstract interfaces for STT, LLM, VLM, and TTS providers
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, AsyncIterator
 from dataclasses import dataclass
+from urllib.parse import urlparse
 import logging
+import httpx
+
+from .retry import RetryPolicy, RetryBudget, send_with_retry
+
+try:
+    import h2  # noqa: F401 - required by httpx for HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +43,17 @@ class ProviderConfig:
     max_retries: int = 3
     rate_limit: Optional[Dict[str, int]] = None
     default_models: Dict[str, str] = None  # {"stt": "model", "llm": "model", ...}
+    # Connection pool settings for the shared keep-alive HTTP client
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: Optional[float] = None  # Defaults to timeout
+    http2: bool = False  # Opt-in multiplexed HTTP/2 transport
+    # Retry settings (max_retries above caps attempts per call)
+    retry_base_delay: float = 0.1
+    retry_max_delay: float = 2.0
+    retry_budget_ratio: float = 0.2  # Retries allowed as a fraction of recent requests
 
 class BaseProvider(ABC):
     """Base class for all AI providers"""
@@ -44,10 +65,133 @@ class BaseProvider(ABC):
         self.base_url = config.base_url
         self.timeout = config.timeout
         self.max_retries = config.max_retries
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._requests_sent = 0
+        self.retry_policy = RetryPolicy(
+            max_retries=config.max_retries,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay
+        )
+        self.retry_budget = RetryBudget(ratio=config.retry_budget_ratio)
+        self.healthy: Optional[bool] = None  # Cached background probe result, None until probed
         
         if not self.api_key:
             logger.warning(f"No API key provided for {self.name} provider")
     
+    def _build_http_client(self) -> httpx.AsyncClient:
+        """Create the pooled keep-alive HTTP client for this provider"""
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry
+        )
+        timeout = httpx.Timeout(
+            self.timeout,
+            connect=self.config.connect_timeout,
+            read=self.config.read_timeout or self.timeout
+        )
+        transport_options = {}
+        if self.config.http2:
+            if HTTP2_AVAILABLE:
+                transport_options["http2"] = True
+                # HTTP/2 is negotiated via TLS ALPN; plain http:// endpoints (local mock
+                # servers) need prior knowledge instead
+                if urlparse(self.base_url).scheme == "http":
+                    transport_options["http1"] = False
+            else:
+                logger.warning(f"{self.name} provider: HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+        
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=timeout,
+            event_hooks={"request": [self._on_request]},
+            **transport_options
+        )
+    
+    async def _on_request(self, request: httpx.Request):
+        """Count requests sent through the shared pool"""
+        self._requests_sent += 1
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created lazily if startup() was not called"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = self._build_http_client()
+        return self._http_client
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request over the shared pool with retries for transient failures"""
+        return await send_with_retry(
+            lambda: self.http_client.request(method, url, **kwargs),
+            self.retry_policy,
+            self.retry_budget,
+            provider_name=self.name
+        )
+    
+    async def _stream_request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Open a streaming request over the shared pool with the same retries as
+        _request (retries only happen before the body is read). Caller must aclose().
+        """
+        async def send():
+            request = self.http_client.build_request(method, url, **kwargs)
+            return await self.http_client.send(request, stream=True)
+        
+        return await send_with_retry(send, self.retry_policy, self.retry_budget, provider_name=self.name)
+    
+    @staticmethod
+    async def _iter_sse_data(response: httpx.Response) -> AsyncIterator[str]:
+        """Yield the data payload of each server-sent event in a streaming response"""
+        async for line in response.aiter_lines():
+            if line.startswith("data:"):
+                yield line[5:].strip()
+    
+    async def startup(self):
+        """Open the shared connection pool"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = self._build_http_client()
+            logger.info(f"{self.name} provider: HTTP connection pool opened")
+    
+    async def shutdown(self):
+        """Close the shared connection pool"""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+            logger.info(f"{self.name} provider: HTTP connection pool closed")
+        self._http_client = None
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Report connection pool utilisation"""
+        stats = {
+            "open": self._http_client is not None and not self._http_client.is_closed,
+            "max_connections": self.config.max_connections,
+            "max_keepalive_connections": self.config.max_keepalive_connections,
+            "keepalive_expiry": self.config.keepalive_expiry,
+            "http2": self.config.http2 and HTTP2_AVAILABLE,
+            "requests_sent": self._requests_sent
+        }
+        
+        if not stats["open"]:
+            return stats
+        
+        try:
+            # httpx does not expose pool state publicly, so read it from httpcore
+            pool = self._http_client._transport._pool
+            connections = list(pool.connections)
+            pending = getattr(pool, "_requests", [])
+            active = sum(1 for conn in connections if not conn.is_idle() and not conn.is_closed())
+            idle = sum(1 for conn in connections if conn.is_idle())
+            stats.update({
+                "connections": len(connections),
+                "active_connections": active,
+                "idle_connections": idle,
+                "queued_requests": sum(1 for req in pending if req.is_queued()),
+                "utilization": round(active / self.config.max_connections, 3) if self.config.max_connections else 0.0
+            })
+        except Exception as e:
+            stats["error"] = f"Pool stats unavailable: {str(e)}"
+        
+        return stats
+    
     @abstractmethod
     async def health_check(self) -> Dict[str, Any]:
         """Check if provider is healthy and accessible"""
@@ -58,9 +202,13 @@ class BaseProvider(ABC):
         """Get list of available models for this provider"""
         pass
     
-    def is_available(self) -> bool:
-        """Check if provider is available (has API key)"""
+    def is_configured(self) -> bool:
+        """Check if provider can be called at all (has API key)"""
         return bool(self.api_key)
+    
+    def is_available(self) -> bool:
+        """Check if provider is available (has API key and did not fail its last health probes)"""
+        return self.is_configured() and self.healthy is not False
 
 class BaseSTTProvider(BaseProvider):
     """Base Speech-to-Text provider interface"""
@@ -116,6 +264,21 @@ class BaseLLMProvider(BaseProvider):
     ) -> Dict[str, Any]:
         """Chat completion with message history"""
         pass
+    
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream chat completion text as it is generated.
+        Default implementation yields the buffered completion in one chunk.
+        """
+        response = await self.chat_completion(messages, model=model, **kwargs)
+        if not response.get("success"):
+            raise ProviderError(response.get("error", "Chat completion failed"), self.name)
+        yield response["content"]
 
 class BaseVLMProvider(BaseProvider):
     """Base Vision-Language Model provider interface"""
@@ -166,6 +329,22 @@ class BaseTTSProvider(BaseProvider):
         """Generate speech audio from text"""
         pass
     
+    async def stream_speech(
+        self,
+        text: str,
+        voice: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream speech audio as it is synthesized.
+        Default implementation yields the complete audio in one chunk.
+        """
+        audio = await self.generate_speech(text, voice=voice, model=model, **kwargs)
+        if not audio:
+            raise ProviderError("Speech generation failed", self.name)
+        yield audio
+    
     @abstractmethod
     def get_available_voices(self) -> List[Dict[str, str]]:
         """Get available voices for TTS"""
@@ -0,0 +1,92 @@
+# Generated by Copilot
+"""
+Bulkheads for AI Service Lanes
+Caps concurrent calls per service type with a bounded FIFO wait queue, so a
+slow VLM provider cannot starve cheap STT/TTS calls
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+class Bulkhead:
+    """Concurrency limit with a bounded, time-limited wait queue"""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue_depth: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.peak_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take a slot, queueing up to queue_timeout. False if full or timed out."""
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+        if len(self._waiters) >= self.max_queue_depth:
+            self.rejected += 1
+            logger.warning(f"Bulkhead {self.name}: queue full ({self.in_flight} in flight), rejecting")
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.timed_out += 1
+            logger.warning(f"Bulkhead {self.name}: no slot within {self.queue_timeout}s")
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # A slot was handed over just as we were cancelled
+            else:
+                self._discard(waiter)
+            raise
+
+        self.admitted += 1
+        return True
+
+    def release(self):
+        """Free a slot, handing it straight to the oldest live waiter"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight = max(0, self.in_flight - 1)
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Live occupancy and counters"""
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "peak_queue_depth": self.peak_queue_depth
+        }
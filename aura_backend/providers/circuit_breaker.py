@@ -0,0 +1,153 @@
+# Generated by Copilot
+"""
+Circuit Breakers for AI Providers
+Tracks failure rate and latency per provider+model and skips providers
+that keep failing instead of paying their full timeout on every request
+"""
+
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"        # Normal operation
+    OPEN = "open"            # Failing - requests are skipped
+    HALF_OPEN = "half_open"  # Cooling down - limited probe requests allowed
+
+@dataclass
+class CircuitBreakerConfig:
+    """Thresholds for opening and probing a circuit"""
+    window_size: int = 20                 # Most recent calls considered
+    min_calls: int = 5                    # Calls needed before the breaker can open
+    failure_rate_threshold: float = 0.5   # Open when this fraction of calls fail
+    slow_call_threshold: float = 10.0     # Seconds after which a call counts as slow
+    slow_call_rate_threshold: float = 0.8 # Open when this fraction of calls are slow
+    open_duration: float = 30.0           # Seconds to stay open before probing
+    half_open_max_probes: int = 1         # Concurrent probe requests while half-open
+
+class CircuitBreaker:
+    """Count-based sliding-window circuit breaker"""
+
+    def __init__(self, name: str, config: CircuitBreakerConfig):
+        self.name = name
+        self.config = config
+        self.state = CircuitState.CLOSED
+        self._window: deque = deque(maxlen=config.window_size)  # (failed, slow) tuples
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.rejected_calls = 0
+        self.times_opened = 0
+
+    def allow_request(self) -> bool:
+        """Check whether a call may be made right now"""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.config.open_duration:
+                self.rejected_calls += 1
+                return False
+            logger.info(f"Circuit {self.name}: open period elapsed, probing")
+            self.state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probes_in_flight >= self.config.half_open_max_probes:
+                self.rejected_calls += 1
+                return False
+            self._probes_in_flight += 1
+
+        return True
+
+    def record_success(self, latency: float):
+        """Record a completed call"""
+        slow = latency >= self.config.slow_call_threshold
+
+        if self.state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if slow:
+                self._open("probe was slow")
+            else:
+                logger.info(f"Circuit {self.name}: probe succeeded, closing")
+                self.state = CircuitState.CLOSED
+                self._window.clear()
+            return
+
+        self._window.append((False, slow))
+        self._evaluate()
+
+    def record_failure(self):
+        """Record a failed call"""
+        if self.state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._open("probe failed")
+            return
+
+        self._window.append((True, False))
+        self._evaluate()
+
+    def record_cancelled(self):
+        """Release a probe slot for a call that was cancelled before finishing"""
+        if self.state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _evaluate(self):
+        if self.state != CircuitState.CLOSED or len(self._window) < self.config.min_calls:
+            return
+
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self.config.failure_rate_threshold:
+            self._open(f"failure rate {failure_rate:.0%}")
+        elif slow_rate >= self.config.slow_call_rate_threshold:
+            self._open(f"slow call rate {slow_rate:.0%}")
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._window:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, is_slow in self._window if is_slow)
+        return failures / len(self._window), slow / len(self._window)
+
+    def _open(self, reason: str):
+        logger.warning(f"Circuit {self.name}: opening ({reason})")
+        self.state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        self._window.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current breaker state for health reporting"""
+        failure_rate, slow_rate = self._rates()
+        snapshot = {
+            "state": self.state.value,
+            "calls_in_window": len(self._window),
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+            "rejected_calls": self.rejected_calls,
+            "times_opened": self.times_opened
+        }
+        if self.state == CircuitState.OPEN:
+            remaining = self.config.open_duration - (time.monotonic() - self._opened_at)
+            snapshot["probe_in_seconds"] = round(max(0.0, remaining), 1)
+        return snapshot
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by provider and model"""
+
+    def __init__(self, config: CircuitBreakerConfig = None):
+        self.config = config or CircuitBreakerConfig()
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, provider_name: str, model: str = None) -> CircuitBreaker:
+        """Get (or create) the breaker for a provider+model pair"""
+        key = (provider_name, model or "default")
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker(f"{key[0]}/{key[1]}", self.config)
+        return self._breakers[key]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """State of every breaker, keyed 'provider/model'"""
+        return {breaker.name: breaker.snapshot() for breaker in self._breakers.values()}
@@ -0,0 +1,62 @@
+# Generated by Copilot
+"""
+Request Deadlines for AI Providers
+Carries the end-to-end latency budget of a request so nodes and the provider
+registry can size timeouts to the time that is actually left
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Optional
+
+# Absolute wall-clock deadline (epoch seconds); wall clock so it survives the graph checkpointer
+_current_deadline: ContextVar[Optional[float]] = ContextVar("aura_request_deadline", default=None)
+
+# Below this many seconds left, callers should trade quality for speed
+TIGHT_BUDGET_SECONDS = float(os.getenv("DEADLINE_TIGHT_SECONDS", "1.5"))
+
+def deadline_from_budget(budget_ms: Optional[float]) -> Optional[float]:
+    """Absolute deadline for a budget in milliseconds; None (no deadline) for 0 or less"""
+    if not budget_ms or budget_ms <= 0:
+        return None
+    return time.time() + budget_ms / 1000.0
+
+def set_deadline(deadline: Optional[float]) -> Token:
+    """Set the deadline for the current task; returns a token for reset_deadline"""
+    return _current_deadline.set(deadline)
+
+def reset_deadline(token: Token):
+    """Restore the deadline that was active before set_deadline"""
+    _current_deadline.reset(token)
+
+def get_deadline() -> Optional[float]:
+    """Deadline of the current task, or None if unbounded"""
+    return _current_deadline.get()
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]):
+    """Run a block (and any tasks it creates) under the given deadline"""
+    token = set_deadline(deadline)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+def remaining(state: Optional[Dict[str, Any]] = None) -> Optional[float]:
+    """Seconds left before the deadline (state's if given, else the current task's); None if unbounded"""
+    deadline = state.get("deadline") if state is not None else get_deadline()
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+def is_expired(state: Optional[Dict[str, Any]] = None) -> bool:
+    """True once the deadline has passed"""
+    left = remaining(state)
+    return left is not None and left <= 0
+
+def is_tight(state: Optional[Dict[str, Any]] = None, threshold: Optional[float] = None) -> bool:
+    """True when a deadline is set and less than threshold seconds remain"""
+    left = remaining(state)
+    return left is not None and left < (TIGHT_BUDGET_SECONDS if threshold is None else threshold)
@@ -4,11 +4,10 @@ Gemini Provider Implementation
 Implements AI services using Google Gemini API
 """
 
-import httpx
 import json
 import base64
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 import logging
 
 from .base import (
@@ -40,6 +39,7 @@ class GeminiProvider(BaseLLMProvider, BaseVLMProvider):
                 provider="gemini",
                 capabilities=["llm", "vlm"],
                 max_tokens=8192,
+                supports_streaming=True,
                 context_length=2097152,  # 2M tokens
                 cost_per_1k_tokens=0.025,
                 description="Most capable Gemini model with long context"
@@ -49,6 +49,7 @@ class GeminiProvider(BaseLLMProvider, BaseVLMProvider):
                 provider="gemini", 
                 capabilities=["llm", "vlm"],
                 max_tokens=8192,
+                supports_streaming=True,
                 context_length=1048576,  # 1M tokens
                 cost_per_1k_tokens=0.01,
                 description="Fast and efficient Gemini model (default)"
@@ -58,6 +59,7 @@ class GeminiProvider(BaseLLMProvider, BaseVLMProvider):
                 provider="gemini",
                 capabilities=["llm", "vlm"],
                 max_tokens=8192,
+                supports_streaming=True,
                 context_length=1048576,
                 cost_per_1k_tokens=0.005,
                 description="Smaller, faster Gemini model"
@@ -69,6 +71,7 @@ class GeminiProvider(BaseLLMProvider, BaseVLMProvider):
                 provider="gemini",
                 capabilities=["llm", "vlm"],
                 max_tokens=8192,
+                supports_streaming=True,
                 context_length=1048576,
                 cost_per_1k_tokens=0.01,
                 description="Experimental next-generation Gemini model"
@@ -78,6 +81,7 @@ class GeminiProvider(BaseLLMProvider, BaseVLMProvider):
                 provider="gemini",
                 capabilities=["llm", "vlm"], 
                 max_tokens=8192,
+                supports_streaming=True,
                 context_length=2097152,
                 cost_per_1k_tokens=0.02,
                 description="Experimental advanced Gemini model"
@@ -86,31 +90,23 @@ class GeminiProvider(BaseLLMProvider, BaseVLMProvider):
     
     async def health_check(self) -> Dict[str, Any]:
         """Check Gemini API health"""
-        if not self.is_available():
+        if not self.is_configured():
             return {"status": "unavailable", "reason": "No API key"}
         
         try:
-            # Test with a simple request
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                url = f"{self.base_url}/models/gemini-1.5-flash:generateContent"
-                params = {"key": self.api_key}
-                
-                payload = {
-                    "contents": [{
-                        "parts": [{"text": "Hello"}]
-                    }],
-                    "generationConfig": {
-                        "maxOutputTokens": 10
-                    }
-                }
-                
-                response = await client.post(url, params=params, json=payload)
+            # Listing models checks the key and reachability without spending generation quota
+            client = self.http_client
+            response = await client.get(
+                f"{self.base_url}/models",
+                params={"key": self.api_key, "pageSize": 1},
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                return {"status": "healthy", "api_accessible": True}
+            else:
+                return {"status": "unhealthy", "error": f"API returned {response.status_code}"}
                 
-                if response.status_code == 200:
-                    return {"status": "healthy", "api_accessible": True}
-                else:
-                    return {"status": "unhealthy", "error": f"API returned {response.status_code}"}
-                    
         except Exception as e:
             return {"status": "unhealthy", "error": str(e)}
     
@@ -131,7 +127,7 @@ class GeminiProvider(BaseLLMProvider, BaseVLMProvider):
         **kwargs
     ) -> Dict[str, Any]:
         """Analyze intent using Gemini"""
-        if not self.is_available():
+        if not self.is_configured():
             raise ProviderUnavailableError("Gemini API key not available", "gemini")
         
         model = model or "gemini-1.5-flash"
@@ -239,101 +235,140 @@ BE ACCURATE and CONCISE."""
         **kwargs
     ) -> Dict[str, Any]:
         """Chat completion with Gemini"""
-        if not self.is_available():
+        if not self.is_configured():
             raise ProviderUnavailableError("Gemini API key not available", "gemini")
         
         model = model or "gemini-1.5-flash"
         
         try:
-            # Convert messages to Gemini format
-            contents = []
-            for message in messages:
-                role = "user"  # Gemini uses "user" and "model" roles
-                if message["role"] == "assistant":
-                    role = "model"
-                
-                content = message["content"]
-                if isinstance(content, str):
-                    contents.append({
-                        "role": role,
-                        "parts": [{"text": content}]
-                    })
-                elif isinstance(content, list):
-                    # Handle multimodal content
-                    parts = []
-                    for part in content:
-                        if part["type"] == "text":
-                            parts.append({"text": part["text"]})
-                        elif part["type"] == "image_url":
-                            # Extract base64 data
-                            image_url = part["image_url"]["url"]
-                            if "base64," in image_url:
-                                mime_type, base64_data = image_url.split("base64,", 1)
-                                mime_type = mime_type.split(":")[1].split(";")[0]
-                                parts.append({
-                                    "inline_data": {
-                                        "mime_type": mime_type,
-                                        "data": base64_data
-                                    }
-                                })
-                    contents.append({
-                        "role": role,
-                        "parts": parts
-                    })
+            payload = self._chat_payload(messages, **kwargs)
             
-            # Prepare payload
-            payload = {
-                "contents": contents,
-                "generationConfig": {
-                    "temperature": kwargs.get("temperature", 0.1),
-                    "maxOutputTokens": kwargs.get("max_tokens", 1000),
-                    "topP": kwargs.get("top_p", 0.8),
-                    "topK": kwargs.get("top_k", 40)
-                }
-            }
+            url = f"{self.base_url}/models/{model}:generateContent"
+            params = {"key": self.api_key}
             
-            # Add safety settings
-            payload["safetySettings"] = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"}
-            ]
+            logger.info(f"Gemini LLM: Chat completion with model {model}")
+            response = await self._request("POST", url, params=params, json=payload)
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.base_url}/models/{model}:generateContent"
-                params = {"key": self.api_key}
-                
-                logger.info(f"Gemini LLM: Chat completion with model {model}")
-                response = await client.post(url, params=params, json=payload)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if "candidates" in result and result["candidates"]:
-                        content = result["candidates"][0]["content"]["parts"][0]["text"]
-                        return {"success": True, "content": content, "model": model}
-                    else:
-                        error_msg = "No response generated"
-                        if "promptFeedback" in result:
-                            error_msg = f"Content filtered: {result['promptFeedback']}"
-                        return {"success": False, "error": error_msg}
-                elif response.status_code == 429:
-                    raise RateLimitError("Rate limit exceeded", "gemini")
-                elif response.status_code == 400:
-                    error_data = response.json()
-                    error_msg = error_data.get("error", {}).get("message", "Bad request")
-                    return {"success": False, "error": f"Gemini API error: {error_msg}"}
+            if response.status_code == 200:
+                result = response.json()
+                if "candidates" in result and result["candidates"]:
+                    content = result["candidates"][0]["content"]["parts"][0]["text"]
+                    return {"success": True, "content": content, "model": model}
                 else:
-                    error_msg = f"API error: {response.status_code}"
-                    logger.error(f"Gemini LLM Error: {error_msg} - {response.text}")
+                    error_msg = "No response generated"
+                    if "promptFeedback" in result:
+                        error_msg = f"Content filtered: {result['promptFeedback']}"
                     return {"success": False, "error": error_msg}
-                    
+            elif response.status_code == 429:
+                raise RateLimitError("Rate limit exceeded", "gemini")
+            elif response.status_code == 400:
+                error_data = response.json()
+                error_msg = error_data.get("error", {}).get("message", "Bad request")
+                return {"success": False, "error": f"Gemini API error: {error_msg}"}
+            else:
+                error_msg = f"API error: {response.status_code}"
+                logger.error(f"Gemini LLM Error: {error_msg} - {response.text}")
+                return {"success": False, "error": error_msg}
+                
         except asyncio.TimeoutError:
             return {"success": False, "error": "Request timeout"}
         except Exception as e:
             logger.error(f"Gemini LLM Exception: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    def _chat_payload(self, messages: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """Convert OpenAI-style messages into a Gemini generateContent payload"""
+        # Convert messages to Gemini format
+        contents = []
+        for message in messages:
+            role = "user"  # Gemini uses "user" and "model" roles
+            if message["role"] == "assistant":
+                role = "model"
+            
+            content = message["content"]
+            if isinstance(content, str):
+                contents.append({
+                    "role": role,
+                    "parts": [{"text": content}]
+                })
+            elif isinstance(content, list):
+                # Handle multimodal content
+                parts = []
+                for part in content:
+                    if part["type"] == "text":
+                        parts.append({"text": part["text"]})
+                    elif part["type"] == "image_url":
+                        # Extract base64 data
+                        image_url = part["image_url"]["url"]
+                        if "base64," in image_url:
+                            mime_type, base64_data = image_url.split("base64,", 1)
+                            mime_type = mime_type.split(":")[1].split(";")[0]
+                            parts.append({
+                                "inline_data": {
+                                    "mime_type": mime_type,
+                                    "data": base64_data
+                                }
+                            })
+                contents.append({
+                    "role": role,
+                    "parts": parts
+                })
+        
+        # Prepare payload
+        payload = {
+            "contents": contents,
+            "generationConfig": {
+                "temperature": kwargs.get("temperature", 0.1),
+                "maxOutputTokens": kwargs.get("max_tokens", 1000),
+                "topP": kwargs.get("top_p", 0.8),
+                "topK": kwargs.get("top_k", 40)
+            }
+        }
+        
+        # Add safety settings
+        payload["safetySettings"] = [
+            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"}
+        ]
+        
+        return payload
+    
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat completion text from Gemini via streamGenerateContent (SSE)"""
+        if not self.is_configured():
+            raise ProviderUnavailableError("Gemini API key not available", "gemini")
+        
+        model = model or "gemini-1.5-flash"
+        url = f"{self.base_url}/models/{model}:streamGenerateContent"
+        params = {"key": self.api_key, "alt": "sse"}
+        
+        logger.info(f"Gemini LLM: Streaming chat completion with model {model}")
+        response = await self._stream_request("POST", url, params=params, json=self._chat_payload(messages, **kwargs))
+        
+        try:
+            if response.status_code == 429:
+                raise RateLimitError("Rate limit exceeded", "gemini")
+            if response.status_code != 200:
+                await response.aread()
+                logger.error(f"Gemini LLM Stream Error: {response.status_code} - {response.text}")
+                raise ProviderError(f"API error: {response.status_code}", "gemini")
+            
+            async for data in self._iter_sse_data(response):
+                chunk = json.loads(data)
+                for candidate in chunk.get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+        finally:
+            await response.aclose()
+    
     # VLM Implementation
     async def locate_ui_element(
         self, 
@@ -343,7 +378,7 @@ BE ACCURATE and CONCISE."""
         **kwargs
     ) -> Dict[str, Any]:
         """Locate UI elements using Gemini Vision"""
-        if not self.is_available():
+        if not self.is_configured():
             raise ProviderUnavailableError("Gemini API key not available", "gemini")
         
         model = model or "gemini-1.5-flash"
@@ -426,7 +461,7 @@ If you cannot find a matching element, set "found" to false and explain why."""
         **kwargs
     ) -> Dict[str, Any]:
         """Analyze screen context using Gemini Vision"""
-        if not self.is_available():
+        if not self.is_configured():
             return {"error": "Gemini API key not available"}
         
         model = model or "gemini-1.5-flash"
@@ -4,11 +4,10 @@ Groq Provider Implementation
 Implements all AI services using Groq API
 """
 
-import httpx
 import json
 import base64
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 import logging
 
 from .base import (
@@ -49,6 +48,7 @@ class GroqProvider(BaseSTTProvider, BaseLLMProvider, BaseVLMProvider, BaseTTSPro
                 provider="groq",
                 capabilities=["llm"],
                 max_tokens=8192,
+                supports_streaming=True,
                 context_length=8192,
                 description="Versatile large language model"
             ),
@@ -57,6 +57,7 @@ class GroqProvider(BaseSTTProvider, BaseLLMProvider, BaseVLMProvider, BaseTTSPro
                 provider="groq",
                 capabilities=["llm"],
                 max_tokens=8192,
+                supports_streaming=True,
                 context_length=131072,
                 description="Fast and efficient language model"
             ),
@@ -65,6 +66,7 @@ class GroqProvider(BaseSTTProvider, BaseLLMProvider, BaseVLMProvider, BaseTTSPro
                 provider="groq",
                 capabilities=["llm"],
                 max_tokens=32768,
+                supports_streaming=True,
                 context_length=32768,
                 description="High-performance mixture of experts model"
             ),
@@ -96,22 +98,23 @@ class GroqProvider(BaseSTTProvider, BaseLLMProvider, BaseVLMProvider, BaseTTSPro
     
     async def health_check(self) -> Dict[str, Any]:
         """Check Groq API health"""
-        if not self.is_available():
+        if not self.is_configured():
             return {"status": "unavailable", "reason": "No API key"}
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                headers = {"Authorization": f"Bearer {self.api_key}"}
-                response = await client.get(
-                    f"{self.base_url}/models",
-                    headers=headers
-                )
+            client = self.http_client
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            response = await client.get(
+                f"{self.base_url}/models",
+                headers=headers,
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                return {"status": "healthy", "models_accessible": True}
+            else:
+                return {"status": "unhealthy", "error": f"API returned {response.status_code}"}
                 
-                if response.status_code == 200:
-                    return {"status": "healthy", "models_accessible": True}
-                else:
-                    return {"status": "unhealthy", "error": f"API returned {response.status_code}"}
-                    
         except Exception as e:
             return {"status": "unhealthy", "error": str(e)}
     
@@ -132,39 +135,39 @@ class GroqProvider(BaseSTTProvider, BaseLLMProvider, BaseVLMProvider, BaseTTSPro
         **kwargs
     ) -> Optional[str]:
         """Transcribe audio using Groq Whisper"""
-        if not self.is_available():
+        if not self.is_configured():
             raise ProviderUnavailableError("Groq API key not available", "groq")
         
         model = model or "whisper-large-v3-turbo"
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                files = {
-                    "file": ("audio.wav", audio_data, "audio/wav"),
-                    "model": (None, model),
-                    "response_format": (None, "text"),
-                    "language": (None, language)
-                }
-                
-                headers = {"Authorization": f"Bearer {self.api_key}"}
-                
-                logger.info(f"Groq STT: Transcribing with model {model}")
-                response = await client.post(
-                    f"{self.base_url}/audio/transcriptions",
-                    files=files,
-                    headers=headers
-                )
+            files = {
+                "file": ("audio.wav", audio_data, "audio/wav"),
+                "model": (None, model),
+                "response_format": (None, "text"),
+                "language": (None, language)
+            }
+            
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            
+            logger.info(f"Groq STT: Transcribing with model {model}")
+            response = await self._request(
+                "POST",
+                f"{self.base_url}/audio/transcriptions",
+                files=files,
+                headers=headers
+            )
+            
+            if response.status_code == 200:
+                transcript = response.text.strip()
+                logger.info(f"Groq STT: Success - '{transcript[:50]}...'")
+                return transcript
+            elif response.status_code == 429:
+                raise RateLimitError("Rate limit exceeded", "groq")
+            else:
+                logger.error(f"Groq STT Error: {response.status_code} - {response.text}")
+                return None
                 
-                if response.status_code == 200:
-                    transcript = response.text.strip()
-                    logger.info(f"Groq STT: Success - '{transcript[:50]}...'")
-                    return transcript
-                elif response.status_code == 429:
-                    raise RateLimitError("Rate limit exceeded", "groq")
-                else:
-                    logger.error(f"Groq STT Error: {response.status_code} - {response.text}")
-                    return None
-                    
         except asyncio.TimeoutError:
             logger.error("Groq STT: Request timeout")
             return None
@@ -185,7 +188,7 @@ class GroqProvider(BaseSTTProvider, BaseLLMProvider, BaseVLMProvider, BaseTTSPro
         **kwargs
     ) -> Dict[str, Any]:
         """Analyze intent using optimized Groq LLM with specialized prompts"""
-        if not self.is_available():
+        if not self.is_configured():
             raise ProviderUnavailableError("Groq API key not available", "groq")
         
         # Import optimized analyzer
@@ -314,50 +317,98 @@ BE PRECISE and FAST."""
         **kwargs
     ) -> Dict[str, Any]:
         """Chat completion with Groq"""
-        if not self.is_available():
+        if not self.is_configured():
             raise ProviderUnavailableError("Groq API key not available", "groq")
         
         model = model or "llama-3.3-70b-versatile"
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "model": model,
-                    "messages": messages,
-                    "temperature": kwargs.get("temperature", 0.1),
-                    "max_tokens": kwargs.get("max_tokens", 1000),
-                    **{k: v for k, v in kwargs.items() if k not in ["temperature", "max_tokens"]}
-                }
-                
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                logger.info(f"Groq LLM: Chat completion with model {model}")
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    json=payload,
-                    headers=headers
-                )
+            payload = self._chat_payload(messages, model, **kwargs)
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            logger.info(f"Groq LLM: Chat completion with model {model}")
+            response = await self._request(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=headers
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                content = result["choices"][0]["message"]["content"]
+                return {"success": True, "content": content, "model": model}
+            elif response.status_code == 429:
+                raise RateLimitError("Rate limit exceeded", "groq")
+            else:
+                error_msg = f"API error: {response.status_code}"
+                logger.error(f"Groq LLM Error: {error_msg} - {response.text}")
+                return {"success": False, "error": error_msg}
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result["choices"][0]["message"]["content"]
-                    return {"success": True, "content": content, "model": model}
-                elif response.status_code == 429:
-                    raise RateLimitError("Rate limit exceeded", "groq")
-                else:
-                    error_msg = f"API error: {response.status_code}"
-                    logger.error(f"Groq LLM Error: {error_msg} - {response.text}")
-                    return {"success": False, "error": error_msg}
-                    
         except asyncio.TimeoutError:
             return {"success": False, "error": "Request timeout"}
         except Exception as e:
             logger.error(f"Groq LLM Exception: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    def _chat_payload(self, messages: List[Dict[str, str]], model: str, **kwargs) -> Dict[str, Any]:
+        """Build an OpenAI-compatible chat completions payload"""
+        return {
+            "model": model,
+            "messages": messages,
+            "temperature": kwargs.get("temperature", 0.1),
+            "max_tokens": kwargs.get("max_tokens", 1000),
+            # "provider" is a routing hint from callers like the intent analyzer, not an API field
+            **{k: v for k, v in kwargs.items() if k not in ["temperature", "max_tokens", "provider"]}
+        }
+    
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat completion deltas from Groq over server-sent events"""
+        if not self.is_configured():
+            raise ProviderUnavailableError("Groq API key not available", "groq")
+        
+        model = model or "llama-3.3-70b-versatile"
+        payload = {**self._chat_payload(messages, model, **kwargs), "stream": True}
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        logger.info(f"Groq LLM: Streaming chat completion with model {model}")
+        response = await self._stream_request(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            json=payload,
+            headers=headers
+        )
+        
+        try:
+            if response.status_code == 429:
+                raise RateLimitError("Rate limit exceeded", "groq")
+            if response.status_code != 200:
+                await response.aread()
+                logger.error(f"Groq LLM Stream Error: {response.status_code} - {response.text}")
+                raise ProviderError(f"API error: {response.status_code}", "groq")
+            
+            async for data in self._iter_sse_data(response):
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                if choices:
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+        finally:
+            await response.aclose()
+    
     # VLM Implementation
     async def locate_ui_element(
         self, 
@@ -367,7 +418,7 @@ BE PRECISE and FAST."""
         **kwargs
     ) -> Dict[str, Any]:
         """Locate UI elements using Groq VLM"""
-        if not self.is_available():
+        if not self.is_configured():
             raise ProviderUnavailableError("Groq API key not available", "groq")
         
         model = model or "llama-4-maverick-17b-128e-instruct"
@@ -450,7 +501,7 @@ Provide exact pixel coordinates for the center of the element."""
         **kwargs
     ) -> Dict[str, Any]:
         """Analyze screen context using Groq VLM"""
-        if not self.is_available():
+        if not self.is_configured():
             return {"error": "Groq API key not available"}
         
         model = model or "llama-4-maverick-17b-128e-instruct"
@@ -557,7 +608,7 @@ Provide exact pixel coordinates for the center of the element."""
         **kwargs
     ) -> Optional[bytes]:
         """Generate speech using Groq PlayAI TTS"""
-        if not self.is_available():
+        if not self.is_configured():
             raise ProviderUnavailableError("Groq API key not available", "groq")
         
         if not text or not text.strip():
@@ -568,35 +619,35 @@ Provide exact pixel coordinates for the center of the element."""
         voice = voice or "Arista-PlayAI"
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "model": model,
-                    "input": text.strip(),
-                    "voice": voice,
-                    "response_format": "wav"
-                }
-                
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                logger.info(f"Groq TTS: Generating speech with voice {voice}")
-                response = await client.post(
-                    f"{self.base_url}/audio/speech",
-                    json=payload,
-                    headers=headers
-                )
+            payload = {
+                "model": model,
+                "input": text.strip(),
+                "voice": voice,
+                "response_format": "wav"
+            }
+            
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            logger.info(f"Groq TTS: Generating speech with voice {voice}")
+            response = await self._request(
+                "POST",
+                f"{self.base_url}/audio/speech",
+                json=payload,
+                headers=headers
+            )
+            
+            if response.status_code == 200:
+                logger.info("Groq TTS: Speech generation successful")
+                return response.content
+            elif response.status_code == 429:
+                raise RateLimitError("Rate limit exceeded", "groq")
+            else:
+                logger.error(f"Groq TTS Error: {response.status_code} - {response.text}")
+                return None
                 
-                if response.status_code == 200:
-                    logger.info("Groq TTS: Speech generation successful")
-                    return response.content
-                elif response.status_code == 429:
-                    raise RateLimitError("Rate limit exceeded", "groq")
-                else:
-                    logger.error(f"Groq TTS Error: {response.status_code} - {response.text}")
-                    return None
-                    
         except asyncio.TimeoutError:
             logger.error("Groq TTS: Request timeout")
             return None
@@ -604,6 +655,55 @@ Provide exact pixel coordinates for the center of the element."""
             logger.error(f"Groq TTS Exception: {str(e)}")
             return None
     
+    async def stream_speech(
+        self,
+        text: str,
+        voice: Optional[str] = None,
+        model: Optional[str] = None,
+        chunk_size: int = 4096,
+        **kwargs
+    ) -> AsyncIterator[bytes]:
+        """Stream Groq PlayAI TTS audio chunks as they arrive"""
+        if not self.is_configured():
+            raise ProviderUnavailableError("Groq API key not available", "groq")
+        
+        if not text or not text.strip():
+            raise ProviderError("Empty text provided", "groq")
+        
+        model = model or "playai-tts"
+        voice = voice or "Arista-PlayAI"
+        payload = {
+            "model": model,
+            "input": text.strip(),
+            "voice": voice,
+            "response_format": "wav"
+        }
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        logger.info(f"Groq TTS: Streaming speech with voice {voice}")
+        response = await self._stream_request(
+            "POST",
+            f"{self.base_url}/audio/speech",
+            json=payload,
+            headers=headers
+        )
+        
+        try:
+            if response.status_code == 429:
+                raise RateLimitError("Rate limit exceeded", "groq")
+            if response.status_code != 200:
+                await response.aread()
+                logger.error(f"Groq TTS Stream Error: {response.status_code} - {response.text}")
+                raise ProviderError(f"API error: {response.status_code}", "groq")
+            
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+    
     def get_available_voices(self) -> List[Dict[str, str]]:
         """Get available PlayAI voices"""
         return [
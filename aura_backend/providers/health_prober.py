@@ -0,0 +1,110 @@
+# Generated by Copilot
+"""
+Background Health Prober for AI Providers
+Checks every provider concurrently on an interval and caches the result, so
+routing and health endpoints never wait on a live health check
+"""
+
+import asyncio
+import time
+import logging
+from typing import Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class HealthProber:
+    """Periodic concurrent provider health checks with a cached snapshot"""
+
+    def __init__(
+        self,
+        get_providers: Callable[[], Dict[str, Any]],
+        interval: float = 30.0,
+        timeout: float = 5.0,
+        failure_threshold: int = 2
+    ):
+        self.get_providers = get_providers
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold  # Consecutive failed probes before a provider is marked down
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.rounds = 0
+
+    @property
+    def has_probed(self) -> bool:
+        """True once at least one probe round has completed"""
+        return self.rounds > 0
+
+    def start(self):
+        """Start probing in the background (first round runs immediately)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error(f"Health probe round failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def probe_once(self) -> Dict[str, Dict[str, Any]]:
+        """Probe all providers concurrently and update the cache"""
+        providers = dict(self.get_providers())
+        results = await asyncio.gather(*(self._probe(provider) for provider in providers.values()))
+        for (name, provider), (status, latency) in zip(providers.items(), results):
+            self._update(name, provider, status, latency)
+        self.rounds += 1
+        return self.snapshot()
+
+    async def _probe(self, provider: Any) -> tuple:
+        start = time.monotonic()
+        try:
+            status = await asyncio.wait_for(provider.health_check(), self.timeout)
+        except asyncio.TimeoutError:
+            status = {"status": "unhealthy", "error": f"Health check timed out after {self.timeout:.1f}s"}
+        except Exception as e:
+            status = {"status": "error", "error": str(e)}
+        return status, time.monotonic() - start
+
+    def _update(self, name: str, provider: Any, status: Dict[str, Any], latency: float):
+        previous = self._status.get(name, {})
+        healthy = status.get("status") == "healthy"
+        failures = 0 if healthy else previous.get("consecutive_failures", 0) + 1
+
+        if status.get("status") == "unavailable":
+            # No API key - is_available() already rules the provider out
+            provider.healthy = None
+        elif healthy:
+            if provider.healthy is False:
+                logger.info(f"Provider {name} is healthy again")
+            provider.healthy = True
+        elif failures >= self.failure_threshold:
+            if provider.healthy is not False:
+                logger.warning(f"Provider {name} marked unhealthy after {failures} failed probes: {status.get('error')}")
+            provider.healthy = False
+
+        self._status[name] = {
+            **status,
+            "consecutive_failures": failures,
+            "probe_latency_ms": round(latency * 1000, 1),
+            "checked_at": time.time()
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Last cached probe result per provider"""
+        now = time.time()
+        return {
+            name: {**status, "age_seconds": round(now - status["checked_at"], 1)}
+            for name, status in self._status.items()
+        }
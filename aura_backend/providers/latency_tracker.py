@@ -0,0 +1,93 @@
+# Generated by Copilot
+"""
+Rolling Latency Tracker for AI Providers
+Keeps a bounded window of observed call latencies per provider/model/method
+"""
+
+import json
+import math
+import os
+import logging
+from collections import defaultdict, deque
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LatencyKey = Tuple[str, str, str]  # (provider, model, method)
+
+class LatencyTracker:
+    """Rolling latency distribution per provider+model+method"""
+
+    def __init__(self, window_size: int = 200, min_samples: int = 10):
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self._samples: Dict[LatencyKey, deque] = defaultdict(lambda: deque(maxlen=self.window_size))
+
+    def record(self, provider: str, model: Optional[str], method: str, latency: float):
+        """Record a successful call latency in seconds"""
+        self._samples[(provider, model or "default", method)].append(latency)
+
+    def count(self, provider: str, model: Optional[str], method: str) -> int:
+        """Number of samples currently in the window"""
+        return len(self._samples.get((provider, model or "default", method), ()))
+
+    def percentile(self, provider: str, model: Optional[str], method: str, pct: float) -> Optional[float]:
+        """Latency at the given percentile (0-1), or None until min_samples are seen"""
+        samples = self._samples.get((provider, model or "default", method))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(pct * len(ordered)) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """p50/p95/p99 per key, keyed 'provider/model/method'"""
+        snapshot = {}
+        for (provider, model, method), samples in self._samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            pick = lambda pct: ordered[min(len(ordered) - 1, max(0, math.ceil(pct * len(ordered)) - 1))]
+            snapshot[f"{provider}/{model}/{method}"] = {
+                "samples": len(ordered),
+                "p50_ms": round(pick(0.50) * 1000, 1),
+                "p95_ms": round(pick(0.95) * 1000, 1),
+                "p99_ms": round(pick(0.99) * 1000, 1)
+            }
+        return snapshot
+
+    def save(self, path: str):
+        """Persist the current windows so percentiles survive a restart"""
+        data = {"/".join(key): list(samples) for key, samples in self._samples.items() if samples}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> int:
+        """Load windows saved by save(); returns the number of keys restored"""
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable latency profile {path}: {str(e)}")
+            return 0
+        if not isinstance(data, dict):
+            logger.warning(f"Ignoring unreadable latency profile {path}: expected an object")
+            return 0
+
+        restored = 0
+        for name, samples in data.items():
+            try:
+                # Model names may contain '/', provider and method never do
+                provider, rest = name.split("/", 1)
+                model, method = rest.rsplit("/", 1)
+                values = [float(s) for s in samples]
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping unreadable latency profile entry {name!r}: {str(e)}")
+                continue
+            self._samples[(provider, model, method)].extend(values)
+            restored += 1
+        return restored
@@ -7,7 +7,8 @@ Enhanced with intelligent auto model selection
 
 import os
 import asyncio
-from typing import Dict, List, Optional, Any, Union, Type
+import time
+from typing import Dict, List, Optional, Any, Union, Type, AsyncIterator
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
@@ -21,6 +22,15 @@ from .base import (
 from .groq_provider import GroqProvider
 from .gemini_provider import GeminiProvider
 from .auto_model_selector import auto_selector, TaskComplexity, PerformanceMode
+from .circuit_breaker import CircuitBreakerRegistry, CircuitBreakerConfig
+from .latency_tracker import LatencyTracker
+from .adaptive_timeout import AdaptiveTimeouts, AdaptiveTimeoutConfig
+from .retry import RetryBudget
+from .rate_limiter import RateLimiter, estimate_tokens
+from .single_flight import SingleFlight, flight_key
+from .bulkhead import Bulkhead
+from .health_prober import HealthProber
+from .deadline import remaining as deadline_remaining, is_tight as deadline_is_tight
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +60,14 @@ class ServiceConfig:
     provider_priorities: List[ProviderPriority] = field(default_factory=list)
     enable_fallback: bool = True
     timeout: float = 30.0
+    hedge_enabled: bool = False       # Race slow calls against the next fallback
+    hedge_percentile: float = 0.95    # Hedge once the primary exceeds this latency percentile
+    hedge_min_delay: float = 0.25     # Never hedge sooner than this many seconds
+    hedge_budget_ratio: float = 0.1   # Max hedges as a fraction of recent calls
+    rate_limit_max_wait: float = 2.0  # Fail over instead of queueing longer than this for rate limits
+    max_concurrency: int = 32         # Bulkhead: concurrent calls allowed for this service
+    max_queue_depth: int = 64         # Bulkhead: callers allowed to wait for a slot
+    queue_timeout: float = 5.0        # Bulkhead: seconds a caller may wait for a slot
 
 class ProviderRegistry:
     """
@@ -63,9 +81,69 @@ class ProviderRegistry:
         
         self.providers: Dict[str, Any] = {}
         self.service_configs: Dict[ServiceType, ServiceConfig] = {}
+        self.circuit_breakers = CircuitBreakerRegistry(CircuitBreakerConfig(
+            failure_rate_threshold=float(os.getenv("CIRCUIT_FAILURE_RATE_THRESHOLD", "0.5")),
+            slow_call_threshold=float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "10.0")),
+            open_duration=float(os.getenv("CIRCUIT_OPEN_SECONDS", "30.0"))
+        ))
+        self.latency_tracker = LatencyTracker()
+        self.adaptive_timeouts_enabled = os.getenv("ADAPTIVE_TIMEOUTS", "true").lower() == "true"
+        self.adaptive_timeouts = AdaptiveTimeouts(self.latency_tracker, AdaptiveTimeoutConfig(
+            factor=float(os.getenv("ADAPTIVE_TIMEOUT_FACTOR", "3.0")),
+            floor=float(os.getenv("ADAPTIVE_TIMEOUT_FLOOR", "1.0")),
+            ceiling=float(os.getenv("ADAPTIVE_TIMEOUT_CEILING", "30.0"))
+        ))
+        self.latency_profile_path = os.getenv("LATENCY_PROFILE_PATH", "latency_profile.json")
+        self.rate_limiter = RateLimiter()
+        self.single_flight = SingleFlight()
+        self.single_flight_enabled = os.getenv("SINGLE_FLIGHT", "true").lower() == "true"
+        self.bulkheads: Dict[ServiceType, Bulkhead] = {}
+        self.hedge_budgets: Dict[ServiceType, RetryBudget] = {}
+        self.hedge_stats: Dict[ServiceType, Dict[str, int]] = {}
+        self.deadline_stats = {"expired": 0, "fallbacks_skipped": 0, "timeouts_shrunk": 0, "speed_selections": 0}
+        self.health_probing_enabled = os.getenv("HEALTH_PROBING", "true").lower() == "true"
+        self.health_prober = HealthProber(
+            lambda: self.providers,
+            interval=float(os.getenv("HEALTH_PROBE_INTERVAL", "30.0")),
+            timeout=float(os.getenv("HEALTH_PROBE_TIMEOUT", "5.0")),
+            failure_threshold=int(os.getenv("HEALTH_PROBE_FAILURES", "2"))
+        )
         self._initialize_providers()
         self._setup_default_configs()
     
+    def _pool_settings(self, prefix: str) -> Dict[str, Any]:
+        """Read connection pool and transport overrides for a provider from the environment"""
+        settings = {}
+        int_settings = {
+            "max_connections": f"{prefix}_MAX_CONNECTIONS",
+            "max_keepalive_connections": f"{prefix}_MAX_KEEPALIVE_CONNECTIONS"
+        }
+        float_settings = {
+            "keepalive_expiry": f"{prefix}_KEEPALIVE_EXPIRY",
+            "connect_timeout": f"{prefix}_CONNECT_TIMEOUT",
+            "read_timeout": f"{prefix}_READ_TIMEOUT"
+        }
+        
+        for field_name, env_var in int_settings.items():
+            if os.getenv(env_var):
+                settings[field_name] = int(os.getenv(env_var))
+        for field_name, env_var in float_settings.items():
+            if os.getenv(env_var):
+                settings[field_name] = float(os.getenv(env_var))
+        if os.getenv(f"{prefix}_HTTP2"):
+            settings["http2"] = os.getenv(f"{prefix}_HTTP2").lower() == "true"
+        
+        return settings
+    
+    def _rate_limit_settings(self, prefix: str) -> Optional[Dict[str, int]]:
+        """Read client-side requests/tokens per minute limits for a provider from the environment"""
+        rate_limit = {}
+        if os.getenv(f"{prefix}_REQUESTS_PER_MINUTE"):
+            rate_limit["requests_per_minute"] = int(os.getenv(f"{prefix}_REQUESTS_PER_MINUTE"))
+        if os.getenv(f"{prefix}_TOKENS_PER_MINUTE"):
+            rate_limit["tokens_per_minute"] = int(os.getenv(f"{prefix}_TOKENS_PER_MINUTE"))
+        return rate_limit or None
+    
     def _initialize_providers(self):
         """Initialize all available providers"""
         
@@ -76,6 +154,8 @@ class ProviderRegistry:
             base_url="https://api.groq.com/openai/v1",
             timeout=30.0,
             max_retries=3,
+            rate_limit=self._rate_limit_settings("GROQ"),
+            **self._pool_settings("GROQ"),
             default_models={
                 "stt": "whisper-large-v3-turbo",
                 "llm": "llama-3.3-70b-versatile", 
@@ -97,6 +177,8 @@ class ProviderRegistry:
             base_url="https://generativelanguage.googleapis.com/v1beta",
             timeout=30.0,
             max_retries=3,
+            rate_limit=self._rate_limit_settings("GEMINI"),
+            **self._pool_settings("GEMINI"),
             default_models={
                 "llm": "gemini-1.5-flash",     # Stable, fast model
                 "vlm": "gemini-1.5-flash"      # Stable, fast model
@@ -117,7 +199,10 @@ class ProviderRegistry:
             service_type=ServiceType.STT,
             default_provider="groq",  # Only Groq supports STT
             fallback_providers=[],
-            default_model="whisper-large-v3-turbo"
+            default_model="whisper-large-v3-turbo",
+            rate_limit_max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT", "2.0")),
+            max_concurrency=int(os.getenv("STT_MAX_CONCURRENCY", "16")),
+            max_queue_depth=int(os.getenv("STT_MAX_QUEUE_DEPTH", "32"))
         )
         
         # LLM Service Configuration  
@@ -126,6 +211,12 @@ class ProviderRegistry:
             default_provider=os.getenv("DEFAULT_LLM_PROVIDER", "groq"),
             fallback_providers=["gemini", "groq"],
             default_model=os.getenv("DEFAULT_LLM_MODEL"),
+            rate_limit_max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT", "2.0")),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "32")),
+            max_queue_depth=int(os.getenv("LLM_MAX_QUEUE_DEPTH", "64")),
+            hedge_enabled=os.getenv("LLM_HEDGING", "true").lower() == "true",
+            hedge_percentile=float(os.getenv("HEDGE_PERCENTILE", "0.95")),
+            hedge_budget_ratio=float(os.getenv("HEDGE_BUDGET_RATIO", "0.1")),
             provider_priorities=[
                 ProviderPriority("groq", priority=1, cost_multiplier=1.0),
                 ProviderPriority("gemini", priority=2, cost_multiplier=1.2)
@@ -138,6 +229,12 @@ class ProviderRegistry:
             default_provider=os.getenv("DEFAULT_VLM_PROVIDER", "groq"),
             fallback_providers=["gemini", "groq"],
             default_model=os.getenv("DEFAULT_VLM_MODEL"),
+            rate_limit_max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT", "2.0")),
+            max_concurrency=int(os.getenv("VLM_MAX_CONCURRENCY", "8")),
+            max_queue_depth=int(os.getenv("VLM_MAX_QUEUE_DEPTH", "16")),
+            hedge_enabled=os.getenv("VLM_HEDGING", "true").lower() == "true",
+            hedge_percentile=float(os.getenv("HEDGE_PERCENTILE", "0.95")),
+            hedge_budget_ratio=float(os.getenv("HEDGE_BUDGET_RATIO", "0.1")),
             provider_priorities=[
                 ProviderPriority("groq", priority=1, cost_multiplier=1.0),
                 ProviderPriority("gemini", priority=2, cost_multiplier=0.8)  # Gemini might be cheaper
@@ -149,7 +246,10 @@ class ProviderRegistry:
             service_type=ServiceType.TTS,
             default_provider="groq",  # Only Groq supports TTS
             fallback_providers=[],
-            default_model="playai-tts"
+            default_model="playai-tts",
+            rate_limit_max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT", "2.0")),
+            max_concurrency=int(os.getenv("TTS_MAX_CONCURRENCY", "16")),
+            max_queue_depth=int(os.getenv("TTS_MAX_QUEUE_DEPTH", "32"))
         )
     
     def get_provider(
@@ -217,107 +317,565 @@ class ProviderRegistry:
     ) -> Dict[str, Any]:
         """
         Execute AI service method with automatic fallback
+        Identical concurrent calls share one provider request
         """
+        if not self.single_flight_enabled:
+            return await self._execute_in_lane(service_type, method_name, provider_name, model, **kwargs)
+        
+        key = flight_key(service_type.value, method_name, provider_name, model, **kwargs)
+        return await self.single_flight.do(
+            key,
+            lambda: self._execute_in_lane(service_type, method_name, provider_name, model, **kwargs)
+        )
+    
+    async def _execute_in_lane(
+        self,
+        service_type: ServiceType,
+        method_name: str,
+        provider_name: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Run the call inside its service type's bulkhead, rejecting fast when the lane is full"""
+        if service_type not in self.service_configs:
+            return {"success": False, "error": f"No configuration for {service_type.value}"}
+        
+        bulkhead = self._get_bulkhead(service_type)
+        if not await bulkhead.acquire():
+            return {
+                "success": False,
+                "error": f"{service_type.value.upper()} service busy "
+                         f"({bulkhead.in_flight} in flight, {bulkhead.queue_depth} queued)",
+                "rejected": True
+            }
+        
+        try:
+            return await self._execute_with_fallback(service_type, method_name, provider_name, model, **kwargs)
+        finally:
+            bulkhead.release()
+    
+    async def _execute_with_fallback(
+        self,
+        service_type: ServiceType,
+        method_name: str,
+        provider_name: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Execute with fallback across candidate providers (hedging, breakers, rate limits)"""
         config = self.service_configs.get(service_type)
         if not config:
             return {"success": False, "error": f"No configuration for {service_type.value}"}
         
         # Determine providers to try
-        providers_to_try = []
+        providers_to_try = self._providers_to_try(config, provider_name)
+        if providers_to_try is None:
+            return {"success": False, "error": f"Provider {provider_name} not found"}
         
-        if provider_name:
-            # Use specified provider only
-            if provider_name in self.providers:
-                providers_to_try = [provider_name]
-            else:
-                return {"success": False, "error": f"Provider {provider_name} not found"}
-        else:
-            # Use default + fallbacks
-            providers_to_try = [config.default_provider] + config.fallback_providers
-            # Remove duplicates while preserving order
-            providers_to_try = list(dict.fromkeys(providers_to_try))
+        # Resolve the ordered list of (provider, model) candidates up front so a
+        # hedge can be fired at the next one while the current call is in flight
+        candidates = self._resolve_candidates(service_type, method_name, providers_to_try, model)
+        
+        if config.hedge_enabled:
+            self._get_hedge_budget(service_type).record_request()
         
         last_error = None
+        index = 0
+        
+        while index < len(candidates):
+            candidate = candidates[index]
+            index += 1
+            provider_name, provider, provider_model = candidate
+            
+            # Stop once the request deadline has passed, and skip fallbacks that
+            # typically take longer than the time that is left
+            skip = self._check_deadline(candidate, method_name, is_fallback=index > 1)
+            if skip:
+                last_error = skip["error"]
+                if skip["stop_fallback"]:
+                    break
+                continue
+            
+            # Skip providers whose circuit is open instead of waiting for their timeout
+            if not self.circuit_breakers.get(provider_name, provider_model).allow_request():
+                logger.warning(f"Circuit open for {provider_name}/{provider_model}, skipping")
+                last_error = f"Circuit open for {provider_name}/{provider_model}"
+                continue
+            
+            hedge_delay = None
+            if index < len(candidates):
+                hedge_delay = self._get_hedge_delay(config, provider_name, provider_model, method_name)
+            
+            if hedge_delay is None:
+                outcome = await self._attempt(service_type, method_name, candidate, kwargs)
+            else:
+                outcome, index = await self._attempt_with_hedge(
+                    service_type, method_name, candidate, candidates, index, hedge_delay, kwargs
+                )
+            
+            if outcome["success"]:
+                return outcome
+            
+            last_error = outcome["error"]
+            if outcome.get("stop_fallback"):
+                break
+        
+        # All providers failed
+        return {
+            "success": False,
+            "error": last_error or f"All providers failed for {service_type.value}",
+            "providers_tried": providers_to_try
+        }
+    
+    def _providers_to_try(self, config: ServiceConfig, provider_name: Optional[str]) -> Optional[List[str]]:
+        """Provider names in attempt order, or None if a requested provider is unknown"""
+        if provider_name:
+            # Use specified provider only
+            return [provider_name] if provider_name in self.providers else None
         
-        for provider_name in providers_to_try:
-            if provider_name not in self.providers:
+        # Use default + fallbacks, removing duplicates while preserving order
+        return list(dict.fromkeys([config.default_provider] + config.fallback_providers))
+    
+    def _resolve_candidates(
+        self,
+        service_type: ServiceType,
+        method_name: str,
+        providers_to_try: List[str],
+        model: Optional[str]
+    ) -> List[tuple]:
+        """Ordered (provider_name, provider, model) candidates able to serve the call"""
+        candidates = []
+        last_resort = []  # Providers failing their health probes are only tried after the rest
+        for candidate_name in providers_to_try:
+            if candidate_name not in self.providers:
                 continue
                 
-            provider = self.providers[provider_name]
+            provider = self.providers[candidate_name]
             
-            if not provider.is_available():
-                logger.warning(f"Provider {provider_name} not available")
+            if not provider.is_configured():
+                logger.warning(f"Provider {candidate_name} not available")
                 continue
                 
             if not self._provider_supports_service(provider, service_type):
-                logger.warning(f"Provider {provider_name} doesn't support {service_type.value}")
+                logger.warning(f"Provider {candidate_name} doesn't support {service_type.value}")
                 continue
             
-            try:
-                # Get the method to call
-                if not hasattr(provider, method_name):
-                    logger.warning(f"Provider {provider_name} doesn't have method {method_name}")
+            # Get the method to call
+            if not hasattr(provider, method_name):
+                logger.warning(f"Provider {candidate_name} doesn't have method {method_name}")
+                continue
+            
+            # Use provider's default model if none specified
+            provider_model = model
+            if not provider_model and provider.config.default_models:
+                provider_model = provider.config.default_models.get(service_type.value)
+            
+            if provider.is_available():
+                candidates.append((candidate_name, provider, provider_model))
+            else:
+                logger.info(f"Provider {candidate_name} failed its health probes, trying it last")
+                last_resort.append((candidate_name, provider, provider_model))
+        
+        return candidates + last_resort
+    
+    async def _attempt(
+        self,
+        service_type: ServiceType,
+        method_name: str,
+        candidate: tuple,
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Call one provider/model, recording the outcome on its circuit breaker"""
+        config = self.service_configs[service_type]
+        provider_name, provider, provider_model = candidate
+        breaker = self.circuit_breakers.get(provider_name, provider_model)
+        
+        # Queue briefly for client-side rate limit capacity rather than firing a doomed request
+        try:
+            admitted = await self._acquire_rate_limit(config, candidate, kwargs)
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        if not admitted:
+            breaker.record_cancelled()
+            return {"success": False, "error": f"Rate limit for {provider_name}/{provider_model} would exceed wait budget"}
+        
+        call_start = time.monotonic()
+        try:
+            method = getattr(provider, method_name)
+            
+            # Execute the method
+            logger.info(f"Executing {method_name} on {provider_name} with model {provider_model}")
+            
+            if asyncio.iscoroutinefunction(method):
+                if provider_model:
+                    call = method(model=provider_model, **kwargs)
+                else:
+                    call = method(**kwargs)
+                # Learned per-model timeout, so a hung call falls back quickly
+                timeout, deadline_bound = self._get_deadline_timeout(
+                    self._get_call_timeout(config, provider_name, provider_model, method_name)
+                )
+                result = await asyncio.wait_for(call, timeout)
+            else:
+                if provider_model:
+                    result = method(model=provider_model, **kwargs)
+                else:
+                    result = method(**kwargs)
+            
+            latency = time.monotonic() - call_start
+            if self._is_provider_failure(result):
+                breaker.record_failure()
+            else:
+                breaker.record_success(latency)
+                self.latency_tracker.record(provider_name, provider_model, method_name, latency)
+            
+            # Check if result indicates success
+            if self._is_successful_result(result, service_type):
+                logger.info(f"Successfully executed {method_name} on {provider_name}")
+                return {
+                    "success": True,
+                    "result": result,
+                    "provider_used": provider_name,
+                    "model_used": provider_model
+                }
+            
+            logger.warning(f"Method {method_name} on {provider_name} returned unsuccessful result")
+            return {"success": False, "error": f"Provider {provider_name} returned unsuccessful result"}
+        
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        
+        except asyncio.TimeoutError:
+            if deadline_bound:
+                # The request ran out of time, not the provider - don't count it against the provider
+                breaker.record_cancelled()
+                self.deadline_stats["expired"] += 1
+                logger.warning(f"{method_name} on {provider_name}/{provider_model} cut off by request deadline")
+                return {"success": False, "error": "Request deadline exceeded", "stop_fallback": True}
+            breaker.record_failure()
+            self.adaptive_timeouts.record_timeout(provider_name, provider_model, method_name, timeout)
+            logger.warning(f"{method_name} on {provider_name}/{provider_model} timed out after {timeout:.2f}s")
+            return {"success": False, "error": f"Provider {provider_name} timed out after {timeout:.2f}s"}
+                
+        except RateLimitError as e:
+            breaker.record_failure()
+            logger.warning(f"Rate limit hit on {provider_name}, trying next provider")
+            return {"success": False, "error": str(e)}
+            
+        except ProviderUnavailableError as e:
+            breaker.record_failure()
+            logger.warning(f"Provider {provider_name} unavailable: {str(e)}")
+            return {"success": False, "error": str(e)}
+            
+        except Exception as e:
+            breaker.record_failure()
+            logger.error(f"Error executing {method_name} on {provider_name}: {str(e)}")
+            # Don't continue to fallback for certain errors
+            return {"success": False, "error": str(e), "stop_fallback": not config.enable_fallback}
+    
+    async def _attempt_with_hedge(
+        self,
+        service_type: ServiceType,
+        method_name: str,
+        primary: tuple,
+        candidates: List[tuple],
+        next_index: int,
+        hedge_delay: float,
+        kwargs: Dict[str, Any]
+    ) -> tuple:
+        """
+        Run the primary call and, if it has not answered within hedge_delay,
+        race it against the next candidate. Returns (outcome, next candidate index).
+        """
+        stats = self._get_hedge_stats(service_type)
+        primary_task = asyncio.create_task(self._attempt(service_type, method_name, primary, kwargs))
+        pending = {primary_task}
+        
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+            if done:
+                return primary_task.result(), next_index
+            
+            hedge = None
+            if self._get_hedge_budget(service_type).try_acquire_retry():
+                while next_index < len(candidates) and hedge is None:
+                    candidate = candidates[next_index]
+                    next_index += 1
+                    if self.circuit_breakers.get(candidate[0], candidate[2]).allow_request():
+                        hedge = candidate
+            else:
+                stats["budget_denied"] += 1
+            
+            if hedge is None:
+                return await primary_task, next_index
+            
+            logger.info(
+                f"{primary[0]}/{primary[2]} slower than {hedge_delay * 1000:.0f}ms, "
+                f"hedging {method_name} to {hedge[0]}/{hedge[2]}"
+            )
+            stats["hedges_fired"] += 1
+            hedge_task = asyncio.create_task(self._attempt(service_type, method_name, hedge, kwargs))
+            pending.add(hedge_task)
+            
+            outcome = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    outcome = task.result()
+                    if outcome["success"]:
+                        if task is hedge_task:
+                            stats["hedge_wins"] += 1
+                        else:
+                            stats["primary_wins"] += 1
+                        return {**outcome, "hedged": True}, next_index
+            return outcome, next_index
+        
+        finally:
+            # Cancel the loser (or both, if we were cancelled ourselves)
+            for task in pending:
+                task.cancel()
+    
+    def _get_call_timeout(
+        self,
+        config: ServiceConfig,
+        provider_name: str,
+        provider_model: Optional[str],
+        method_name: str
+    ) -> float:
+        """Per-call timeout: learned from observed latency, capped by the service timeout"""
+        if not self.adaptive_timeouts_enabled:
+            return config.timeout
+        return self.adaptive_timeouts.get(provider_name, provider_model, method_name, ceiling=config.timeout)
+    
+    def _get_deadline_timeout(self, timeout: float) -> tuple:
+        """(timeout, deadline_bound): the timeout shrunk to the request's remaining budget"""
+        left = deadline_remaining()
+        if left is None or left >= timeout:
+            return timeout, False
+        self.deadline_stats["timeouts_shrunk"] += 1
+        return max(0.0, left), True
+    
+    def _check_deadline(self, candidate: tuple, method_name: str, is_fallback: bool) -> Optional[Dict[str, Any]]:
+        """Error outcome if the candidate can't run within the request deadline, else None"""
+        left = deadline_remaining()
+        if left is None:
+            return None
+        if left <= 0:
+            self.deadline_stats["expired"] += 1
+            return {"error": "Request deadline exceeded", "stop_fallback": True}
+        
+        # A fallback whose typical latency is longer than what's left would only add to the wait
+        provider_name, _, provider_model = candidate
+        typical = self.latency_tracker.percentile(provider_name, provider_model, method_name, 0.5)
+        if is_fallback and typical is not None and typical > left:
+            self.deadline_stats["fallbacks_skipped"] += 1
+            logger.info(
+                f"Skipping {provider_name}/{provider_model}: p50 {typical * 1000:.0f}ms "
+                f"exceeds remaining budget {left * 1000:.0f}ms"
+            )
+            return {"error": f"{provider_name}/{provider_model} cannot finish within the request deadline", "stop_fallback": False}
+        return None
+    
+    async def _acquire_rate_limit(self, config: ServiceConfig, candidate: tuple, kwargs: Dict[str, Any]) -> bool:
+        """Wait for client-side rate limit capacity; False if the wait would exceed the budget"""
+        provider_name, provider, provider_model = candidate
+        requests_per_minute, tokens_per_minute = self._get_rate_limits(config, provider)
+        if not (requests_per_minute or tokens_per_minute):
+            return True
+        return await self.rate_limiter.acquire(
+            provider_name, provider.api_key, provider_model,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            tokens=estimate_tokens(kwargs),
+            max_wait=self._get_deadline_timeout(config.rate_limit_max_wait)[0]
+        )
+    
+    def _get_rate_limits(self, config: ServiceConfig, provider: Any) -> tuple:
+        """(requests/min, tokens/min) for a provider, taking the stricter of provider and service limits"""
+        rate_limit = provider.config.rate_limit or {}
+        requests_per_minute = rate_limit.get("requests_per_minute")
+        tokens_per_minute = rate_limit.get("tokens_per_minute")
+        
+        for priority in config.provider_priorities:
+            if priority.provider_name == provider.name and priority.max_requests_per_minute:
+                requests_per_minute = min(filter(None, [requests_per_minute, priority.max_requests_per_minute]))
+        
+        return requests_per_minute, tokens_per_minute
+    
+    def _get_hedge_delay(
+        self,
+        config: ServiceConfig,
+        provider_name: str,
+        provider_model: Optional[str],
+        method_name: str
+    ) -> Optional[float]:
+        """Delay before hedging a call, or None if hedging is off or latency is unknown"""
+        if not config.hedge_enabled:
+            return None
+        observed = self.latency_tracker.percentile(
+            provider_name, provider_model, method_name, config.hedge_percentile
+        )
+        if observed is None:
+            return None
+        return max(config.hedge_min_delay, observed)
+    
+    def _get_hedge_budget(self, service_type: ServiceType) -> RetryBudget:
+        """Hedge budget for a service type, created on first use"""
+        if service_type not in self.hedge_budgets:
+            config = self.service_configs[service_type]
+            self.hedge_budgets[service_type] = RetryBudget(ratio=config.hedge_budget_ratio, min_retries=2)
+        return self.hedge_budgets[service_type]
+    
+    def _get_bulkhead(self, service_type: ServiceType) -> Bulkhead:
+        """Bulkhead for a service type, created on first use"""
+        if service_type not in self.bulkheads:
+            config = self.service_configs[service_type]
+            self.bulkheads[service_type] = Bulkhead(
+                service_type.value, config.max_concurrency, config.max_queue_depth, config.queue_timeout
+            )
+        return self.bulkheads[service_type]
+    
+    def _get_hedge_stats(self, service_type: ServiceType) -> Dict[str, int]:
+        """Hedge counters for a service type, created on first use"""
+        if service_type not in self.hedge_stats:
+            self.hedge_stats[service_type] = {
+                "hedges_fired": 0,
+                "hedge_wins": 0,
+                "primary_wins": 0,
+                "budget_denied": 0
+            }
+        return self.hedge_stats[service_type]
+    
+    async def stream_with_fallback(
+        self,
+        service_type: ServiceType,
+        method_name: str,
+        provider_name: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a provider method with automatic fallback.
+        Falls back to the next provider only until the first chunk arrives; after
+        that, errors propagate to the caller. Yields {"delta", "provider_used", "model_used"}.
+        """
+        config = self.service_configs.get(service_type)
+        if not config:
+            raise ProviderError(f"No configuration for {service_type.value}", "registry")
+        
+        providers_to_try = self._providers_to_try(config, provider_name)
+        if providers_to_try is None:
+            raise ProviderError(f"Provider {provider_name} not found", "registry")
+        candidates = self._resolve_candidates(service_type, method_name, providers_to_try, model)
+        
+        bulkhead = self._get_bulkhead(service_type)
+        if not await bulkhead.acquire():
+            raise ProviderError(f"{service_type.value.upper()} service busy", "registry")
+        
+        try:
+            last_error = None
+            
+            for position, candidate in enumerate(candidates):
+                candidate_name, provider, provider_model = candidate
+                skip = self._check_deadline(candidate, method_name, is_fallback=position > 0)
+                if skip:
+                    last_error = skip["error"]
+                    if skip["stop_fallback"]:
+                        break
                     continue
                 
-                method = getattr(provider, method_name)
+                breaker = self.circuit_breakers.get(candidate_name, provider_model)
+                if not breaker.allow_request():
+                    logger.warning(f"Circuit open for {candidate_name}/{provider_model}, skipping")
+                    last_error = f"Circuit open for {candidate_name}/{provider_model}"
+                    continue
                 
-                # Use provider's default model if none specified
-                if not model and hasattr(provider.config, 'default_models'):
-                    model = provider.config.default_models.get(service_type.value)
+                try:
+                    admitted = await self._acquire_rate_limit(config, candidate, kwargs)
+                except asyncio.CancelledError:
+                    breaker.record_cancelled()
+                    raise
+                if not admitted:
+                    breaker.record_cancelled()
+                    last_error = f"Rate limit for {candidate_name}/{provider_model} would exceed wait budget"
+                    continue
                 
-                # Execute the method
-                logger.info(f"Executing {method_name} on {provider_name} with model {model}")
+                logger.info(f"Streaming {method_name} on {candidate_name} with model {provider_model}")
+                method = getattr(provider, method_name)
+                stream = method(model=provider_model, **kwargs) if provider_model else method(**kwargs)
+                call_start = time.monotonic()
+                first_chunk = True
                 
-                if asyncio.iscoroutinefunction(method):
-                    if model:
-                        result = await method(model=model, **kwargs)
-                    else:
-                        result = await method(**kwargs)
-                else:
-                    if model:
-                        result = method(model=model, **kwargs)
-                    else:
-                        result = method(**kwargs)
+                timeout, deadline_bound = self._get_deadline_timeout(
+                    self._get_call_timeout(config, candidate_name, provider_model, method_name)
+                )
                 
-                # Check if result indicates success
-                if self._is_successful_result(result, service_type):
-                    logger.info(f"Successfully executed {method_name} on {provider_name}")
-                    return {
-                        "success": True,
-                        "result": result,
-                        "provider_used": provider_name,
-                        "model_used": model
-                    }
-                else:
-                    logger.warning(f"Method {method_name} on {provider_name} returned unsuccessful result")
-                    last_error = f"Provider {provider_name} returned unsuccessful result"
+                try:
+                    # Only the wait for the first chunk is bounded by the learned timeout
+                    try:
+                        delta = await asyncio.wait_for(stream.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        delta = None
                     
-            except RateLimitError as e:
-                logger.warning(f"Rate limit hit on {provider_name}, trying next provider")
-                last_error = str(e)
-                continue
+                    if delta is not None:
+                        first_chunk = False
+                        time_to_first_chunk = time.monotonic() - call_start
+                        breaker.record_success(time_to_first_chunk)
+                        self.latency_tracker.record(candidate_name, provider_model, method_name, time_to_first_chunk)
+                        yield {"delta": delta, "provider_used": candidate_name, "model_used": provider_model}
+                        
+                        async for delta in stream:
+                            yield {"delta": delta, "provider_used": candidate_name, "model_used": provider_model}
                 
-            except ProviderUnavailableError as e:
-                logger.warning(f"Provider {provider_name} unavailable: {str(e)}")
-                last_error = str(e)
-                continue
+                except (asyncio.CancelledError, GeneratorExit):
+                    if first_chunk:
+                        breaker.record_cancelled()
+                    raise
                 
-            except Exception as e:
-                logger.error(f"Error executing {method_name} on {provider_name}: {str(e)}")
-                last_error = str(e)
+                except Exception as e:
+                    if not first_chunk:
+                        # Output already reached the caller, switching providers would garble it
+                        raise
+                    if isinstance(e, asyncio.TimeoutError) and deadline_bound:
+                        breaker.record_cancelled()
+                        self.deadline_stats["expired"] += 1
+                        last_error = "Request deadline exceeded"
+                        break
+                    if isinstance(e, asyncio.TimeoutError):
+                        self.adaptive_timeouts.record_timeout(candidate_name, provider_model, method_name, timeout)
+                        e = f"timed out after {timeout:.2f}s waiting for first chunk"
+                    breaker.record_failure()
+                    logger.warning(f"Streaming {method_name} on {candidate_name} failed before first chunk: {str(e)}")
+                    last_error = str(e)
+                    if not config.enable_fallback:
+                        break
+                    continue
                 
-                # Don't continue to fallback for certain errors
-                if not config.enable_fallback:
-                    break
-                    
-                continue
+                finally:
+                    await stream.aclose()
+                
+                if first_chunk:
+                    breaker.record_failure()
+                    last_error = f"Provider {candidate_name} returned an empty stream"
+                    continue
+                return
+            
+            raise ProviderError(last_error or f"All providers failed for {service_type.value}", "registry")
         
-        # All providers failed
-        return {
-            "success": False,
-            "error": last_error or f"All providers failed for {service_type.value}",
-            "providers_tried": providers_to_try
-        }
+        finally:
+            bulkhead.release()
+    
+    def _is_provider_failure(self, result: Any) -> bool:
+        """Check if result indicates the provider itself failed (vs. e.g. VLM not finding an element)"""
+        if result is None:
+            return True
+        if isinstance(result, dict):
+            return "error" in result or result.get("success") is False
+        if isinstance(result, (str, bytes)):
+            return len(result) == 0
+        return False
     
     def _is_successful_result(self, result: Any, service_type: ServiceType) -> bool:
         """Check if result indicates success"""
@@ -362,6 +920,12 @@ class ProviderRegistry:
         provider_name = kwargs.pop("provider", None)
         model = kwargs.pop("model", None)
         
+        # Little time left in the request budget: favour the fastest models
+        if deadline_is_tight() and performance_mode != PerformanceMode.SPEED.value:
+            logger.info(f"Request deadline is tight, selecting {service_type.value} model for speed")
+            self.deadline_stats["speed_selections"] += 1
+            performance_mode = PerformanceMode.SPEED.value
+        
         # If auto mode is enabled and no explicit provider/model specified
         if auto_mode and not provider_name and not model:
             try:
@@ -518,26 +1082,78 @@ class ProviderRegistry:
                 "cost_sensitivity": True
             }
 
-    async def health_check(self) -> Dict[str, Any]:
-        """Check health of all providers"""
-        health_status = {}
+    async def startup(self):
+        """Open shared HTTP connection pools for all providers and restore learned latencies"""
+        restored = self.latency_tracker.load(self.latency_profile_path)
+        if restored:
+            logger.info(f"Restored latency profile for {restored} provider/model/method keys")
         
         for provider_name, provider in self.providers.items():
             try:
-                status = await provider.health_check()
-                health_status[provider_name] = status
+                await provider.startup()
             except Exception as e:
-                health_status[provider_name] = {
-                    "status": "error",
-                    "error": str(e)
-                }
+                logger.error(f"Failed to start provider {provider_name}: {str(e)}")
+        
+        if self.health_probing_enabled:
+            self.health_prober.start()
+    
+    async def shutdown(self):
+        """Close shared HTTP connection pools for all providers and persist learned latencies"""
+        await self.health_prober.stop()
+        
+        for provider_name, provider in self.providers.items():
+            try:
+                await provider.shutdown()
+            except Exception as e:
+                logger.error(f"Failed to shut down provider {provider_name}: {str(e)}")
+        
+        try:
+            self.latency_tracker.save(self.latency_profile_path)
+        except OSError as e:
+            logger.error(f"Failed to save latency profile: {str(e)}")
+    
+    async def health_check(self, refresh: bool = False) -> Dict[str, Any]:
+        """Health of all providers from the background prober's cache (probed now if refresh or never probed)"""
+        if refresh or not self.health_prober.has_probed:
+            await self.health_prober.probe_once()
+        
+        health_status = self.health_prober.snapshot()
+        for provider_name, provider in self.providers.items():
+            health_status.setdefault(provider_name, {"status": "unknown"})
+            health_status[provider_name]["connection_pool"] = provider.get_pool_stats()
+            health_status[provider_name]["retry_budget"] = provider.retry_budget.snapshot()
         
         return {
             "overall_status": "healthy" if any(
                 status.get("status") == "healthy" 
                 for status in health_status.values()
             ) else "unhealthy",
-            "providers": health_status
+            "providers": health_status,
+            "circuit_breakers": self.circuit_breakers.snapshot()
+        }
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hedging, latency, timeout, rate limit, coalescing, deadline and bulkhead metrics"""
+        hedging = {}
+        for service_type, config in self.service_configs.items():
+            hedging[service_type.value] = {
+                "enabled": config.hedge_enabled,
+                "percentile": config.hedge_percentile,
+                **self._get_hedge_stats(service_type),
+                "budget": self._get_hedge_budget(service_type).snapshot()
+            }
+        
+        return {
+            "hedging": hedging,
+            "latency": self.latency_tracker.snapshot(),
+            "adaptive_timeouts": self.adaptive_timeouts.snapshot(),
+            "rate_limits": self.rate_limiter.snapshot(),
+            "single_flight": self.single_flight.snapshot(),
+            "deadlines": dict(self.deadline_stats),
+            "bulkheads": {
+                service_type.value: self._get_bulkhead(service_type).snapshot()
+                for service_type in self.service_configs
+            }
         }
     
     def get_available_models(
@@ -576,6 +1192,9 @@ class ProviderRegistry:
     ):
         """Update service configuration"""
         self.service_configs[service_type] = config
+        # Rebuild per-service limits from the new config on next use
+        self.bulkheads.pop(service_type, None)
+        self.hedge_budgets.pop(service_type, None)
         logger.info(f"Updated configuration for {service_type.value}")
     
     def set_default_provider(
@@ -0,0 +1,149 @@
+# Generated by Copilot
+"""
+Client-side Rate Limiter for AI Providers
+Token buckets for requests/min and tokens/min per provider, API key and model,
+so bursts wait briefly in-process instead of turning into provider 429s
+"""
+
+import asyncio
+import hashlib
+import time
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at capacity/60 per second.
+    Reservations may drive the level negative, which queues later callers
+    behind earlier ones in arrival order.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def predicted_wait(self, amount: float) -> float:
+        """Seconds until `amount` tokens would be available"""
+        self._refill()
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket, not forever
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+
+class RateLimiter:
+    """Token buckets keyed by provider, API key fingerprint and model"""
+
+    def __init__(self, sample_size: int = 200):
+        self._buckets: Dict[Tuple[str, str, str, str], TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._sample_size = sample_size
+
+    @staticmethod
+    def key_fingerprint(api_key: str) -> str:
+        """Short non-reversible id so buckets are per key without storing the key"""
+        return hashlib.sha256((api_key or "").encode()).hexdigest()[:8]
+
+    def _bucket(self, provider: str, key_id: str, model: str, kind: str, per_minute: int) -> TokenBucket:
+        bucket_key = (provider, key_id, model, kind)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None or bucket.capacity != per_minute:
+            bucket = TokenBucket(per_minute)
+            self._buckets[bucket_key] = bucket
+        return bucket
+
+    def _record(self, name: str, wait: Optional[float]):
+        stats = self._stats.setdefault(name, {"admitted": 0, "rejected": 0, "waited": 0, "waits": deque(maxlen=self._sample_size)})
+        if wait is None:
+            stats["rejected"] += 1
+            return
+        stats["admitted"] += 1
+        if wait > 0:
+            stats["waited"] += 1
+        stats["waits"].append(wait)
+
+    async def acquire(
+        self,
+        provider: str,
+        api_key: str,
+        model: Optional[str],
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        tokens: int = 0,
+        max_wait: float = 2.0
+    ) -> bool:
+        """
+        Wait for capacity for one request of `tokens` tokens. Returns False
+        without waiting when the predicted wait exceeds max_wait.
+        """
+        model = model or "default"
+        key_id = self.key_fingerprint(api_key)
+        reservations = []
+        if requests_per_minute:
+            reservations.append((self._bucket(provider, key_id, model, "requests", requests_per_minute), 1))
+        if tokens_per_minute and tokens:
+            reservations.append((self._bucket(provider, key_id, model, "tokens", tokens_per_minute), tokens))
+        if not reservations:
+            return True
+
+        name = f"{provider}/{key_id}/{model}"
+        wait = max(bucket.predicted_wait(amount) for bucket, amount in reservations)
+        if wait > max_wait:
+            logger.warning(f"Rate limit {name}: predicted wait {wait:.2f}s exceeds {max_wait:.2f}s")
+            self._record(name, None)
+            return False
+
+        for bucket, amount in reservations:
+            bucket.consume(amount)
+        self._record(name, wait)
+
+        if wait > 0:
+            logger.info(f"Rate limit {name}: queued for {wait * 1000:.0f}ms")
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                for bucket, amount in reservations:
+                    bucket.refund(amount)
+                raise
+        return True
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Admission counts and queue wait times per bucket set"""
+        snapshot = {}
+        for name, stats in self._stats.items():
+            waits = sorted(stats["waits"])
+            snapshot[name] = {
+                "admitted": stats["admitted"],
+                "rejected": stats["rejected"],
+                "waited": stats["waited"],
+                "p50_wait_ms": round(waits[len(waits) // 2] * 1000, 1) if waits else 0.0,
+                "p95_wait_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+                "max_wait_ms": round(waits[-1] * 1000, 1) if waits else 0.0
+            }
+        return snapshot
+
+def estimate_tokens(kwargs: Dict[str, Any]) -> int:
+    """Rough token estimate for a call: ~4 characters per prompt token plus the completion cap"""
+    chars = 0
+    for key, value in kwargs.items():
+        if isinstance(value, str):
+            chars += len(value)
+        elif key == "messages" and isinstance(value, list):
+            chars += sum(len(str(message.get("content", ""))) for message in value if isinstance(message, dict))
+    return chars // 4 + int(kwargs.get("max_tokens") or 0)
@@ -0,0 +1,158 @@
+# Generated by Copilot
+"""
+Retry Engine for Provider HTTP Calls
+Exponential backoff with full jitter, Retry-After handling and a retry budget
+"""
+
+import asyncio
+import random
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Any, FrozenSet, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Transport failures that are safe to retry: the request never reached the
+# provider, or a pooled keep-alive connection was closed under us
+RETRYABLE_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.RemoteProtocolError,
+)
+
+@dataclass
+class RetryPolicy:
+    """Retry configuration for a provider"""
+    max_retries: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({429, 500, 502, 503, 504}))
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of recent traffic so a struggling provider
+    is not hit with a retry storm on top of its normal load
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window_seconds: float = 10.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+        self.total_requests = 0
+        self.total_retries = 0
+        self.denied_retries = 0
+
+    def _trim(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._requests and self._requests[0] < cutoff:
+            self._requests.popleft()
+        while self._retries and self._retries[0] < cutoff:
+            self._retries.popleft()
+
+    def record_request(self):
+        """Record an original (non-retry) request"""
+        now = time.monotonic()
+        self._trim(now)
+        self._requests.append(now)
+        self.total_requests += 1
+
+    def try_acquire_retry(self) -> bool:
+        """Reserve a retry if the budget allows it"""
+        now = time.monotonic()
+        self._trim(now)
+        allowed = max(self.min_retries, self.ratio * len(self._requests))
+        if len(self._retries) >= allowed:
+            self.denied_retries += 1
+            return False
+        self._retries.append(now)
+        self.total_retries += 1
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current budget usage"""
+        self._trim(time.monotonic())
+        return {
+            "ratio": self.ratio,
+            "window_seconds": self.window_seconds,
+            "requests_in_window": len(self._requests),
+            "retries_in_window": len(self._retries),
+            "total_requests": self.total_requests,
+            "total_retries": self.total_retries,
+            "denied_retries": self.denied_retries
+        }
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring unparseable Retry-After header: {value}")
+        return None
+
+async def send_with_retry(
+    send: Callable[[], Awaitable[httpx.Response]],
+    policy: RetryPolicy,
+    budget: RetryBudget,
+    provider_name: str = "provider"
+) -> httpx.Response:
+    """
+    Send a request, retrying rate limits, transient 5xx responses and
+    connection failures. Returns the last response once retries are exhausted
+    so callers keep their existing status-code handling.
+    """
+    budget.record_request()
+    attempt = 0
+
+    while True:
+        try:
+            response = await send()
+        except RETRYABLE_EXCEPTIONS as e:
+            if attempt >= policy.max_retries or not budget.try_acquire_retry():
+                raise
+            delay = policy.backoff(attempt)
+            reason = type(e).__name__
+        else:
+            if response.status_code not in policy.retry_statuses or attempt >= policy.max_retries:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None and retry_after > policy.max_delay:
+                # Waiting would cost more than falling back to another provider
+                logger.info(f"{provider_name}: Retry-After {retry_after:.1f}s exceeds max delay, not retrying")
+                return response
+            if not budget.try_acquire_retry():
+                logger.warning(f"{provider_name}: Retry budget exhausted, returning {response.status_code}")
+                return response
+
+            delay = retry_after if retry_after is not None else policy.backoff(attempt)
+            reason = f"HTTP {response.status_code}"
+            # Release the connection of a streamed response we are about to discard
+            await response.aclose()
+
+        attempt += 1
+        logger.info(f"{provider_name}: {reason}, retry {attempt}/{policy.max_retries} in {delay * 1000:.0f}ms")
+        await asyncio.sleep(delay)
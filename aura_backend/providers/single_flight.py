@@ -0,0 +1,88 @@
+# Generated by Copilot
+"""
+Single-flight Coalescing for AI Provider Calls
+Identical calls that are in flight at the same time share one provider request
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+def _normalize(value: Any) -> Any:
+    """JSON-friendly form of a call argument; large payloads are reduced to a digest"""
+    if isinstance(value, (bytes, bytearray)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, str) and len(value) > 1024:
+        # Base64 screenshots and similar payloads
+        return {"sha256": hashlib.sha256(value.encode()).hexdigest()}
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # Unknown objects only coalesce with themselves
+    return f"{type(value).__name__}@{id(value)}"
+
+def flight_key(*parts: Any, **kwargs: Any) -> str:
+    """Stable hash of a call's identity (method, model, normalized arguments)"""
+    payload = json.dumps([_normalize(list(parts)), _normalize(kwargs)], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Runs at most one call per key; concurrent duplicates await the same task"""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run call() for key, or join the identical call already in flight"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._release(key, flight))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+            logger.info(f"Coalescing duplicate in-flight call {key[:12]}")
+
+        flight.waiters += 1
+        try:
+            # Shield so one caller going away does not cancel the call for the others
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Last interested caller left - stop spending quota on it
+                self._release(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+        # Callers are free to mutate their result
+        return copy.deepcopy(result)
+
+    def _release(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def snapshot(self) -> Dict[str, int]:
+        """Coalescing counters"""
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights)
+        }
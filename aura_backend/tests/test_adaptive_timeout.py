@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Adaptive timeout test - learned per-model timeouts, fast fallback and persistence
+Uses Groq providers backed by httpx.MockTransport, no API keys needed
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from providers.adaptive_timeout import AdaptiveTimeouts, AdaptiveTimeoutConfig
+from providers.base import ProviderConfig
+from providers.groq_provider import GroqProvider
+from providers.latency_tracker import LatencyTracker
+from providers.provider_registry import ProviderRegistry, ServiceConfig, ServiceType
+
+def _mock_provider(name, delay):
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"from {name}"}}]})
+
+    provider = GroqProvider(ProviderConfig(
+        name=name, api_key="test", base_url="http://mock", max_retries=0,
+        default_models={"llm": "llama-3.1-8b-instant"}
+    ))
+    provider._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return provider
+
+def test_timeout_derivation():
+    """p99 x factor, clamped to floor and ceiling; ceiling until enough samples"""
+    tracker = LatencyTracker(min_samples=5)
+    timeouts = AdaptiveTimeouts(tracker, AdaptiveTimeoutConfig(factor=3.0, floor=0.5, ceiling=30.0))
+    assert timeouts.get("groq", "m", "chat_completion") == 30.0
+    for _ in range(5):
+        tracker.record("groq", "m", "chat_completion", 0.4)
+    assert abs(timeouts.get("groq", "m", "chat_completion") - 1.2) < 1e-9
+    assert timeouts.get("groq", "m", "chat_completion", ceiling=1.0) == 1.0
+    for _ in range(5):
+        tracker.record("groq", "fast", "chat_completion", 0.01)
+    assert timeouts.get("groq", "fast", "chat_completion") == 0.5
+    print("✅ Timeout derivation")
+
+def test_hung_call_falls_back_quickly():
+    """A call exceeding its learned timeout falls back instead of waiting 30s"""
+    registry = ProviderRegistry()
+    registry.single_flight_enabled = False
+    registry.adaptive_timeouts.config = AdaptiveTimeoutConfig(floor=0.05)
+    registry.providers = {"primary": _mock_provider("primary", 5.0), "backup": _mock_provider("backup", 0)}
+    registry.service_configs[ServiceType.LLM] = ServiceConfig(
+        service_type=ServiceType.LLM, default_provider="primary", fallback_providers=["backup"]
+    )
+    for _ in range(20):
+        registry.latency_tracker.record("primary", "llama-3.1-8b-instant", "generate_response", 0.02)
+
+    async def run():
+        start = time.monotonic()
+        result = await registry.execute_with_fallback(ServiceType.LLM, "generate_response", prompt="hi")
+        return result, time.monotonic() - start
+
+    result, elapsed = asyncio.run(run())
+    assert result["provider_used"] == "backup"
+    assert elapsed < 1.0
+    assert registry.adaptive_timeouts.timeouts_fired == 1
+    print("✅ Hung call fell back quickly")
+
+def test_profile_persistence():
+    """Saved latency windows are restored, including model names containing '/'"""
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("groq", "meta-llama/llama-4-scout", "locate_ui_element", 0.7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "latency_profile.json")
+        tracker.save(path)
+        restored = LatencyTracker(min_samples=1)
+        assert restored.load(path) == 1
+
+    assert restored.percentile("groq", "meta-llama/llama-4-scout", "locate_ui_element", 0.99) == 0.7
+    print("✅ Latency profile persisted")
+
+def test_malformed_profile_is_skipped():
+    """A bad profile file never stops startup; only its unreadable entries are dropped"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "latency_profile.json")
+        with open(path, "w") as f:
+            json.dump([], f)
+        assert LatencyTracker().load(path) == 0
+
+        with open(path, "w") as f:
+            json.dump({"no-slashes": [0.1], "groq/m/chat": ["slow"], "groq/m/stt": 0.3, "groq/m/tts": [0.5]}, f)
+        tracker = LatencyTracker(min_samples=1)
+        assert tracker.load(path) == 1
+
+    assert tracker.count("groq", "m", "chat") == 0 and tracker.percentile("groq", "m", "tts", 0.5) == 0.5
+    print("✅ Malformed latency profile skipped")
+
+if __name__ == "__main__":
+    test_timeout_derivation()
+    test_hung_call_falls_back_quickly()
+    test_profile_persistence()
+    test_malformed_profile_is_skipped()
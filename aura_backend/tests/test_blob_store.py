@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Blob store test - media is stored by content hash outside the graph state,
+spills to files over the memory cap and is freed when the request ends
+No API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aura_graph import AuraGraph
+from utils.blob_store import BlobStore, BlobStoreFullError, blob_store
+
+def test_content_addressed_and_shared():
+    """Identical bytes get the same handle and stay until every owner releases them"""
+    store = BlobStore(max_memory_bytes=1024)
+    first = store.put(b"audio", owner="req-1")
+    second = store.put(b"audio", owner="req-2")
+    assert first == second and first.startswith("blob:sha256:")
+    assert store.snapshot()["memory_bytes"] == 5
+
+    store.release("req-1")
+    assert store.get(first) == b"audio"
+    store.release("req-2")
+    assert store.get(first) is None
+    assert store.snapshot() == {"blobs": 0, "memory_bytes": 0, "max_memory_bytes": 1024, "spilled_bytes": 0, "spills": 0}
+    print("✅ Content-addressed, shared blobs")
+
+def test_release_touches_only_the_owners_blobs():
+    """Releasing one request leaves the other requests' blobs and references alone"""
+    store = BlobStore(max_memory_bytes=1024)
+    handles = [store.put(f"audio {n}".encode(), owner=f"req-{n}") for n in range(3)]
+    shared = store.put(b"audio 0", owner="req-1")
+
+    store.release("req-0")
+    store.release("unknown")
+    assert asyncio.run(store.aget(shared)) == b"audio 0" and store._blobs[shared].owners == {"req-1"}
+    assert store.get(handles[2]) == b"audio 2"
+    assert set(store._owned) == {"req-1", "req-2"}
+
+    store.release("req-1")
+    assert store.get(shared) is None and store.get(handles[1]) is None and store.snapshot()["blobs"] == 1
+    print("✅ Release touches only the owner's blobs")
+
+def test_spill_over_cap():
+    """Blobs past the memory cap go to a file that is removed on release; without spilling put fails"""
+    with tempfile.TemporaryDirectory() as spill_dir:
+        store = BlobStore(max_memory_bytes=8, spill_dir=spill_dir)
+        store.put(b"small", owner="req")
+        handle = store.put(b"x" * 100, owner="req")
+        spilled = store._blobs[handle].path
+        assert os.path.exists(spilled) and store.get(handle) == b"x" * 100
+        assert asyncio.run(store.aget(handle)) == b"x" * 100  # Read off the event loop
+        assert store.snapshot()["spilled_bytes"] == 100
+
+        store.release("req")
+        assert not os.path.exists(spilled)
+
+    try:
+        BlobStore(max_memory_bytes=8).put(b"x" * 100, owner="req")
+        assert False, "expected BlobStoreFullError"
+    except BlobStoreFullError:
+        pass
+    print("✅ Spill over cap")
+
+class _HandleGraph:
+    """Stand-in compiled graph that resolves the audio handle like the STT node"""
+
+    def __init__(self):
+        self.seen = None
+
+    async def ainvoke(self, state, config=None):
+        self.seen = state
+        return {**state, "transcript": blob_store.get(state["audio_blob"]).decode()}
+
+def test_graph_state_carries_handles():
+    """Raw media handed to process() reaches nodes as a handle and is freed after the run"""
+    aura = AuraGraph()
+    aura.graph = _HandleGraph()
+    aura._graph_for = lambda state: aura.graph  # every input shape runs the stub
+    blobs_before = blob_store.snapshot()["blobs"]
+
+    result = asyncio.run(aura.process({"_audio_bytes": b"open settings"}, "blob-session"))
+    assert result["transcript"] == "open settings"
+    assert "_audio_bytes" not in aura.graph.seen
+    assert not any(isinstance(value, bytes) for value in aura.graph.seen.values())
+    assert blob_store.get(aura.graph.seen["audio_blob"]) is None
+    assert blob_store.snapshot()["blobs"] == blobs_before
+    print("✅ Graph state carries handles")
+
+if __name__ == "__main__":
+    test_content_addressed_and_shared()
+    test_release_touches_only_the_owners_blobs()
+    test_spill_over_cap()
+    test_graph_state_carries_handles()
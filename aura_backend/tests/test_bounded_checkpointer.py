@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Bounded checkpointer test - checkpoints per session are capped, sessions
+are evicted by LRU, idle TTL and byte budget, and can be deleted on request
+Uses a small graph over AuraState, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph.graph import StateGraph, END
+
+from aura_graph import AuraGraph
+from checkpointers import BoundedMemorySaver
+from graph_state import AuraState, new_turn
+
+def _graph(saver):
+    """stt -> intent_analysis over AuraState"""
+    async def stt(state):
+        return {"node_execution_times": {"stt": 0.1}}
+
+    async def intent(state):
+        return {"intent": state["transcript"], "node_execution_times": {"intent": 0.2}}
+
+    workflow = StateGraph(AuraState)
+    workflow.add_node("stt", stt)
+    workflow.add_node("intent_analysis", intent)
+    workflow.set_entry_point("stt")
+    workflow.add_edge("stt", "intent_analysis")
+    workflow.add_edge("intent_analysis", END)
+    return workflow.compile(checkpointer=saver)
+
+def _turns(graph, thread_ids, text="open settings"):
+    async def run():
+        result = None
+        for thread_id in thread_ids:
+            config = {"configurable": {"thread_id": thread_id}}
+            result = await graph.ainvoke(new_turn({"transcript": text}), config=config)
+        return result
+    return asyncio.run(run())
+
+def test_checkpoints_capped_per_session():
+    """Old checkpoints and the blobs only they referenced are dropped; the session still resumes"""
+    saver = BoundedMemorySaver(max_checkpoints_per_session=3)
+    graph = _graph(saver)
+    _turns(graph, ["s1"] * 10)
+    blobs_after_10 = len(saver.blobs)
+    _turns(graph, ["s1"] * 9)
+    result = _turns(graph, ["s1"], text="go home")
+
+    snapshot = saver.snapshot()
+    assert snapshot["checkpoints"] == 3 and snapshot["pruned_checkpoints"] > 0
+    assert len(saver.blobs) <= blobs_after_10
+    assert result["intent"] == "go home"
+    state = graph.get_state({"configurable": {"thread_id": "s1"}})
+    assert state.values["intent"] == "go home"
+    print(f"✅ Checkpoints capped per session ({snapshot['bytes']} bytes)")
+
+def test_lru_and_byte_budget_eviction():
+    """Least recently used sessions go first past the session count or the byte budget"""
+    saver = BoundedMemorySaver(max_sessions=2)
+    graph = _graph(saver)
+    _turns(graph, ["a", "b", "a", "c"])
+    assert "b" not in saver.storage and {"a", "c"} <= set(saver.storage)
+    assert saver.snapshot()["evictions"]["lru"] == 1
+
+    saver = BoundedMemorySaver(max_bytes=1)
+    graph = _graph(saver)
+    _turns(graph, ["x", "y"])
+    assert list(saver.storage) == ["y"]
+    assert saver.snapshot()["evictions"]["bytes"] == 1
+    print("✅ LRU and byte budget eviction")
+
+def test_idle_sessions_expire():
+    """Sessions idle past the TTL are evicted and their bytes are released"""
+    saver = BoundedMemorySaver(session_ttl_seconds=0.05)
+    graph = _graph(saver)
+    _turns(graph, ["idle"])
+    assert saver.snapshot()["bytes"] > 0
+    time.sleep(0.1)
+
+    snapshot = saver.snapshot()
+    assert snapshot["sessions"] == 0 and snapshot["bytes"] == 0
+    assert snapshot["evictions"]["ttl"] == 1
+    assert saver.get_tuple({"configurable": {"thread_id": "idle"}}) is None
+    assert "idle" not in saver.storage
+    print("✅ Idle sessions expire")
+
+def test_clear_session_frees_checkpoints():
+    """A non-UUID session maps to one stable thread, and clearing it frees its checkpoints"""
+    aura = AuraGraph()
+    thread_id = aura._graph_thread_id("living-room-tablet")
+    assert thread_id == aura._graph_thread_id("living-room-tablet")
+    assert str(uuid.UUID(thread_id)) == thread_id
+
+    graph = _graph(aura.checkpointer)
+    _turns(graph, [thread_id] * 2)
+    assert aura.checkpointer.snapshot()["sessions"] == 1
+
+    assert asyncio.run(aura.clear_session("living-room-tablet")) is True
+    snapshot = aura.checkpointer.snapshot()
+    assert snapshot["sessions"] == 0 and snapshot["bytes"] == 0 and snapshot["evictions"]["deleted"] == 1
+    assert not aura.checkpointer.blobs and not aura.checkpointer.writes
+    assert asyncio.run(aura.clear_session("living-room-tablet")) is False
+    print("✅ Clear session frees checkpoints")
+
+if __name__ == "__main__":
+    test_checkpoints_capped_per_session()
+    test_lru_and_byte_budget_eviction()
+    test_idle_sessions_expire()
+    test_clear_session_frees_checkpoints()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Bulkhead test - per-service concurrency lanes, queueing and fast rejection
+No API keys or network needed
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from providers.bulkhead import Bulkhead
+
+async def _occupy(bulkhead, hold, results):
+    admitted = await bulkhead.acquire()
+    results.append(admitted)
+    if admitted:
+        await asyncio.sleep(hold)
+        bulkhead.release()
+
+def test_queue_then_reject_when_full():
+    """Callers beyond concurrency queue, callers beyond queue depth are rejected at once"""
+    bulkhead = Bulkhead("vlm", max_concurrency=2, max_queue_depth=1, queue_timeout=1.0)
+    results = []
+
+    async def run():
+        tasks = [asyncio.create_task(_occupy(bulkhead, 0.05, results)) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        snapshot = bulkhead.snapshot()
+        await asyncio.gather(*tasks)
+        return snapshot
+
+    snapshot = asyncio.run(run())
+    assert snapshot["in_flight"] == 2 and snapshot["queue_depth"] == 1
+    assert results.count(True) == 3 and results.count(False) == 1
+    assert bulkhead.snapshot()["in_flight"] == 0
+    print("✅ Queue then reject")
+
+def test_queue_timeout():
+    """A queued caller gives up after queue_timeout"""
+    bulkhead = Bulkhead("vlm", max_concurrency=1, max_queue_depth=5, queue_timeout=0.02)
+    results = []
+
+    async def run():
+        await asyncio.gather(_occupy(bulkhead, 0.1, results), _occupy(bulkhead, 0, results))
+
+    asyncio.run(run())
+    assert results == [True, False]
+    assert bulkhead.timed_out == 1 and bulkhead.queue_depth == 0
+    print("✅ Queue timeout")
+
+def test_cancelled_waiter_leaves_queue():
+    """Cancelling a queued caller frees its queue slot without leaking capacity"""
+    bulkhead = Bulkhead("stt", max_concurrency=1, max_queue_depth=1, queue_timeout=1.0)
+
+    async def run():
+        assert await bulkhead.acquire()
+        waiter = asyncio.create_task(bulkhead.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        bulkhead.release()
+        return await bulkhead.acquire()
+
+    assert asyncio.run(run())
+    assert bulkhead.in_flight == 1 and bulkhead.queue_depth == 0
+    print("✅ Cancelled waiter removed")
+
+if __name__ == "__main__":
+    test_queue_then_reject_when_full()
+    test_queue_timeout()
+    test_cancelled_waiter_leaves_queue()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker test - open/half-open/closed transitions and registry skipping
+Uses a Groq provider backed by httpx.MockTransport, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from providers.base import ProviderConfig
+from providers.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitBreakerRegistry, CircuitState
+from providers.groq_provider import GroqProvider
+from providers.provider_registry import ProviderRegistry, ServiceType
+
+def test_breaker_state_transitions():
+    """Failures open the circuit, a successful probe closes it again"""
+    breaker = CircuitBreaker("groq/test", CircuitBreakerConfig(min_calls=3, open_duration=0.05))
+
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.allow_request()  # Probe admitted
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()  # Only one probe at a time
+
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.CLOSED
+    print("✅ Breaker transitions")
+
+def test_slow_calls_open_breaker():
+    """Calls over the latency threshold open the circuit"""
+    breaker = CircuitBreaker("groq/slow", CircuitBreakerConfig(min_calls=2, slow_call_threshold=1.0))
+    breaker.record_success(2.0)
+    breaker.record_success(3.0)
+    assert breaker.state == CircuitState.OPEN
+    print("✅ Slow calls open breaker")
+
+def test_registry_skips_open_provider():
+    """execute_with_fallback skips an open provider without calling it"""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(500)
+
+    async def run():
+        registry = ProviderRegistry()
+        registry.circuit_breakers = CircuitBreakerRegistry(CircuitBreakerConfig(min_calls=2, open_duration=60))
+        provider = GroqProvider(ProviderConfig(
+            name="groq", api_key="test", base_url="http://mock", max_retries=0,
+            default_models={"llm": "llama-3.1-8b-instant"}
+        ))
+        provider._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        registry.providers = {"groq": provider}
+
+        for _ in range(2):
+            result = await registry.execute_with_fallback(
+                ServiceType.LLM, "generate_response", provider_name="groq", prompt="hi"
+            )
+            assert not result["success"]
+
+        result = await registry.execute_with_fallback(
+            ServiceType.LLM, "generate_response", provider_name="groq", prompt="hi"
+        )
+        return result, registry.circuit_breakers.snapshot()
+
+    result, snapshot = asyncio.run(run())
+    assert len(calls) == 2
+    assert "Circuit open" in result["error"]
+    assert snapshot["groq/llama-3.1-8b-instant"]["state"] == "open"
+    print("✅ Registry skips open provider")
+
+if __name__ == "__main__":
+    test_breaker_state_transitions()
+    test_slow_calls_open_breaker()
+    test_registry_skips_open_provider()
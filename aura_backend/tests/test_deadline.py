@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Request deadline test - provider timeouts shrink to the remaining budget
+and fallbacks that cannot finish in time are skipped
+Uses Groq providers backed by httpx.MockTransport, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from providers.base import ProviderConfig
+from providers.deadline import deadline_from_budget, deadline_scope, is_expired, is_tight, remaining
+from providers.groq_provider import GroqProvider
+from providers.provider_registry import ProviderRegistry, ServiceConfig, ServiceType
+
+def _mock_provider(name, delay, calls):
+    """Groq provider whose chat endpoint answers after `delay` seconds"""
+    async def handler(request):
+        calls.append(name)
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"from {name}"}}]})
+
+    provider = GroqProvider(ProviderConfig(
+        name=name, api_key="test", base_url="http://mock", max_retries=0,
+        default_models={"llm": "llama-3.1-8b-instant"}
+    ))
+    provider._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return provider
+
+def _registry(primary_delay, calls):
+    registry = ProviderRegistry()
+    registry.providers = {
+        "primary": _mock_provider("primary", primary_delay, calls),
+        "backup": _mock_provider("backup", 0, calls)
+    }
+    registry.service_configs[ServiceType.LLM] = ServiceConfig(
+        service_type=ServiceType.LLM, default_provider="primary", fallback_providers=["backup"]
+    )
+    return registry
+
+def test_deadline_helpers():
+    """Budgets become absolute deadlines; 0 means no deadline"""
+    assert deadline_from_budget(0) is None
+    state = {"deadline": deadline_from_budget(1000)}
+    assert 0.9 < remaining(state) <= 1.0
+    assert is_tight(state, threshold=2.0) and not is_tight(state, threshold=0.5)
+    assert not is_expired(state)
+    assert is_expired({"deadline": time.time() - 1})
+    assert remaining({}) is None and not is_tight({})
+    print("✅ Deadline helpers")
+
+def test_expired_deadline_fails_fast():
+    """No provider is called once the deadline has passed"""
+    calls = []
+    registry = _registry(primary_delay=0, calls=calls)
+
+    async def run():
+        with deadline_scope(time.time() - 0.1):
+            return await registry.execute_with_fallback(ServiceType.LLM, "generate_response", prompt="hi")
+
+    result = asyncio.run(run())
+    assert not result["success"] and "deadline" in result["error"]
+    assert calls == []
+    print("✅ Expired deadline fails fast")
+
+def test_timeout_shrinks_to_budget():
+    """A slow call is cut off at the deadline without counting against the provider"""
+    calls = []
+    registry = _registry(primary_delay=2.0, calls=calls)
+
+    async def run():
+        start = time.monotonic()
+        with deadline_scope(deadline_from_budget(200)):
+            result = await registry.execute_with_fallback(ServiceType.LLM, "generate_response", prompt="hi")
+        return result, time.monotonic() - start
+
+    result, elapsed = asyncio.run(run())
+    assert not result["success"] and "deadline" in result["error"]
+    assert elapsed < 1.0
+    assert calls == ["primary"]  # No point starting the backup with no time left
+    assert registry.circuit_breakers.get("primary", "llama-3.1-8b-instant").snapshot()["failure_rate"] == 0
+    assert registry.get_metrics()["deadlines"]["expired"] == 1
+    print("✅ Timeout shrinks to remaining budget")
+
+def test_slow_fallback_skipped():
+    """A fallback whose usual latency exceeds the remaining budget is not attempted"""
+    calls = []
+    registry = _registry(primary_delay=0, calls=calls)
+    registry.providers["primary"]._http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(500))
+    )
+    # The backup normally takes ~5s, far beyond a 1s budget
+    for _ in range(20):
+        registry.latency_tracker.record("backup", "llama-3.1-8b-instant", "generate_response", 5.0)
+
+    async def run():
+        with deadline_scope(deadline_from_budget(1000)):
+            return await registry.execute_with_fallback(ServiceType.LLM, "generate_response", prompt="hi")
+
+    result = asyncio.run(run())
+    assert not result["success"] and "cannot finish" in result["error"]
+    assert calls == []
+    assert registry.get_metrics()["deadlines"]["fallbacks_skipped"] == 1
+    print("✅ Slow fallback skipped")
+
+if __name__ == "__main__":
+    test_deadline_helpers()
+    test_expired_deadline_fails_fast()
+    test_timeout_shrinks_to_budget()
+    test_slow_fallback_skipped()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Graph shapes test - AuraGraph compiles one graph per input shape (text or
+voice, with or without a screenshot) and each request only walks the nodes
+its shape can use
+Node work is stubbed, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nodes
+from ai_services import tts_service
+from aura_graph import AuraGraph
+from utils.prepared_inputs import prepared_screenshots
+
+NODE_NAMES = ("stt", "intent", "ui_check", "vlm", "action_planner", "tts")
+
+def _stub_nodes(visited):
+    """Replace each node's run with a recorder; the UI tree never has the target, so the screen is needed"""
+    def recorder(name, delta):
+        async def run(state, synthesize=True):
+            visited.append(name if synthesize else f"{name} (text only)")
+            return {**delta, "node_execution_times": {name: 0.0}}
+        return run
+
+    deltas = {
+        "stt": {"transcript": "open wifi settings"},
+        "intent": {"intent": "open wifi settings", "intent_data": {"requires_screen_analysis": True}},
+        "ui_check": {"use_vlm": True},
+        "vlm": {"ui_element_coords": {"x": 10, "y": 20}},
+        "action_planner": {"action_plan": [{"type": "tap"}]},
+        "tts": {"response_text": "Opening wifi settings", "complete": True},
+    }
+    for name in NODE_NAMES:
+        getattr(nodes, f"{name}_node").run = recorder(name, deltas[name])
+
+def _restore_nodes():
+    for name in NODE_NAMES:
+        del getattr(nodes, f"{name}_node").run
+
+def _with_stubbed_graph(test):
+    visited = []
+    _stub_nodes(visited)
+    try:
+        aura = AuraGraph()
+        aura.fast_path_enabled = False
+        return test(aura, visited)
+    finally:
+        _restore_nodes()
+
+def test_input_shape_selection():
+    """Audio and screenshot presence pick the graph; a screenshot still being prepared counts"""
+    assert AuraGraph._input_shape({"transcript": "hi"}) == "text"
+    assert AuraGraph._input_shape({"audio_blob": "blob:sha256:ab"}) == "voice"
+    assert AuraGraph._input_shape({"audio_blob": "blob:sha256:ab", "screenshot_blob": "blob:sha256:cd"}) == "voice_screen"
+
+    async def run():
+        prepared_screenshots.start("shape-req", asyncio.sleep(0, result={"bytes": b"img"}))
+        try:
+            return AuraGraph._input_shape({"transcript": "hi", "request_id": "shape-req"})
+        finally:
+            prepared_screenshots.release("shape-req")
+
+    assert asyncio.run(run()) == "text_screen"
+    print("✅ Input shape selection")
+
+def test_each_shape_walks_only_its_nodes():
+    """Text skips STT, no screenshot skips the VLM (planning from the intent instead of failing)"""
+    def run(aura, visited):
+        paths = {}
+        for shape, state in (
+            ("text", {"transcript": "open wifi settings"}),
+            ("voice", {"_audio_bytes": b"audio"}),
+            ("voice_screen", {"_audio_bytes": b"audio", "_screenshot_bytes": b"img"}),
+        ):
+            visited.clear()
+            result = asyncio.run(aura.process(state, f"{shape}-session"))
+            assert not result.get("error") and result["response_text"] == "Opening wifi settings"
+            paths[shape] = list(visited)
+        return paths, aura.get_graph_info()["shapes"]
+
+    paths, shapes = _with_stubbed_graph(run)
+    assert paths["text"] == ["intent", "ui_check", "action_planner", "tts (text only)"]
+    assert paths["voice"] == ["stt", "intent", "ui_check", "action_planner", "tts"]
+    assert paths["voice_screen"] == ["stt", "intent", "ui_check", "vlm", "action_planner", "tts"]
+    assert "vlm" not in shapes["text"]["nodes"] and "stt" not in shapes["text_screen"]["nodes"]
+    assert shapes["text"]["entry_point"] == shapes["text_screen"]["entry_point"] == "intent_analysis"
+    assert shapes["voice"]["entry_point"] == shapes["voice_screen"]["entry_point"] == "stt"
+    assert shapes["text"]["runs"] == shapes["voice"]["runs"] == shapes["voice_screen"]["runs"] == 1
+    print("✅ Each shape walks only its nodes")
+
+def test_shapes_share_the_session_thread():
+    """Switching shapes mid-session continues the same checkpoint thread"""
+    def run(aura, visited):
+        asyncio.run(aura.process({"transcript": "open wifi settings", "ui_tree": "<node/>"}, "mixed-session"))
+        asyncio.run(aura.process({"_audio_bytes": b"audio", "_screenshot_bytes": b"img"}, "mixed-session"))
+        config = {"configurable": {"thread_id": aura._graph_thread_id("mixed-session")}}
+        return aura.graphs["text"].get_state(config).values, list(visited)
+
+    values, visited = _with_stubbed_graph(run)
+    assert visited.count("tts (text only)") == 1 and visited.count("tts") == 1 and visited.count("vlm") == 1
+    assert values["ui_element_coords"] == {"x": 10, "y": 20}  # written by the voice+screen turn
+    assert values.get("ui_tree") is None  # the text turn's input was reset by the next turn
+    print("✅ Shapes share the session thread")
+
+def test_text_turn_skips_speech_synthesis():
+    """The text shape's TTS step only builds the response text; /chat never returns audio"""
+    async def no_speech(*args, **kwargs):
+        raise AssertionError("text turns must not synthesize speech")
+
+    tts_service.generate_speech = no_speech
+    try:
+        state = {"intent": "go home", "action_plan": [{"type": "speak", "text": "Going home"}]}
+        result = asyncio.run(nodes.tts_node.run(state, synthesize=False))
+    finally:
+        del tts_service.generate_speech
+    assert result["response_text"] == "Going home" and result["tts_audio_available"] is False
+    assert "error" not in result
+    print("✅ Text turn skips speech synthesis")
+
+if __name__ == "__main__":
+    test_input_shape_selection()
+    test_each_shape_walks_only_its_nodes()
+    test_shapes_share_the_session_thread()
+    test_text_turn_skips_speech_synthesis()
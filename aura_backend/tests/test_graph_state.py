@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Graph state test - nodes return deltas, the timing reducer merges them and a
+new turn on the same session starts from a clean state
+Uses a small graph over AuraState, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph, END
+
+from graph_state import AuraState, merge_timings, new_turn
+
+def _graph(fail_on=None):
+    """stt -> intent_analysis over AuraState; the intent node errors for `fail_on`"""
+    async def stt(state):
+        return {"node_execution_times": {"stt": 0.1}}
+
+    async def intent(state):
+        if state["transcript"] == fail_on:
+            return {"error": "Intent analysis failed", "node_execution_times": {"intent": 0.2}}
+        return {"intent": state["transcript"], "node_execution_times": {"intent": 0.2}}
+
+    workflow = StateGraph(AuraState)
+    workflow.add_node("stt", stt)
+    workflow.add_node("intent_analysis", intent)
+    workflow.set_entry_point("stt")
+    workflow.add_edge("stt", "intent_analysis")
+    workflow.add_edge("intent_analysis", END)
+    return workflow.compile(checkpointer=MemorySaver())
+
+def test_merge_timings():
+    """Timings from each node accumulate; None resets them"""
+    assert merge_timings(None, {"stt": 0.1}) == {"stt": 0.1}
+    assert merge_timings({"stt": 0.1}, {"intent": 0.2}) == {"stt": 0.1, "intent": 0.2}
+    assert merge_timings({"stt": 0.1}, None) == {}
+    print("✅ Timing reducer")
+
+def test_delta_nodes_keep_inputs():
+    """Keys a node doesn't return are kept, timings from both nodes are merged"""
+    graph = _graph()
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    result = asyncio.run(graph.ainvoke(new_turn({"transcript": "open settings", "session_id": "s"}), config=config))
+    assert result["session_id"] == "s" and result["intent"] == "open settings"
+    assert result["node_execution_times"] == {"stt": 0.1, "intent": 0.2}
+    print("✅ Delta nodes keep inputs")
+
+def test_new_turn_clears_previous_turn():
+    """An error and timings from the last turn on a session don't leak into the next one"""
+    graph = _graph(fail_on="bad")
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+    async def run():
+        first = await graph.ainvoke(new_turn({"transcript": "bad"}), config=config)
+        second = await graph.ainvoke(new_turn({"transcript": "go home"}), config=config)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["error"] and first["intent"] is None
+    assert second["error"] is None and second["intent"] == "go home"
+    assert second["node_execution_times"] == {"stt": 0.1, "intent": 0.2}
+    print("✅ New turn clears previous turn")
+
+if __name__ == "__main__":
+    test_merge_timings()
+    test_delta_nodes_keep_inputs()
+    test_new_turn_clears_previous_turn()
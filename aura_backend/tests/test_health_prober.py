@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Health prober test - concurrent background probes, cached status and
+routing around providers that fail their probes
+Uses Groq providers backed by httpx.MockTransport, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from providers.base import ProviderConfig
+from providers.groq_provider import GroqProvider
+from providers.health_prober import HealthProber
+from providers.provider_registry import ProviderRegistry, ServiceConfig, ServiceType
+
+def _mock_provider(name, probes, health=None, probe_delay=0.0):
+    """Groq provider with a mock /models health endpoint (status from health["code"]) and chat endpoint"""
+    health = health if health is not None else {"code": 200}
+
+    async def handler(request):
+        if request.url.path.endswith("/models"):
+            probes.append(name)
+            await asyncio.sleep(probe_delay)
+            return httpx.Response(health["code"], json={"data": []})
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"from {name}"}}]})
+
+    provider = GroqProvider(ProviderConfig(
+        name=name, api_key="test", base_url="http://mock", max_retries=0,
+        default_models={"llm": "llama-3.1-8b-instant"}
+    ))
+    provider._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return provider
+
+def test_probes_run_concurrently():
+    """All providers are probed in parallel, not one after another"""
+    probes = []
+    providers = {name: _mock_provider(name, probes, probe_delay=0.2) for name in ("a", "b", "c")}
+    prober = HealthProber(lambda: providers)
+
+    async def run():
+        start = time.monotonic()
+        snapshot = await prober.probe_once()
+        return snapshot, time.monotonic() - start
+
+    snapshot, elapsed = asyncio.run(run())
+    assert elapsed < 0.5
+    assert sorted(probes) == ["a", "b", "c"]
+    assert all(status["status"] == "healthy" for status in snapshot.values())
+    assert all(provider.is_available() for provider in providers.values())
+    print("✅ Probes run concurrently")
+
+def test_failed_probes_mark_provider_down():
+    """A provider is marked down after consecutive failed probes and recovers on success"""
+    probes = []
+    health = {"code": 503}
+    provider = _mock_provider("flaky", probes, health=health)
+    prober = HealthProber(lambda: {"flaky": provider}, failure_threshold=2)
+
+    asyncio.run(prober.probe_once())
+    assert provider.is_available()  # One failure is not enough
+    asyncio.run(prober.probe_once())
+    assert not provider.is_available() and provider.is_configured()
+
+    health["code"] = 200
+    asyncio.run(prober.probe_once())
+    assert provider.is_available()
+    print("✅ Failed probes mark provider down")
+
+def test_unhealthy_provider_tried_last():
+    """Routing prefers healthy providers but keeps unhealthy ones as a last resort"""
+    probes = []
+    registry = ProviderRegistry()
+    registry.providers = {"primary": _mock_provider("primary", probes), "backup": _mock_provider("backup", probes)}
+    registry.service_configs[ServiceType.LLM] = ServiceConfig(
+        service_type=ServiceType.LLM, default_provider="primary", fallback_providers=["backup"]
+    )
+    registry.providers["primary"].healthy = False
+
+    result = asyncio.run(registry.execute_with_fallback(ServiceType.LLM, "generate_response", prompt="hi"))
+    assert result["provider_used"] == "backup"
+
+    registry.providers["backup"].healthy = False
+    result = asyncio.run(registry.execute_with_fallback(ServiceType.LLM, "generate_response", prompt="hello"))
+    assert result["success"] and result["provider_used"] == "primary"
+    print("✅ Unhealthy provider tried last")
+
+def test_health_endpoint_serves_cache():
+    """health_check() probes once, then answers from the cache until refresh is requested"""
+    probes = []
+    registry = ProviderRegistry()
+    registry.providers = {"groq": _mock_provider("groq", probes)}
+
+    async def run():
+        first = await registry.health_check()
+        await registry.health_check()
+        await registry.health_check(refresh=True)
+        return first
+
+    first = asyncio.run(run())
+    assert first["providers"]["groq"]["status"] == "healthy"
+    assert "connection_pool" in first["providers"]["groq"]
+    assert probes == ["groq", "groq"]
+    print("✅ Health endpoint serves cache")
+
+if __name__ == "__main__":
+    test_probes_run_concurrently()
+    test_failed_probes_mark_provider_down()
+    test_unhealthy_provider_tried_last()
+    test_health_endpoint_serves_cache()
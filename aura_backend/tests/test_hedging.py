@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Hedged request test - a slow primary is raced against the next fallback
+Uses Groq providers backed by httpx.MockTransport, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from providers.base import ProviderConfig
+from providers.groq_provider import GroqProvider
+from providers.latency_tracker import LatencyTracker
+from providers.provider_registry import ProviderRegistry, ServiceConfig, ServiceType
+
+def _mock_provider(name, delay):
+    """Groq provider whose chat endpoint answers after `delay` seconds"""
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"from {name}"}}]})
+
+    provider = GroqProvider(ProviderConfig(
+        name=name, api_key="test", base_url="http://mock", max_retries=0,
+        default_models={"llm": "llama-3.1-8b-instant"}
+    ))
+    provider._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return provider
+
+def _hedging_registry(primary_delay):
+    registry = ProviderRegistry()
+    registry.providers = {"primary": _mock_provider("primary", primary_delay), "backup": _mock_provider("backup", 0)}
+    registry.service_configs[ServiceType.LLM] = ServiceConfig(
+        service_type=ServiceType.LLM, default_provider="primary", fallback_providers=["backup"],
+        hedge_enabled=True, hedge_min_delay=0.05
+    )
+    # Pretend the primary normally answers in ~10ms
+    for _ in range(20):
+        registry.latency_tracker.record("primary", "llama-3.1-8b-instant", "generate_response", 0.01)
+    return registry
+
+def test_latency_percentile():
+    """Percentiles need min_samples before they are reported"""
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record("groq", "m", "generate_response", 0.1)
+    assert tracker.percentile("groq", "m", "generate_response", 0.95) is None
+    tracker.record("groq", "m", "generate_response", 0.2)
+    tracker.record("groq", "m", "generate_response", 0.9)
+    assert tracker.percentile("groq", "m", "generate_response", 0.5) == 0.2
+    assert tracker.percentile("groq", "m", "generate_response", 0.99) == 0.9
+    print("✅ Latency percentiles")
+
+def test_hedge_wins_over_slow_primary():
+    """The hedge answers first and the slow primary is cancelled"""
+    registry = _hedging_registry(primary_delay=2.0)
+
+    async def run():
+        start = time.monotonic()
+        result = await registry.execute_with_fallback(ServiceType.LLM, "generate_response", prompt="hi")
+        return result, time.monotonic() - start
+
+    result, elapsed = asyncio.run(run())
+    assert result["success"] and result["hedged"]
+    assert result["provider_used"] == "backup"
+    assert elapsed < 1.0
+    stats = registry.get_metrics()["hedging"]["llm"]
+    assert stats["hedges_fired"] == 1 and stats["hedge_wins"] == 1
+    print("✅ Hedge won over slow primary")
+
+def test_fast_primary_not_hedged():
+    """A primary answering within its usual latency never fires a hedge"""
+    registry = _hedging_registry(primary_delay=0)
+    result = asyncio.run(registry.execute_with_fallback(ServiceType.LLM, "generate_response", prompt="hi"))
+    assert result["provider_used"] == "primary"
+    assert "hedged" not in result
+    assert registry.get_metrics()["hedging"]["llm"]["hedges_fired"] == 0
+    print("✅ Fast primary not hedged")
+
+if __name__ == "__main__":
+    test_latency_percentile()
+    test_hedge_wins_over_slow_primary()
+    test_fast_primary_not_hedged()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Async job test - /process?mode=async runs the graph as a background job:
+partial results appear as nodes finish, workers are bounded, finished jobs
+are retained for polling up to a limit and a callback URL is notified
+Node work is stubbed, no API keys needed
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+import nodes
+from aura_graph import AuraGraph
+from utils.jobs import JobStore, JobStoreFullError
+
+NODE_DELAYS = {"stt": 0.05, "intent": 0.05, "ui_check": 0.0, "action_planner": 0.0, "tts": 0.2}
+
+def _stub_nodes():
+    def recorder(name, delta):
+        async def run(state, synthesize=True):
+            await asyncio.sleep(NODE_DELAYS.get(name, 0.0))
+            return {**delta, "node_execution_times": {name: 0.0}}
+        return run
+
+    deltas = {
+        "stt": {"transcript": "open wifi settings"},
+        "intent": {"intent": "open wifi settings", "intent_data": {"requires_screen_analysis": True}},
+        "ui_check": {"use_vlm": True},
+        "vlm": {},
+        "action_planner": {"action_plan": [{"type": "tap"}]},
+        "tts": {"response_text": "Opening wifi settings", "complete": True},
+    }
+    for name, delta in deltas.items():
+        getattr(nodes, f"{name}_node").run = recorder(name, delta)
+
+def _restore_nodes():
+    for name in ("stt", "intent", "ui_check", "vlm", "action_planner", "tts"):
+        del getattr(nodes, f"{name}_node").run
+
+def test_partial_results_while_running():
+    """Transcript, intent and plan are visible before the job completes; the final state is the result"""
+    _stub_nodes()
+    try:
+        aura = AuraGraph()
+        aura.fast_path_enabled = False
+    finally:
+        _restore_nodes()
+    jobs = JobStore()
+
+    async def run():
+        async def work(job):
+            result = await aura.process({"_audio_bytes": b"audio"}, "job-session", on_update=job.update)
+            return {"response_text": result["response_text"]}
+
+        job = jobs.submit(work, session_id="job-session")
+        await asyncio.sleep(0.15)  # STT and intent done, TTS still running
+        during = job.view()
+        await job.task
+        return during, job.view()
+
+    during, done = asyncio.run(run())
+    assert during["status"] == "running" and during["result"] is None
+    assert during["partial"]["transcript"] == "open wifi settings"
+    assert during["partial"]["action_plan"] == [{"type": "tap"}]
+    assert "response_text" not in during["partial"]
+    assert done["status"] == "completed" and done["result"] == {"response_text": "Opening wifi settings"}
+    assert done["finished_at"] >= done["started_at"] >= done["created_at"]
+    print("✅ Partial results while running")
+
+def test_bounded_workers_and_retention():
+    """At most max_concurrency jobs run at once; finished jobs make room for new ones, unfinished ones don't"""
+    jobs = JobStore(max_jobs=4, max_concurrency=2)
+    running, peak = [0], [0]
+
+    async def work(job):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.05)
+        running[0] -= 1
+        return {"ok": True}
+
+    async def failing(job):
+        raise RuntimeError("provider down")
+
+    async def run():
+        batch = [jobs.submit(work) for _ in range(4)]
+        try:
+            jobs.submit(work)
+            assert False, "expected the store to be full"
+        except JobStoreFullError:
+            pass
+        await asyncio.gather(*(job.task for job in batch))
+        failed = jobs.submit(failing)  # Evicts the oldest finished job
+        await failed.task
+        return batch, failed
+
+    batch, failed = asyncio.run(run())
+    assert peak[0] == 2
+    assert jobs.get(batch[0].job_id) is None and jobs.get(batch[3].job_id).status == "completed"
+    assert failed.status == "failed" and failed.error == "provider down"
+    snapshot = jobs.snapshot()
+    assert snapshot["rejected"] == 1 and snapshot["expired"] == 1 and snapshot["completed"] == 4
+    print(f"✅ Bounded workers (peak {peak[0]}) and retention")
+
+def test_callback_notified_on_completion():
+    """The finished job is POSTed to its callback URL; disallowed URLs are rejected up front"""
+    received = []
+
+    def callback(request):
+        received.append((str(request.url), json.loads(request.content)))
+        return httpx.Response(204)
+
+    jobs = JobStore(callback_hosts=["hooks.example.com"], callback_transport=httpx.MockTransport(callback))
+
+    async def work(job):
+        job.update({"intent": "go home"})
+        return {"response_text": "Going home"}
+
+    async def run():
+        job = jobs.submit(work, callback_url="https://hooks.example.com/aura")
+        await job.task
+        for bad_url in ("ftp://hooks.example.com/aura", "http://169.254.169.254/latest"):
+            try:
+                jobs.submit(work, callback_url=bad_url)
+                assert False, f"expected {bad_url} to be rejected"
+            except ValueError:
+                pass
+        return job
+
+    job = asyncio.run(run())
+    assert job.callback_status == "delivered"
+    url, payload = received[0]
+    assert url == "https://hooks.example.com/aura" and len(received) == 1
+    assert payload["job_id"] == job.job_id and payload["status"] == "completed"
+    assert payload["partial"] == {"intent": "go home"} and payload["result"] == {"response_text": "Going home"}
+    print("✅ Callback notified on completion")
+
+def test_callbacks_disabled_by_default():
+    """Without JOB_CALLBACK_HOSTS no callback URL is accepted, so loopback and metadata addresses can't be hit"""
+    jobs = JobStore()
+
+    async def work(job):
+        return {}
+
+    async def run():
+        for url in ("http://127.0.0.1/hook", "http://169.254.169.254/latest", "https://hooks.example.com/aura"):
+            try:
+                jobs.submit(work, callback_url=url)
+                assert False, f"expected {url} to be rejected"
+            except ValueError:
+                pass
+        job = jobs.submit(work)
+        await job.task
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "completed" and job.callback_url is None
+    assert jobs.snapshot()["submitted"] == 1
+    print("✅ Callbacks disabled by default")
+
+if __name__ == "__main__":
+    test_partial_results_while_running()
+    test_bounded_workers_and_retention()
+    test_callback_notified_on_completion()
+    test_callbacks_disabled_by_default()
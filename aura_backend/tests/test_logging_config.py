@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Logging test - records are written by a background thread, payloads are
+only rendered for emitted records, hot loggers are sampled and JSON output
+carries extra fields
+No API keys needed
+"""
+
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logging_config import (
+    configure_logging, shutdown_logging, get_logging_stats, lazy, lazy_json, parse_sample_rates
+)
+
+class _SlowStream(io.StringIO):
+    """Stream that takes 5ms per write, like a congested pipe"""
+
+    def write(self, text):
+        time.sleep(0.005)
+        return super().write(text)
+
+def _with_logging(test, **options):
+    """Run `test(stream)` with only our handler on the root logger, restoring the previous setup afterwards"""
+    root = logging.getLogger()
+    root_level, root_handlers = root.level, list(root.handlers)
+    for handler in root_handlers:
+        root.removeHandler(handler)
+    stream = options.pop("stream", None) or io.StringIO()
+    configure_logging(stream=stream, **options)
+    try:
+        return test(stream)
+    finally:
+        shutdown_logging()
+        root.setLevel(root_level)
+        for handler in root_handlers:
+            root.addHandler(handler)
+
+def test_writes_happen_off_the_calling_thread():
+    """Logging to a slow stream doesn't slow down the caller; every record arrives after shutdown"""
+    def run(stream):
+        logger = logging.getLogger("aura_test.async")
+        start = time.perf_counter()
+        for index in range(50):
+            logger.info("turn %d", index)
+        elapsed = time.perf_counter() - start
+        shutdown_logging()
+        return elapsed, stream.getvalue()
+
+    elapsed, output = _with_logging(run, level="INFO", async_logging=True, stream=_SlowStream())
+    assert elapsed < 0.05  # Writing synchronously would take 0.25s
+    assert output.count("turn ") == 50 and "turn 49" in output
+    print(f"✅ Writes off the calling thread ({elapsed * 1000:.1f}ms for 50 records)")
+
+def test_payloads_rendered_only_when_emitted():
+    """lazy payloads are skipped below the level and for sampled-out records"""
+    renders = []
+
+    def render(value):
+        renders.append(value)
+        return value
+
+    def run(stream):
+        logging.getLogger("aura_test.hot").debug("state: %s", lazy(render, "below level"))
+        logging.getLogger("aura_test.hot").info("kept: %s", lazy(render, "emitted"))
+        shutdown_logging()
+        return stream.getvalue()
+
+    output = _with_logging(run, level="INFO", async_logging=True)
+    assert renders == ["emitted"] and "kept: emitted" in output
+
+    renders.clear()
+    sampled = lambda stream: [logging.getLogger("aura_test.hot.node").debug("plan %s", lazy(render, i)) for i in range(200)]
+    _with_logging(sampled, level="DEBUG", sample_rates={"aura_test.hot": 0.0})
+    assert renders == []
+    print("✅ Payloads rendered only when emitted")
+
+def test_sampling_and_json_output():
+    """Sampled loggers keep a fraction of debug records; JSON lines carry extra fields and tracebacks"""
+    def run(stream):
+        hot = logging.getLogger("providers.test")
+        for _ in range(1000):
+            hot.debug("retrying")
+        hot.warning("circuit open", extra={"provider": "groq"})
+        try:
+            raise ValueError("bad response")
+        except ValueError:
+            logging.getLogger("aura_test.json").exception("parse failed")
+        logging.getLogger("aura_test.json").info("state %s", lazy_json({"intent": "open", "ui_tree": "<big/>"}, exclude=("ui_tree",)))
+        dropped = get_logging_stats()["dropped_sampled"]
+        shutdown_logging()
+        return dropped, [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    dropped, records = _with_logging(run, level="DEBUG", json_format=True, sample_rates=parse_sample_rates("providers=0.1"))
+    kept = sum(1 for record in records if record["msg"] == "retrying")
+    assert 50 < kept < 200 and dropped == 1000 - kept
+    warning = next(record for record in records if record["msg"] == "circuit open")
+    assert warning["level"] == "WARNING" and warning["provider"] == "groq"
+    error = next(record for record in records if record["msg"] == "parse failed")
+    assert "ValueError: bad response" in error["exc"]
+    assert any(record["msg"] == 'state {"intent": "open"}' for record in records)
+    print(f"✅ Sampling ({kept}/1000 kept) and JSON output")
+
+if __name__ == "__main__":
+    test_writes_happen_off_the_calling_thread()
+    test_payloads_rendered_only_when_emitted()
+    test_sampling_and_json_output()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Prepared inputs test - screenshot preprocessing runs in the background and
+overlaps with STT; nodes await the prepared result by request id
+No API keys needed
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from utils.image_utils import validate_image_header
+from utils.prepared_inputs import PreparedInputs, prepare_screenshot, load_screenshot, prepared_screenshots
+
+def _png(size=(2400, 1600)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (30, 120, 200)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def test_prepare_screenshot():
+    """Valid screenshots are optimized, invalid ones report an error instead of raising"""
+    prepared = asyncio.run(prepare_screenshot(_png()))
+    assert prepared["bytes"] and prepared["info"]["size"][0] <= 1920
+    assert asyncio.run(prepare_screenshot(b"not an image")) == {"error": "Invalid image format"}
+    print("✅ Screenshot preparation")
+
+def test_header_check_rejects_non_images_up_front():
+    """The synchronous check in /process rejects non-images cheaply, without decoding pixels"""
+    png = _png()
+    start = time.perf_counter()
+    assert validate_image_header(png)
+    header_time = time.perf_counter() - start
+    assert not validate_image_header(b"not an image")
+    assert not validate_image_header(b"")
+
+    start = time.perf_counter()
+    asyncio.run(prepare_screenshot(png))
+    assert header_time < (time.perf_counter() - start) / 10
+    print(f"✅ Header check ({header_time * 1000:.2f}ms)")
+
+def test_preparation_overlaps_stt():
+    """Image work started with the request is done by the time STT finishes"""
+    async def slow_prepare():
+        await asyncio.sleep(0.2)
+        return {"bytes": b"optimized"}
+
+    async def run():
+        start = time.monotonic()
+        prepared_screenshots.start("overlap", slow_prepare())
+        await asyncio.sleep(0.2)  # STT
+        screenshot = await load_screenshot({"request_id": "overlap"})
+        prepared_screenshots.release("overlap")
+        return screenshot, time.monotonic() - start
+
+    screenshot, elapsed = asyncio.run(run())
+    assert screenshot == {"bytes": b"optimized"}
+    assert elapsed < 0.35  # Sequentially this would be 0.4s
+    assert not prepared_screenshots.has("overlap")
+    print(f"✅ Preparation overlapped STT ({elapsed:.2f}s)")
+
+def test_cancelled_consumer_keeps_shared_task():
+    """Cancelling one waiter (e.g. speculative VLM) leaves the preparation for the others"""
+    inputs = PreparedInputs("test")
+
+    async def run():
+        inputs.start("req", asyncio.sleep(0.1, result={"bytes": b"img"}))
+        waiter = asyncio.create_task(inputs.get("req"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        return await inputs.get("req")
+
+    assert asyncio.run(run()) == {"bytes": b"img"}
+    assert asyncio.run(load_screenshot({})) == {"error": "No screenshot data available for VLM analysis"}
+    print("✅ Cancelled consumer keeps shared task")
+
+if __name__ == "__main__":
+    test_prepare_screenshot()
+    test_header_check_rejects_non_images_up_front()
+    test_preparation_overlaps_stt()
+    test_cancelled_consumer_keeps_shared_task()
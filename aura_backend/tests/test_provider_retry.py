@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Retry engine test - backoff, Retry-After parsing and retry budget
+Runs against httpx.MockTransport, no API keys or server needed
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from providers.retry import RetryPolicy, RetryBudget, parse_retry_after, send_with_retry
+
+def _scripted_sender(responses):
+    """Build a send() callable that replays the given status codes"""
+    calls = []
+    client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: responses[min(len(calls), len(responses) - 1)]
+    ))
+
+    async def send():
+        response = await client.get("http://mock/")
+        calls.append(response.status_code)
+        return response
+
+    return send, calls
+
+def test_parse_retry_after():
+    """Retry-After accepts delta-seconds and HTTP dates"""
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("0.5") == 0.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # In the past
+    assert parse_retry_after("soon") is None
+    print("✅ Retry-After parsing")
+
+def test_retries_transient_errors():
+    """429/503 responses are retried until success"""
+    send, calls = _scripted_sender([
+        httpx.Response(429, headers={"retry-after": "0"}),
+        httpx.Response(503),
+        httpx.Response(200)
+    ])
+    policy = RetryPolicy(max_retries=3, base_delay=0.001, max_delay=0.01)
+    response = asyncio.run(send_with_retry(send, policy, RetryBudget()))
+    assert response.status_code == 200
+    assert calls == [429, 503, 200]
+    print("✅ Transient errors retried")
+
+def test_long_retry_after_not_retried():
+    """A Retry-After longer than max_delay returns immediately for fallback"""
+    send, calls = _scripted_sender([httpx.Response(429, headers={"retry-after": "30"})])
+    policy = RetryPolicy(max_retries=3, base_delay=0.001, max_delay=1.0)
+    response = asyncio.run(send_with_retry(send, policy, RetryBudget()))
+    assert response.status_code == 429
+    assert calls == [429]
+    print("✅ Long Retry-After skipped")
+
+def test_retry_budget_caps_retries():
+    """The budget denies retries once the window allowance is used"""
+    budget = RetryBudget(ratio=0.1, min_retries=1)
+    send, calls = _scripted_sender([httpx.Response(500)])
+    policy = RetryPolicy(max_retries=5, base_delay=0.001, max_delay=0.01)
+    response = asyncio.run(send_with_retry(send, policy, budget))
+    assert response.status_code == 500
+    assert len(calls) == 2  # Original request + the single budgeted retry
+    assert budget.denied_retries == 1
+    print("✅ Retry budget enforced")
+
+if __name__ == "__main__":
+    test_parse_retry_after()
+    test_retries_transient_errors()
+    test_long_retry_after_not_retried()
+    test_retry_budget_caps_retries()
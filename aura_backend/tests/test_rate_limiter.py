@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Rate limiter test - token bucket queueing and early failover
+No API keys or network needed
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from providers.rate_limiter import RateLimiter, estimate_tokens
+
+def test_requests_queue_within_budget():
+    """Requests over the burst wait for refill instead of failing"""
+    limiter = RateLimiter()
+
+    async def run():
+        start = time.monotonic()
+        results = [
+            await limiter.acquire("groq", "key", "m", requests_per_minute=600, max_wait=1.0)
+            for _ in range(601)
+        ]
+        return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(run())
+    assert all(results)
+    assert 0.05 <= elapsed < 0.5  # 601st request waits ~0.1s for one token at 10/s
+    assert limiter.snapshot()["groq/" + RateLimiter.key_fingerprint("key") + "/m"]["waited"] == 1
+    print("✅ Requests queued within budget")
+
+def test_predicted_wait_over_budget_rejected():
+    """A token-heavy request is rejected up front when the wait would exceed the budget"""
+    limiter = RateLimiter()
+
+    async def run():
+        first = await limiter.acquire("groq", "key", "m", tokens_per_minute=600, tokens=600, max_wait=0.5)
+        second = await limiter.acquire("groq", "key", "m", tokens_per_minute=600, tokens=300, max_wait=0.5)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first and not second
+    print("✅ Over-budget wait rejected")
+
+def test_keys_have_separate_buckets():
+    """Different API keys do not share capacity"""
+    limiter = RateLimiter()
+
+    async def run():
+        a = await limiter.acquire("groq", "key-a", "m", requests_per_minute=1, max_wait=0)
+        b = await limiter.acquire("groq", "key-b", "m", requests_per_minute=1, max_wait=0)
+        a_again = await limiter.acquire("groq", "key-a", "m", requests_per_minute=1, max_wait=0)
+        return a, b, a_again
+
+    assert asyncio.run(run()) == (True, True, False)
+    print("✅ Per-key buckets")
+
+def test_estimate_tokens():
+    """Prompt characters and completion cap both count"""
+    assert estimate_tokens({"prompt": "x" * 400, "max_tokens": 100}) == 200
+    assert estimate_tokens({"messages": [{"role": "user", "content": "x" * 40}]}) == 10
+    print("✅ Token estimate")
+
+if __name__ == "__main__":
+    test_requests_queue_within_budget()
+    test_predicted_wait_over_budget_rejected()
+    test_keys_have_separate_buckets()
+    test_estimate_tokens()
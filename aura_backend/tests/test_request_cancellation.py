@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Request cancellation test - a graph run is cancelled, down to its in-flight
+provider HTTP call, when the client disconnects or a newer request for the
+same session supersedes it
+No API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from aura_graph import AuraGraph
+from utils.blob_store import blob_store
+from utils.request_tasks import SessionRequests, RequestCancelled
+
+class _ProviderCallGraph:
+    """Stand-in compiled graph whose node waits on a slow provider HTTP call"""
+
+    def __init__(self, delay=5.0):
+        self.delay = delay
+        self.cancelled_calls = 0
+
+        async def slow_provider(request):
+            try:
+                await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                self.cancelled_calls += 1
+                raise
+            return httpx.Response(200, json={"text": "done"})
+
+        self.transport = httpx.MockTransport(slow_provider)
+
+    async def ainvoke(self, state, config=None):
+        async with httpx.AsyncClient(transport=self.transport) as client:
+            response = await client.post("https://provider.test/v1/chat/completions")
+        return {**state, "response_text": response.json()["text"]}
+
+def _graph(delay=5.0):
+    aura = AuraGraph()
+    aura.graph = _ProviderCallGraph(delay)
+    aura._graph_for = lambda state: aura.graph  # every input shape runs the stub
+    return aura
+
+def _disconnect_after(seconds):
+    """ASGI receive channel whose client goes away after a while"""
+    async def receive():
+        await asyncio.sleep(seconds)
+        return {"type": "http.disconnect"}
+    return receive
+
+def test_disconnect_cancels_provider_call():
+    """A client disconnect cancels the graph run and its HTTP call, and frees the request's media"""
+    aura = _graph()
+    requests = SessionRequests()
+    blobs_before = blob_store.snapshot()["blobs"]
+
+    async def run():
+        state = {"request_id": "gone", "_audio_bytes": b"\x00" * 1024, "session_id": "s1"}
+        start = time.monotonic()
+        try:
+            await requests.run("s1", aura.process(state, "s1"), receive=_disconnect_after(0.05))
+            assert False, "expected the run to be cancelled"
+        except RequestCancelled as e:
+            return e.reason, time.monotonic() - start
+
+    reason, elapsed = asyncio.run(run())
+    assert reason == "disconnected" and elapsed < 0.5
+    assert aura.graph.cancelled_calls == 1
+    assert blob_store.snapshot()["blobs"] == blobs_before
+    assert requests.snapshot() == {"preempt": False, "in_flight": 0, "completed": 0, "disconnected": 1, "superseded": 0}
+    print(f"✅ Disconnect cancelled the provider call after {elapsed * 1000:.0f}ms")
+
+def test_newer_request_supersedes_older():
+    """With pre-emption on, a second request for a session cancels the first; async jobs and other sessions are untouched"""
+    aura = _graph(delay=0.2)
+    requests = SessionRequests(preempt=True)
+
+    async def attempt(session_id, text, preemptible=True):
+        try:
+            result = await requests.run(session_id, aura.process({"transcript": text}, session_id),
+                                        preemptible=preemptible)
+            return result["response_text"]
+        except RequestCancelled as e:
+            return e.reason
+
+    async def run():
+        first = asyncio.create_task(attempt("s1", "open settings"))
+        other = asyncio.create_task(attempt("s2", "open camera"))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(attempt("s1", "no, open wifi"))
+        job = asyncio.create_task(attempt("s3", "open maps", preemptible=False))
+        await asyncio.sleep(0.05)
+        after_job = asyncio.create_task(attempt("s3", "open camera"))
+        return await asyncio.gather(first, other, second, job, after_job)
+
+    assert asyncio.run(run()) == ["superseded", "done", "done", "done", "done"]
+    assert aura.graph.cancelled_calls == 1
+    assert requests.snapshot()["superseded"] == 1 and requests.snapshot()["completed"] == 4
+    print("✅ Newer request superseded the older one")
+
+def test_preemption_off_by_default():
+    """By default concurrent requests for a session both finish (queued by the session lane); a finished run is never reported as cancelled"""
+    aura = _graph(delay=0.05)
+    requests = SessionRequests()
+
+    async def run():
+        work = [requests.run("s1", aura.process({"transcript": "hi there"}, "s1"), receive=_disconnect_after(1.0))
+                for _ in range(2)]
+        return await asyncio.gather(*work)
+
+    results = asyncio.run(run())
+    assert [result["response_text"] for result in results] == ["done", "done"]
+    assert aura.graph.cancelled_calls == 0 and requests.snapshot()["in_flight"] == 0
+    print("✅ Preemption disabled")
+
+if __name__ == "__main__":
+    test_disconnect_cancels_provider_call()
+    test_newer_request_supersedes_older()
+    test_preemption_off_by_default()
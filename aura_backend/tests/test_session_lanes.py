@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Session lanes test - turns on one session run one at a time, a newer turn
+drops an older one still queued, and other sessions are not held up
+No API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aura_graph import AuraGraph
+from utils.blob_store import blob_store
+from utils.jobs import JobStore
+from utils.request_tasks import RequestCancelled, SessionRequests
+from utils.session_lanes import SessionLanes
+
+class _SlowGraph:
+    """Stand-in compiled graph that tracks how many turns per session run at once"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.running = {}
+        self.peak = {}
+        self.ran = []
+
+    async def ainvoke(self, state, config=None):
+        thread = config["configurable"]["thread_id"]
+        self.running[thread] = self.running.get(thread, 0) + 1
+        self.peak[thread] = max(self.peak.get(thread, 0), self.running[thread])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running[thread] -= 1
+        self.ran.append(state["transcript"])
+        return {**state, "response_text": f"done: {state['transcript']}"}
+
+def _graph():
+    aura = AuraGraph()
+    aura.fast_path_enabled = False
+    aura.graph = _SlowGraph()
+    aura._graph_for = lambda state: aura.graph  # every input shape runs the stub
+    return aura
+
+async def _until_lane_has(aura, turns):
+    """Wait until this many turns have reached the session lane, so a burst arrives in order"""
+    for _ in range(500):
+        stats = aura.session_lanes.stats
+        if stats["immediate"] + stats["queued"] >= turns:
+            return
+        await asyncio.sleep(0.001)
+    raise AssertionError(f"{turns} turns never reached the lane")
+
+async def _attempt(aura, session_id, text, **inputs):
+    try:
+        result = await aura.process({"transcript": text, **inputs}, session_id)
+        return result["response_text"]
+    except RequestCancelled as e:
+        return e.reason
+
+def test_burst_runs_only_first_and_latest():
+    """A burst of four turns: the running one finishes, the two middle ones are dropped, the latest runs"""
+    aura = _graph()
+    blobs_before = blob_store.snapshot()["blobs"]
+
+    async def run():
+        tasks = []
+        for text in ("open settings", "open wifi", "no, bluetooth", "bluetooth settings"):
+            tasks.append(asyncio.create_task(_attempt(aura, "burst", text, _audio_bytes=text.encode())))
+            await _until_lane_has(aura, len(tasks))
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(run())
+    assert results == ["done: open settings", "superseded", "superseded", "done: bluetooth settings"]
+    assert aura.graph.ran == ["open settings", "bluetooth settings"]
+    assert max(aura.graph.peak.values()) == 1
+    assert blob_store.snapshot()["blobs"] == blobs_before
+    lanes = aura.session_lanes.snapshot()
+    assert lanes["superseded"] == 2 and lanes["active"] == 0 and lanes["waiting"] == 0
+    print("✅ Burst runs only the first and latest turns")
+
+def test_default_endpoint_path_keeps_the_running_turn():
+    """Through the endpoints' default SessionRequests (no pre-emption) a burst still runs the first and latest turns"""
+    aura = _graph()
+    requests = SessionRequests()
+
+    async def attempt(text):
+        try:
+            result = await requests.run("burst", aura.process({"transcript": text}, "burst"))
+            return result["response_text"]
+        except RequestCancelled as e:
+            return e.reason
+
+    async def run():
+        tasks = []
+        for text in ("open settings", "open wifi", "bluetooth settings"):
+            tasks.append(asyncio.create_task(attempt(text)))
+            await _until_lane_has(aura, len(tasks))
+        return await asyncio.gather(*tasks)
+
+    assert not requests.preempt
+    assert asyncio.run(run()) == ["done: open settings", "superseded", "done: bluetooth settings"]
+    assert max(aura.graph.peak.values()) == 1 and requests.snapshot()["superseded"] == 0
+    print("✅ Default endpoint path keeps the running turn")
+
+def test_queued_job_is_never_superseded():
+    """An async job queued behind a running turn keeps its place; newer turns queue behind it instead"""
+    aura = _graph()
+    jobs = JobStore()
+
+    async def job_work(job):
+        result = await aura.process({"transcript": "job"}, "mixed", preemptible=False)
+        return {"response_text": result["response_text"]}
+
+    async def run():
+        first = asyncio.create_task(_attempt(aura, "mixed", "sync-1"))
+        await _until_lane_has(aura, 1)
+        job = jobs.submit(job_work, session_id="mixed")
+        await _until_lane_has(aura, 2)
+        rest = []
+        for text in ("sync-2", "sync-3"):
+            rest.append(asyncio.create_task(_attempt(aura, "mixed", text)))
+            await _until_lane_has(aura, 2 + len(rest))
+        results = await asyncio.gather(first, *rest)
+        await job.task
+        return results, job
+
+    results, job = asyncio.run(run())
+    assert results == ["done: sync-1", "superseded", "done: sync-3"]
+    assert job.status == "completed" and job.result == {"response_text": "done: job"}
+    assert aura.graph.ran == ["sync-1", "job", "sync-3"]
+    assert max(aura.graph.peak.values()) == 1
+    lanes = aura.session_lanes.snapshot()
+    assert lanes["superseded"] == 1 and lanes["active"] == 0 and lanes["waiting"] == 0
+    print("✅ Queued job is never superseded")
+
+def test_sessions_do_not_wait_for_each_other():
+    """Turns on different sessions run concurrently"""
+    aura = _graph()
+
+    async def run():
+        start = time.monotonic()
+        results = await asyncio.gather(*(_attempt(aura, f"user-{n}", "open camera") for n in range(5)))
+        return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(run())
+    assert results == ["done: open camera"] * 5
+    assert elapsed < 0.3  # Serialized this would take 0.5s
+    print(f"✅ Sessions run concurrently ({elapsed:.2f}s for 5)")
+
+def test_cancelled_turns_release_the_lane():
+    """A running or queued turn that is cancelled (client gone) never wedges the session"""
+    lanes = SessionLanes()
+    order = []
+
+    async def turn(name, hold):
+        async with lanes.turn("s1"):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    async def run():
+        first = asyncio.create_task(turn("first", 1.0))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(turn("queued", 0.0))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        first.cancel()
+        await asyncio.gather(first, queued, return_exceptions=True)
+        await asyncio.wait_for(turn("next", 0.0), timeout=0.5)
+
+    asyncio.run(run())
+    assert order == ["first", "next"]
+    assert lanes.snapshot()["active"] == 0
+    print("✅ Cancelled turns release the lane")
+
+if __name__ == "__main__":
+    test_burst_runs_only_first_and_latest()
+    test_default_endpoint_path_keeps_the_running_turn()
+    test_queued_job_is_never_superseded()
+    test_sessions_do_not_wait_for_each_other()
+    test_cancelled_turns_release_the_lane()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Single-flight test - identical in-flight provider calls share one request
+Uses a Groq provider backed by httpx.MockTransport, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from providers.base import ProviderConfig
+from providers.groq_provider import GroqProvider
+from providers.provider_registry import ProviderRegistry, ServiceType
+from providers.single_flight import SingleFlight, flight_key
+
+def _counting_registry(calls):
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    registry = ProviderRegistry()
+    provider = GroqProvider(ProviderConfig(
+        name="groq", api_key="test", base_url="http://mock", max_retries=0,
+        default_models={"llm": "llama-3.1-8b-instant"}
+    ))
+    provider._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    registry.providers = {"groq": provider}
+    return registry
+
+def test_flight_key_digests_payloads():
+    """Equal bytes payloads produce equal keys, different ones do not"""
+    assert flight_key("vlm", "locate_ui_element", screenshot=b"png") == flight_key("vlm", "locate_ui_element", screenshot=b"png")
+    assert flight_key("vlm", "locate_ui_element", screenshot=b"png") != flight_key("vlm", "locate_ui_element", screenshot=b"jpg")
+    print("✅ Flight keys")
+
+def test_duplicates_share_one_request():
+    """Concurrent identical calls hit the provider once and get independent copies"""
+    calls = []
+    registry = _counting_registry(calls)
+
+    async def run():
+        call = lambda prompt: registry.execute_with_fallback(
+            ServiceType.LLM, "generate_response", provider_name="groq", prompt=prompt
+        )
+        return await asyncio.gather(call("open settings"), call("open settings"), call("go home"))
+
+    first, duplicate, other = asyncio.run(run())
+    assert len(calls) == 2
+    assert first == duplicate and first is not duplicate
+    assert other["success"]
+    assert registry.single_flight.snapshot()["coalesced"] == 1
+    print("✅ Duplicates coalesced")
+
+def test_one_waiter_cancelling_keeps_call_alive():
+    """A cancelled duplicate does not cancel the shared call for the other caller"""
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return {"value": 1}
+
+    async def run():
+        leaving = asyncio.create_task(flights.do("k", work))
+        staying = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        leaving.cancel()
+        return await staying
+
+    assert asyncio.run(run()) == {"value": 1}
+    print("✅ Shared call survives one cancellation")
+
+if __name__ == "__main__":
+    test_flight_key_digests_payloads()
+    test_duplicates_share_one_request()
+    test_one_waiter_cancelling_keeps_call_alive()
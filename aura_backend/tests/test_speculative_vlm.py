@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Speculative VLM test - screenshot analysis overlaps intent analysis and is
+reused when the intent needs the screen, cancelled when it does not
+Analyzers are replaced with timed stubs, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nodes.intent_node import intent_node
+from nodes.vlm_node import vlm_node
+from optimized_intent_analyzer import optimized_intent_analyzer
+from optimized_vlm_analyzer import optimized_vlm_analyzer
+from utils.speculation import SpeculativeTasks, speculative_vlm
+
+def _stub_analyzers(requires_screen, delay=0.2):
+    """Intent and VLM analysis that each take `delay` seconds; returns the list of VLM calls"""
+    vlm_calls = []
+
+    async def analyze_intent(transcript, ui_tree=None, llm_service=None):
+        await asyncio.sleep(delay)
+        return {"intent": transcript, "action_type": "tap", "requires_screen_analysis": requires_screen}
+
+    async def analyze_screenshot(screenshot_bytes, intent, action_type="", vlm_service=None):
+        vlm_calls.append(intent)
+        await asyncio.sleep(delay)
+        return {"found": True, "x": 10, "y": 20, "confidence": 0.9}
+
+    optimized_intent_analyzer.analyze_intent_optimized = analyze_intent
+    optimized_vlm_analyzer.analyze_screenshot_optimized = analyze_screenshot
+    return vlm_calls
+
+def _restore_analyzers():
+    """Drop the instance-level stubs so the real methods are used again"""
+    del optimized_intent_analyzer.analyze_intent_optimized
+    del optimized_vlm_analyzer.analyze_screenshot_optimized
+
+def test_speculative_tasks_counters():
+    """Claimed tasks count as hits, discarded ones are cancelled and count as waste"""
+    tasks = SpeculativeTasks("test")
+
+    async def run():
+        tasks.start("a", asyncio.sleep(0.01, result="done"))
+        tasks.start("b", asyncio.sleep(10))
+        pending = tasks._tasks["b"]
+        assert await tasks.claim("a") == "done"
+        tasks.discard("b")
+        await asyncio.sleep(0)
+        return pending
+
+    pending = asyncio.run(run())
+    assert pending.cancelled()
+    snapshot = tasks.snapshot()
+    assert snapshot["hits"] == 1 and snapshot["wasted"] == 1 and snapshot["hit_rate"] == 0.5
+    print("✅ Speculative task counters")
+
+def test_vlm_overlaps_intent():
+    """With a screen intent, VLM reuses the speculative result instead of starting after intent"""
+    vlm_calls = _stub_analyzers(requires_screen=True)
+    hits_before = speculative_vlm.hits
+    state = {"transcript": "tap send", "_screenshot_bytes": b"png", "request_id": "overlap"}
+
+    async def run():
+        start = time.monotonic()
+        after_intent = {**state, **await intent_node.run(state)}  # Nodes return deltas
+        result = await vlm_node.run(after_intent)
+        return result, time.monotonic() - start
+
+    try:
+        result, elapsed = asyncio.run(run())
+    finally:
+        _restore_analyzers()
+    assert result["vlm_result"]["_speculative"] and result["vlm_result"]["found"]
+    assert vlm_calls == ["tap send"]
+    assert elapsed < 0.35  # Both stages take 0.2s; sequentially this would be 0.4s
+    assert speculative_vlm.hits == hits_before + 1
+    print(f"✅ VLM overlapped intent ({elapsed:.2f}s)")
+
+def test_speculation_cancelled_when_screen_not_needed():
+    """A non-screen intent cancels the speculative analysis"""
+    _stub_analyzers(requires_screen=False)
+    wasted_before = speculative_vlm.wasted
+    state = {"transcript": "what time is it", "_screenshot_bytes": b"png", "request_id": "no-screen"}
+
+    try:
+        result = asyncio.run(intent_node.run(state))
+    finally:
+        _restore_analyzers()
+    assert result["use_vlm"] is False
+    assert speculative_vlm.wasted == wasted_before + 1
+    assert "no-screen" not in speculative_vlm._tasks
+    print("✅ Speculation cancelled when screen not needed")
+
+if __name__ == "__main__":
+    test_speculative_tasks_counters()
+    test_vlm_overlaps_intent()
+    test_speculation_cancelled_when_screen_not_needed()
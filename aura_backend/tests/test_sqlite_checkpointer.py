@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+SQLite checkpointer test - sessions survive a restart (or another worker)
+on the same file, old checkpoints are pruned, large values are compressed
+and idle sessions expire
+Uses a small graph over AuraState and a temporary database, no API keys needed
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph.graph import StateGraph, END
+
+from checkpointers import SQLiteWALSaver
+from graph_state import AuraState, new_turn
+
+def _graph(saver):
+    """stt -> intent_analysis over AuraState; the intent node fails on 'crash'"""
+    async def stt(state):
+        return {"node_execution_times": {"stt": 0.1}}
+
+    async def intent(state):
+        if state["transcript"] == "crash":
+            raise RuntimeError("intent provider down")
+        return {"intent": state["transcript"], "node_execution_times": {"intent": 0.2}}
+
+    workflow = StateGraph(AuraState)
+    workflow.add_node("stt", stt)
+    workflow.add_node("intent_analysis", intent)
+    workflow.set_entry_point("stt")
+    workflow.add_edge("stt", "intent_analysis")
+    workflow.add_edge("intent_analysis", END)
+    return workflow.compile(checkpointer=saver)
+
+def _turn(graph, thread_id, text, **inputs):
+    config = {"configurable": {"thread_id": thread_id}}
+    return asyncio.run(graph.ainvoke(new_turn({"transcript": text, **inputs}), config=config))
+
+def test_state_survives_restart():
+    """A second saver on the same file (restart or another worker) resumes the session"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.db")
+        first = SQLiteWALSaver(path=path)
+        _turn(_graph(first), "s1", "open settings", session_id="kitchen")
+        first.close()
+
+        second = SQLiteWALSaver(path=path)
+        graph = _graph(second)
+        state = graph.get_state({"configurable": {"thread_id": "s1"}})
+        assert state.values["intent"] == "open settings" and state.values["session_id"] == "kitchen"
+
+        result = _turn(graph, "s1", "go home")
+        assert result["intent"] == "go home" and result["session_id"] is None
+        assert second.snapshot()["sessions"] == 1
+        assert second._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        second.close()
+    print("✅ State survives restart")
+
+def test_error_writes_are_committed():
+    """Writes from a failed step are durable even though no checkpoint follows them"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.db")
+        saver = SQLiteWALSaver(path=path)
+        try:
+            _turn(_graph(saver), "s1", "crash")
+            assert False, "expected the node error"
+        except RuntimeError:
+            pass
+
+        other_worker = SQLiteWALSaver(path=path)
+        pending = other_worker.get_tuple({"configurable": {"thread_id": "s1"}}).pending_writes
+        assert any(channel == "__error__" for _, channel, _ in pending)
+        saver.close()
+        other_worker.close()
+    print("✅ Error writes are committed")
+
+def test_writes_do_not_hold_the_write_lock():
+    """After a step's writes (and no checkpoint yet) another worker can still write straight away"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.db")
+        saver = SQLiteWALSaver(path=path)
+        config = {"configurable": {"thread_id": "s1", "checkpoint_ns": "", "checkpoint_id": "1"}}
+        asyncio.run(saver.aput_writes(config, [("intent", "open settings")], task_id="task-1"))
+
+        other_worker = sqlite3.connect(path, timeout=0.1)
+        other_worker.execute("INSERT OR REPLACE INTO threads VALUES (?, ?)", ("s2", time.time()))
+        other_worker.commit()
+        assert other_worker.execute("SELECT COUNT(*) FROM writes").fetchone()[0] == 1
+        other_worker.close()
+        saver.close()
+    print("✅ Writes do not hold the write lock")
+
+def test_pruning_and_compression():
+    """Only the newest checkpoints and the blobs they use are kept; large values are zlib-compressed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        saver = SQLiteWALSaver(path=os.path.join(tmp, "checkpoints.db"), max_checkpoints_per_session=3)
+        graph = _graph(saver)
+        ui_tree = "<node text='Settings' bounds='[0,0][100,100]'/>" * 200
+        for turn in range(5):
+            _turn(graph, "s1", f"turn {turn}", ui_tree=ui_tree)
+        blobs_after_5 = saver._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+        for turn in range(5, 15):
+            result = _turn(graph, "s1", f"turn {turn}", ui_tree=ui_tree)
+
+        assert result["intent"] == "turn 14" and result["ui_tree"] == ui_tree
+        assert saver.snapshot()["checkpoints"] == 3
+        assert saver._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] <= blobs_after_5
+        value_type, size = saver._conn.execute(
+            "SELECT type, LENGTH(value) FROM blobs WHERE channel = 'ui_tree' AND type != 'empty' LIMIT 1"
+        ).fetchone()
+        assert value_type.endswith("+zlib") and size < len(ui_tree) / 10
+        saver.close()
+    print("✅ Pruning and compression")
+
+def test_idle_sessions_expire_and_delete():
+    """Maintenance expires idle sessions; (a)delete_session frees one on request"""
+    with tempfile.TemporaryDirectory() as tmp:
+        saver = SQLiteWALSaver(path=os.path.join(tmp, "checkpoints.db"), session_ttl_seconds=0.05)
+        graph = _graph(saver)
+        _turn(graph, "idle", "open settings")
+        time.sleep(0.1)
+        _turn(graph, "active", "open settings")
+        saver.maintain()
+
+        snapshot = saver.snapshot()
+        assert snapshot["sessions"] == 1 and snapshot["evictions"]["ttl"] == 1
+        assert saver.get_tuple({"configurable": {"thread_id": "idle"}}) is None
+
+        assert asyncio.run(saver.adelete_session("active")) is True
+        assert saver.delete_session("active") is False
+        assert saver._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 0
+        saver.close()
+    print("✅ Idle sessions expire and delete")
+
+if __name__ == "__main__":
+    test_state_survives_restart()
+    test_error_writes_are_committed()
+    test_writes_do_not_hold_the_write_lock()
+    test_pruning_and_compression()
+    test_idle_sessions_expire_and_delete()
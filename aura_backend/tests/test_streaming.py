@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Streaming chat completion test - SSE parsing and fallback before the first chunk
+Uses Groq providers backed by httpx.MockTransport, no API keys needed
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from providers.base import ProviderConfig, ProviderError
+from providers.groq_provider import GroqProvider
+from providers.provider_registry import ProviderRegistry, ServiceConfig, ServiceType
+from optimized_intent_analyzer import OptimizedIntentAnalyzer
+
+def _sse(*deltas):
+    events = [f"data: {json.dumps({'choices': [{'delta': {'content': d}}]})}\n\n" for d in deltas]
+    return ("".join(events) + "data: [DONE]\n\n").encode()
+
+def _mock_provider(name, handler):
+    provider = GroqProvider(ProviderConfig(
+        name=name, api_key="test", base_url="http://mock", max_retries=0,
+        default_models={"llm": "llama-3.1-8b-instant"}
+    ))
+    provider._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return provider
+
+def _collect(stream):
+    async def run():
+        return [chunk async for chunk in stream]
+    return asyncio.run(run())
+
+def test_groq_sse_stream():
+    """Groq SSE deltas are yielded in order and the request asks for a stream"""
+    payloads = []
+
+    def handler(request):
+        payloads.append(json.loads(request.content))
+        return httpx.Response(200, content=_sse("Hel", "lo"))
+
+    provider = _mock_provider("groq", handler)
+    chunks = _collect(provider.stream_chat_completion([{"role": "user", "content": "hi"}]))
+    assert chunks == ["Hel", "lo"]
+    assert payloads[0]["stream"] is True
+    print("✅ Groq SSE stream")
+
+def test_registry_falls_back_before_first_chunk():
+    """A provider failing before any output is replaced by the next one"""
+    registry = ProviderRegistry()
+    registry.providers = {
+        "primary": _mock_provider("primary", lambda request: httpx.Response(500)),
+        "backup": _mock_provider("backup", lambda request: httpx.Response(200, content=_sse("ok")))
+    }
+    registry.service_configs[ServiceType.LLM] = ServiceConfig(
+        service_type=ServiceType.LLM, default_provider="primary", fallback_providers=["backup"]
+    )
+
+    chunks = _collect(registry.stream_with_fallback(
+        ServiceType.LLM, "stream_chat_completion", messages=[{"role": "user", "content": "hi"}]
+    ))
+    assert [c["delta"] for c in chunks] == ["ok"]
+    assert chunks[0]["provider_used"] == "backup"
+    print("✅ Fallback before first chunk")
+
+def test_registry_raises_when_all_fail():
+    """With no provider able to start, the stream raises ProviderError"""
+    registry = ProviderRegistry()
+    registry.providers = {"groq": _mock_provider("groq", lambda request: httpx.Response(500))}
+
+    try:
+        _collect(registry.stream_with_fallback(
+            ServiceType.LLM, "stream_chat_completion", provider_name="groq",
+            messages=[{"role": "user", "content": "hi"}]
+        ))
+        assert False, "expected ProviderError"
+    except ProviderError as e:
+        assert "500" in str(e)
+    print("✅ All providers failing raises")
+
+def test_first_complete_json():
+    """Partial output is acted on as soon as the JSON object closes"""
+    analyzer = OptimizedIntentAnalyzer()
+    assert analyzer._first_complete_json('{"intent": "open_app", "app') is None
+    assert analyzer._first_complete_json('```json\n{"a": "}", "b": {"c": 1}}\n```') == '{"a": "}", "b": {"c": 1}}'
+    print("✅ Early JSON completion")
+
+if __name__ == "__main__":
+    test_groq_sse_stream()
+    test_registry_falls_back_before_first_chunk()
+    test_registry_raises_when_all_fail()
+    test_first_complete_json()
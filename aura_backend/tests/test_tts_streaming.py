@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Streaming TTS test - chunked Groq speech and the buffered audio stream registry
+Uses httpx.MockTransport, no API keys needed
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from providers.base import ProviderConfig
+from providers.groq_provider import GroqProvider
+from utils.audio_streams import AudioStreamRegistry
+
+def test_groq_stream_speech_chunks():
+    """Groq audio is yielded in chunks rather than one buffered body"""
+    audio = b"RIFF" + b"\x00" * 10000
+    provider = GroqProvider(ProviderConfig(name="groq", api_key="test", base_url="http://mock", max_retries=0))
+    provider._http_client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, content=audio)
+    ))
+
+    async def run():
+        return [chunk async for chunk in provider.stream_speech("hello", chunk_size=4096)]
+
+    chunks = asyncio.run(run())
+    assert len(chunks) == 3
+    assert b"".join(chunks) == audio
+    print("✅ Groq speech streamed in chunks")
+
+def test_audio_stream_progressive_and_replay():
+    """Consumers get chunks as they are produced, late consumers replay from the start"""
+    registry = AudioStreamRegistry()
+
+    async def slow_source():
+        for chunk in (b"a", b"b", b"c"):
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    async def run():
+        stream_id = registry.start(slow_source())
+        stream = registry.get(stream_id)
+        first = await stream.iter_chunks().__anext__()
+        received_early = stream.done
+        live = [chunk async for chunk in stream.iter_chunks()]
+        replay = [chunk async for chunk in registry.get(stream_id).iter_chunks()]
+        return first, received_early, live, replay
+
+    first, received_early, live, replay = asyncio.run(run())
+    assert first == b"a" and not received_early
+    assert live == replay == [b"a", b"b", b"c"]
+    print("✅ Progressive audio stream with replay")
+
+def test_audio_stream_error_ends_stream():
+    """A failing source ends the stream and records the error"""
+    registry = AudioStreamRegistry()
+
+    async def failing_source():
+        yield b"a"
+        raise RuntimeError("provider dropped")
+
+    async def run():
+        stream = registry.get(registry.start(failing_source()))
+        chunks = [chunk async for chunk in stream.iter_chunks()]
+        return chunks, stream.error
+
+    chunks, error = asyncio.run(run())
+    assert chunks == [b"a"] and error == "provider dropped"
+    print("✅ Failed stream terminates")
+
+if __name__ == "__main__":
+    test_groq_stream_speech_chunks()
+    test_audio_stream_progressive_and_replay()
+    test_audio_stream_error_ends_stream()
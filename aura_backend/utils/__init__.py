@@ -1,15 +1,44 @@
 from .image_utils import (
     validate_image, 
+    validate_image_header,
     optimize_image, 
     get_image_info, 
     validate_audio, 
     estimate_audio_duration
 )
+from .audio_streams import AudioStream, AudioStreamRegistry, audio_streams
+from .speculation import SpeculativeTasks, speculative_vlm
+from .blob_store import BlobStore, BlobStoreFullError, blob_store
+from .prepared_inputs import PreparedInputs, prepared_screenshots, prepare_screenshot, load_screenshot
+from .request_tasks import SessionRequests, RequestCancelled, session_requests
+from .jobs import Job, JobStore, JobStoreFullError, job_store
+from .session_lanes import SessionLanes
 
 __all__ = [
     "validate_image",
+    "validate_image_header",
     "optimize_image", 
     "get_image_info",
     "validate_audio",
-    "estimate_audio_duration"
+    "estimate_audio_duration",
+    "AudioStream",
+    "AudioStreamRegistry",
+    "audio_streams",
+    "SpeculativeTasks",
+    "speculative_vlm",
+    "BlobStore",
+    "BlobStoreFullError",
+    "blob_store",
+    "PreparedInputs",
+    "prepared_screenshots",
+    "prepare_screenshot",
+    "load_screenshot",
+    "SessionRequests",
+    "RequestCancelled",
+    "session_requests",
+    "Job",
+    "JobStore",
+    "JobStoreFullError",
+    "job_store",
+    "SessionLanes"
 ]
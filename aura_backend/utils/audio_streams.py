@@ -0,0 +1,106 @@
+"""
+In-process registry of TTS audio streams.
+Synthesis starts as soon as a stream is registered and buffers its chunks,
+so a client that fetches the stream URL gets audio from the first chunk on.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import AsyncIterator, Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class AudioStream:
+    """Buffered audio produced by a background task, readable by any number of consumers"""
+
+    def __init__(self, stream_id: str, source: AsyncIterator[bytes]):
+        self.stream_id = stream_id
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._updated = asyncio.Event()
+        self._task = asyncio.create_task(self._produce(source))
+
+    async def _produce(self, source: AsyncIterator[bytes]):
+        try:
+            async for chunk in source:
+                self.chunks.append(chunk)
+                self._notify()
+        except asyncio.CancelledError:
+            self.error = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Audio stream {self.stream_id} failed: {str(e)}")
+            self.error = str(e)
+        finally:
+            self.done = True
+            self.finished_at = time.time()
+            self._notify()
+
+    def _notify(self):
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Yield every chunk from the start, waiting for new ones until synthesis finishes"""
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.done:
+                return
+            await self._updated.wait()
+
+    def cancel(self):
+        self._task.cancel()
+
+    @property
+    def size(self) -> int:
+        return sum(len(chunk) for chunk in self.chunks)
+
+class AudioStreamRegistry:
+    """Tracks live and recently finished audio streams, expiring them after a TTL"""
+
+    def __init__(self, ttl_seconds: float = 120.0, max_streams: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_streams = max_streams
+        self._streams: Dict[str, AudioStream] = {}
+
+    def start(self, source: AsyncIterator[bytes]) -> str:
+        """Start buffering a chunk iterator in the background and return its stream id"""
+        self._expire()
+        # Drop the oldest streams if clients never come back for them
+        while len(self._streams) >= self.max_streams:
+            oldest_id = next(iter(self._streams))
+            self._streams.pop(oldest_id).cancel()
+        
+        stream_id = uuid.uuid4().hex
+        self._streams[stream_id] = AudioStream(stream_id, source)
+        return stream_id
+
+    def get(self, stream_id: str) -> Optional[AudioStream]:
+        self._expire()
+        return self._streams.get(stream_id)
+
+    def _expire(self):
+        now = time.time()
+        for stream_id, stream in list(self._streams.items()):
+            if now - stream.created_at > self.ttl_seconds:
+                stream.cancel()
+                del self._streams[stream_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._expire()
+        return {
+            "streams": len(self._streams),
+            "active": sum(1 for stream in self._streams.values() if not stream.done),
+            "buffered_bytes": sum(stream.size for stream in self._streams.values())
+        }
+
+# Global registry instance
+audio_streams = AudioStreamRegistry()
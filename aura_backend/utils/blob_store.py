@@ -0,0 +1,136 @@
+"""
+Request-scoped store for media bytes (audio, screenshots).
+Graph state carries only content-addressed handles, so checkpoints stay small;
+nodes resolve a handle when they need the bytes and the request releases its
+blobs when it ends. Blobs beyond the memory cap spill to files (tmpfs when
+available).
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+HANDLE_PREFIX = "blob:sha256:"
+
+class BlobStoreFullError(Exception):
+    """The memory cap is reached and spilling to disk is disabled"""
+
+@dataclass
+class _Blob:
+    size: int
+    data: Optional[bytes] = None  # None once spilled
+    path: Optional[str] = None
+    owners: Set[str] = field(default_factory=set)
+
+def _default_spill_dir() -> str:
+    """tmpfs if the host has one, else the system temp dir"""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+class BlobStore:
+    """Content-addressed bytes shared by the requests that own them"""
+
+    def __init__(self, max_memory_bytes: int = 64 * 1024 * 1024, spill_dir: Optional[str] = None):
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_dir = os.path.join(spill_dir, f"aura_blobs_{os.getpid()}") if spill_dir else None
+        self._blobs: Dict[str, _Blob] = {}
+        # Owner -> handles it holds, so releasing a request touches only its own blobs
+        self._owned: Dict[str, Set[str]] = {}
+        self.memory_bytes = 0
+        self.spilled_bytes = 0
+        self.spills = 0
+
+    def put(self, data: bytes, owner: str) -> str:
+        """Store bytes for a request and return their handle; identical bytes are stored once"""
+        handle = HANDLE_PREFIX + hashlib.sha256(data).hexdigest()
+        blob = self._blobs.get(handle)
+        if blob is None:
+            blob = _Blob(size=len(data))
+            if self.memory_bytes + blob.size <= self.max_memory_bytes:
+                blob.data = data
+                self.memory_bytes += blob.size
+            else:
+                blob.path = self._spill(handle, data)
+                self.spilled_bytes += blob.size
+            self._blobs[handle] = blob
+        blob.owners.add(owner)
+        self._owned.setdefault(owner, set()).add(handle)
+        return handle
+
+    def get(self, handle: Optional[str]) -> Optional[bytes]:
+        """Bytes for a handle, or None if it was never stored or is already released
+
+        A spilled blob is read with blocking file I/O; code on the event loop uses aget().
+        """
+        blob = self._blobs.get(handle) if handle else None
+        if blob is None:
+            return None
+        if blob.data is not None:
+            return blob.data
+        with open(blob.path, "rb") as spilled:
+            return spilled.read()
+
+    async def aget(self, handle: Optional[str]) -> Optional[bytes]:
+        """get() for the event loop: a spilled blob is read in a worker thread"""
+        blob = self._blobs.get(handle) if handle else None
+        if blob is None:
+            return None
+        if blob.data is not None:
+            return blob.data
+        try:
+            return await asyncio.to_thread(self.get, handle)
+        except FileNotFoundError:
+            return None  # Released while being read
+
+    def release(self, owner: Optional[str]):
+        """Drop a request's references; blobs no other request holds are freed"""
+        for handle in self._owned.pop(owner, ()):
+            blob = self._blobs[handle]
+            blob.owners.discard(owner)
+            if not blob.owners:
+                self._free(handle, blob)
+
+    def _spill(self, handle: str, data: bytes) -> str:
+        if not self.spill_dir:
+            raise BlobStoreFullError(
+                f"Blob store is full ({self.memory_bytes} of {self.max_memory_bytes} bytes in memory)"
+            )
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, handle[len(HANDLE_PREFIX):])
+        with open(path, "wb") as spilled:
+            spilled.write(data)
+        self.spills += 1
+        logger.info(f"Blob store over {self.max_memory_bytes} bytes, spilled {len(data)} bytes to {path}")
+        return path
+
+    def _free(self, handle: str, blob: _Blob):
+        del self._blobs[handle]
+        if blob.data is not None:
+            self.memory_bytes -= blob.size
+            return
+        self.spilled_bytes -= blob.size
+        try:
+            os.remove(blob.path)
+        except OSError as e:
+            logger.warning(f"Could not remove spilled blob {blob.path}: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Occupancy of the store"""
+        return {
+            "blobs": len(self._blobs),
+            "memory_bytes": self.memory_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+            "spilled_bytes": self.spilled_bytes,
+            "spills": self.spills
+        }
+
+# Media for in-flight graph runs
+blob_store = BlobStore(
+    max_memory_bytes=int(float(os.getenv("BLOB_STORE_MAX_MB", "64")) * 1024 * 1024),
+    spill_dir=_default_spill_dir() if os.getenv("BLOB_STORE_SPILL", "true").lower() == "true" else None
+)
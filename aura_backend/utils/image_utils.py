@@ -14,6 +14,15 @@ def validate_image(image_data: bytes) -> bool:
         logger.error(f"Image validation failed: {str(e)}")
         return False
 
+def validate_image_header(image_data: bytes) -> bool:
+    """Cheap check that the data starts like an image PIL can read (header only, no pixel decoding)"""
+    try:
+        with Image.open(io.BytesIO(image_data)) as img:
+            return bool(img.format) and img.size[0] > 0 and img.size[1] > 0
+    except Exception as e:
+        logger.warning(f"Image header check failed: {str(e)}")
+        return False
+
 def optimize_image(image_data: bytes, max_size: tuple = (1920, 1080), quality: int = 85) -> bytes:
     """Optimize image for VLM processing"""
     try:
@@ -0,0 +1,198 @@
+"""
+Background jobs for /process?mode=async.
+The graph run is decoupled from the client connection: the endpoint returns a
+job id straight away, a bounded pool of workers runs the graph, and the client
+polls GET /jobs/{id} for partial results (transcript, intent, plan) as nodes
+finish, or is notified at a callback URL when the job ends.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from .request_tasks import RequestCancelled
+
+logger = logging.getLogger(__name__)
+
+# Node outputs a polling client can use before the job finishes
+PARTIAL_KEYS = ("transcript", "intent", "action_plan", "response_text", "tts_stream_id")
+
+class JobStoreFullError(Exception):
+    """Every retained job is still queued or running"""
+
+class Job:
+    """One background graph run and what is known about it so far"""
+
+    def __init__(self, session_id: Optional[str], callback_url: Optional[str]):
+        self.job_id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.callback_url = callback_url
+        self.status = "queued"
+        self.partial: Dict[str, Any] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.callback_status: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def update(self, delta: Dict[str, Any]):
+        """Record a node's output; only the keys a client can act on are kept"""
+        self.partial.update({key: delta[key] for key in PARTIAL_KEYS if delta.get(key) is not None})
+
+    def view(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "session_id": self.session_id,
+            "partial": dict(self.partial),
+            "result": self.result,
+            "error": self.error,
+            "callback_status": self.callback_status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+class JobStore:
+    """Runs jobs on a bounded number of workers and keeps finished ones for polling until a TTL or count limit"""
+
+    def __init__(
+        self,
+        max_jobs: int = 500,
+        ttl_seconds: float = 600.0,
+        max_concurrency: int = 8,
+        callback_timeout: float = 5.0,
+        callback_hosts: Iterable[str] = (),
+        callback_transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self.max_concurrency = max_concurrency
+        self.callback_timeout = callback_timeout
+        # Empty disables callbacks, so clients can't make the server call internal or arbitrary URLs
+        self.callback_hosts = {host.lower() for host in callback_hosts}
+        self.callback_transport = callback_transport
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "rejected": 0, "expired": 0}
+
+    def submit(
+        self,
+        work: Callable[[Job], Awaitable[Dict[str, Any]]],
+        session_id: Optional[str] = None,
+        callback_url: Optional[str] = None
+    ) -> Job:
+        """Queue work(job) and return the job; raises ValueError for a bad callback URL, JobStoreFullError when full"""
+        if callback_url:
+            self._check_callback_url(callback_url)
+        self._expire(make_room=True)
+        if len(self._jobs) >= self.max_jobs:
+            self.stats["rejected"] += 1
+            raise JobStoreFullError(f"{len(self._jobs)} jobs are still queued or running")
+
+        if self._slots is None:
+            # Created lazily so it binds to the running event loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        job = Job(session_id, callback_url)
+        self._jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job, work))
+        self.stats["submitted"] += 1
+        logger.info(f"Job {job.job_id} queued for session {session_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: Job, work: Callable[[Job], Awaitable[Dict[str, Any]]]):
+        try:
+            async with self._slots:
+                job.status = "running"
+                job.started_at = time.time()
+                job.result = await work(job)
+                job.status = "completed"
+        except RequestCancelled as e:
+            # A newer request for the session took over
+            job.status = "cancelled"
+            job.error = str(e)
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            job.error = "Server shutting down"
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {str(e)}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            self.stats[job.status] += 1
+            logger.info(f"Job {job.job_id} {job.status} {job.finished_at - job.created_at:.2f}s after submission")
+
+        if job.callback_url:
+            await self._send_callback(job)
+
+    async def _send_callback(self, job: Job):
+        """POST the finished job to its callback URL; one attempt, the job stays pollable either way"""
+        try:
+            async with httpx.AsyncClient(timeout=self.callback_timeout, transport=self.callback_transport) as client:
+                response = await client.post(job.callback_url, json=job.view())
+            job.callback_status = "delivered" if response.is_success else f"http {response.status_code}"
+        except httpx.HTTPError as e:
+            job.callback_status = f"error: {type(e).__name__}"
+        if job.callback_status != "delivered":
+            logger.warning(f"Job {job.job_id} callback to {job.callback_url} failed ({job.callback_status})")
+
+    def _check_callback_url(self, url: str):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError(f"Invalid callback URL: {url}")
+        if not self.callback_hosts:
+            raise ValueError("Callback URLs are disabled on this server (JOB_CALLBACK_HOSTS is not set)")
+        if parsed.hostname.lower() not in self.callback_hosts:
+            raise ValueError(f"Callback host not allowed: {parsed.hostname}")
+
+    def _expire(self, make_room: bool = False):
+        """Drop finished jobs past the TTL and, to make room for a new job, the oldest finished ones"""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in finished:
+            if now - job.finished_at > self.ttl_seconds or (make_room and len(self._jobs) >= self.max_jobs):
+                del self._jobs[job.job_id]
+                self.stats["expired"] += 1
+
+    async def shutdown(self):
+        """Cancel jobs that are still queued or running"""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retained jobs by status and lifetime counters"""
+        self._expire()
+        by_status: Dict[str, int] = {}
+        for job in self._jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {"jobs": len(self._jobs), "max_jobs": self.max_jobs, "max_concurrency": self.max_concurrency,
+                "by_status": by_status, **self.stats}
+
+# Background /process runs (JOB_MAX_JOBS, JOB_TTL_SECONDS, JOB_MAX_CONCURRENCY, JOB_CALLBACK_HOSTS)
+job_store = JobStore(
+    max_jobs=int(os.getenv("JOB_MAX_JOBS", "500")),
+    ttl_seconds=float(os.getenv("JOB_TTL_SECONDS", "600")),
+    max_concurrency=int(os.getenv("JOB_MAX_CONCURRENCY", "8")),
+    callback_hosts=[host.strip() for host in os.getenv("JOB_CALLBACK_HOSTS", "").split(",") if host.strip()]
+)
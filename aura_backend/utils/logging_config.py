@@ -0,0 +1,174 @@
+"""
+Logging setup that keeps log I/O off the request path.
+Records are filtered and sampled on the calling thread, then handed to a queue;
+a background listener thread formats them (text or JSON) and writes them out.
+Expensive payloads are wrapped in `lazy`/`lazy_json` so they are only rendered
+for records that are actually emitted.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from typing import IO, Any, Callable, Dict, Iterable, Optional
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+class lazy:
+    """Log argument rendered only when the record is formatted: logger.debug("plan: %s", lazy(render, plan))"""
+
+    def __init__(self, func: Callable[..., Any], *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args, **self.kwargs))
+
+def _compact(value: Any, exclude: Iterable[str]) -> str:
+    if isinstance(value, dict):
+        value = {key: item for key, item in value.items() if key not in exclude}
+    return json.dumps(value, default=lambda item: f"<{type(item).__name__}>")
+
+def lazy_json(value: Any, exclude: Iterable[str] = ()) -> lazy:
+    """JSON rendering of a payload (minus excluded keys), deferred until the record is emitted"""
+    return lazy(_compact, value, tuple(exclude))
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of low-level records from chatty loggers, by logger-name prefix"""
+
+    def __init__(self, rates: Dict[str, float], max_level: int = logging.DEBUG):
+        super().__init__()
+        # Longest prefix first so "providers.groq_provider" wins over "providers"
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.max_level = max_level
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                if random.random() < rate:
+                    return True
+                self.dropped += 1
+                return False
+        return True
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers formatting to the listener thread and drops records when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue is in-process, so the record doesn't need to be flattened to a string here;
+        # only the traceback is rendered now, while the frames still exist
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line with timestamp, level, logger, message and any `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """'aura_graph=0.1,providers=0.05' -> {"aura_graph": 0.1, "providers": 0.05}"""
+    rates = {}
+    for part in filter(None, (item.strip() for item in spec.split(","))):
+        name, _, rate = part.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[AsyncQueueHandler] = None
+_root_handler: Optional[logging.Handler] = None
+_sampler: Optional[SamplingFilter] = None
+
+def configure_logging(
+    level: Optional[str] = None,
+    json_format: Optional[bool] = None,
+    async_logging: Optional[bool] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    queue_size: Optional[int] = None,
+    stream: Optional[IO] = None
+):
+    """Install the root handler; arguments default to LOG_LEVEL, LOG_FORMAT, LOG_ASYNC, LOG_SAMPLE_RATES, LOG_QUEUE_SIZE"""
+    global _listener, _queue_handler, _sampler, _root_handler
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    if json_format is None:
+        json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
+    if async_logging is None:
+        async_logging = os.getenv("LOG_ASYNC", "true").lower() == "true"
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+    queue_size = queue_size or int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+    shutdown_logging()
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JSONFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+    _sampler = SamplingFilter(sample_rates)
+
+    if async_logging:
+        _queue_handler = AsyncQueueHandler(queue.Queue(maxsize=queue_size))
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, stream_handler)
+        _listener.start()
+        handler = _queue_handler
+    else:
+        handler = stream_handler
+    handler.addFilter(_sampler)
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    _root_handler = handler
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+def shutdown_logging():
+    """Flush queued records, stop the listener thread and remove the root handler"""
+    global _listener, _queue_handler, _root_handler
+    if _root_handler is not None:
+        logging.getLogger().removeHandler(_root_handler)
+        _root_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    _queue_handler = None
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Records dropped by sampling and by a full queue"""
+    return {
+        "async": _queue_handler is not None,
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped_full_queue": _queue_handler.dropped if _queue_handler else 0,
+        "dropped_sampled": _sampler.dropped if _sampler else 0
+    }
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,70 @@
+"""
+Request inputs prepared in the background.
+The endpoint starts preprocessing (e.g. screenshot validation and re-encoding)
+as soon as an upload is read; graph nodes await the prepared result only when
+they need it, so the work overlaps with STT instead of delaying it.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, Optional
+
+from .image_utils import validate_image, optimize_image, get_image_info
+from .blob_store import blob_store
+
+logger = logging.getLogger(__name__)
+
+class PreparedInputs:
+    """Preprocessing tasks keyed by request id, shared by every node that awaits them"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, request_id: str, work: Awaitable[Any]):
+        """Start preparing an input for a request"""
+        self._tasks[request_id] = asyncio.create_task(work)
+
+    def has(self, request_id: Optional[str]) -> bool:
+        """True if an input is being (or has been) prepared for the request"""
+        return request_id in self._tasks
+
+    async def get(self, request_id: Optional[str]) -> Optional[Any]:
+        """Wait for the prepared input; None if there is none for the request"""
+        task = self._tasks.get(request_id)
+        if task is None:
+            return None
+        # Shielded so a cancelled consumer (e.g. speculative VLM) doesn't cancel it for the others
+        return await asyncio.shield(task)
+
+    def release(self, request_id: Optional[str]):
+        """Drop a request's input once the request is finished"""
+        task = self._tasks.pop(request_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Number of inputs held for in-flight requests"""
+        return {"in_flight": len(self._tasks)}
+
+async def prepare_screenshot(screenshot_data: bytes) -> Dict[str, Any]:
+    """Validate and optimize a screenshot off the event loop; {"bytes", "info"} or {"error"}"""
+    if not await asyncio.to_thread(validate_image, screenshot_data):
+        return {"error": "Invalid image format"}
+    optimized = await asyncio.to_thread(optimize_image, screenshot_data)
+    info = await asyncio.to_thread(get_image_info, optimized)
+    logger.info(f"Screenshot processed: {info}")
+    return {"bytes": optimized, "info": info}
+
+async def load_screenshot(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Screenshot bytes for a graph run, waiting for background preparation if needed"""
+    screenshot_bytes = await blob_store.aget(state.get("screenshot_blob"))
+    if screenshot_bytes:
+        return {"bytes": screenshot_bytes}
+    if state.get("_screenshot_bytes"):
+        return {"bytes": state["_screenshot_bytes"]}
+    prepared = await prepared_screenshots.get(state.get("request_id"))
+    return prepared or {"error": "No screenshot data available for VLM analysis"}
+
+# Screenshots uploaded to /process
+prepared_screenshots = PreparedInputs("screenshot")
@@ -0,0 +1,97 @@
+"""
+In-flight graph runs per session.
+A run is cancelled when its client disconnects, or (with pre-emption on) when
+a newer request for the same session supersedes it; the cancellation
+propagates through the graph into any provider HTTP call still in flight, so
+no quota is spent on a response nobody will read.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+class RequestCancelled(Exception):
+    """A graph run was cancelled before it finished; reason is 'disconnected' or 'superseded'"""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Request {reason}")
+        self.reason = reason
+
+async def wait_for_disconnect(receive: Callable[[], Awaitable[Dict[str, Any]]]):
+    """Return once the ASGI receive channel reports that the client went away"""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+class SessionRequests:
+    """Runs graph work as a task per session, cancelled on client disconnect or pre-empted by a newer request"""
+
+    def __init__(self, preempt: bool = False):
+        self.preempt = preempt
+        self._running: Dict[str, asyncio.Task] = {}
+        # Runs a newer request must never cancel (async jobs the client is polling for)
+        self._pinned: Set[asyncio.Task] = set()
+        # Task -> why we cancelled it, so its CancelledError can be told apart from our own
+        self._reasons: Dict[asyncio.Task, str] = {}
+        self.stats = {"completed": 0, "disconnected": 0, "superseded": 0}
+
+    async def run(
+        self,
+        session_id: str,
+        work: Awaitable[Any],
+        receive: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+        preemptible: bool = True
+    ) -> Any:
+        """Await work for a session; raises RequestCancelled if the client left or a newer request took over"""
+        previous = self._running.get(session_id)
+        if self.preempt and previous is not None and not previous.done() and previous not in self._pinned:
+            logger.info(f"Newer request for session {session_id}, cancelling the one in flight")
+            self._cancel(previous, "superseded")
+
+        task = asyncio.create_task(work)
+        self._running[session_id] = task
+        if not preemptible:
+            self._pinned.add(task)
+        watcher = asyncio.create_task(wait_for_disconnect(receive)) if receive else None
+        try:
+            await asyncio.wait({task, watcher} - {None}, return_when=asyncio.FIRST_COMPLETED)
+            if not task.done():
+                logger.info(f"Client for session {session_id} disconnected, cancelling its request")
+                self._cancel(task, "disconnected")
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                reason = self._reasons.pop(task, None)
+                if reason is None:
+                    raise
+                raise RequestCancelled(reason) from None
+            self.stats["completed"] += 1
+            return result
+        except asyncio.CancelledError:
+            # The endpoint itself was cancelled (e.g. server shutdown) - take the work down with it
+            task.cancel()
+            raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            self._reasons.pop(task, None)
+            self._pinned.discard(task)
+            if self._running.get(session_id) is task:
+                del self._running[session_id]
+
+    def _cancel(self, task: asyncio.Task, reason: str):
+        self._reasons[task] = reason
+        self.stats[reason] += 1
+        task.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """In-flight runs and how earlier ones ended"""
+        return {"preempt": self.preempt, "in_flight": len(self._running), **self.stats}
+
+# Off by default: turns on a session are then queued by AuraGraph's session lanes, which only drop
+# turns still waiting. PREEMPT_SESSION_REQUESTS=true also cancels the running /process or /chat turn.
+session_requests = SessionRequests(preempt=os.getenv("PREEMPT_SESSION_REQUESTS", "false").lower() == "true")
@@ -0,0 +1,84 @@
+"""
+Per-session turn queue.
+Turns on the same session share a checkpointer thread, so they run one at a
+time. While a turn runs, only the newest waiting turn is kept: an older one
+still waiting is dropped, so under bursty voice traffic only the latest
+command spends provider quota. Pinned turns (async jobs a client is polling
+for) are never dropped; newer turns queue behind them instead.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Tuple
+
+from .request_tasks import RequestCancelled
+
+logger = logging.getLogger(__name__)
+
+class _Lane:
+    def __init__(self):
+        self.busy = False
+        # (future, pinned) in arrival order; at most one unpinned waiter is still pending
+        self.waiters: Deque[Tuple[asyncio.Future, bool]] = deque()
+
+class SessionLanes:
+    """One turn at a time per session; a newer turn replaces the unpinned one waiting behind the running turn"""
+
+    def __init__(self):
+        self._lanes: Dict[str, _Lane] = {}
+        self.stats = {"immediate": 0, "queued": 0, "superseded": 0}
+
+    @asynccontextmanager
+    async def turn(self, key: str, preemptible: bool = True):
+        """Hold the session's lane for a turn; raises RequestCancelled('superseded') if a newer turn replaces this one
+
+        A turn with preemptible=False is never superseded while it waits.
+        """
+        lane = self._lanes.setdefault(key, _Lane())
+        if not lane.busy:
+            lane.busy = True
+            self.stats["immediate"] += 1
+        else:
+            for waiter, pinned in list(lane.waiters):
+                if not pinned and not waiter.done():
+                    logger.info(f"Newer turn for session {key}, dropping the one still queued")
+                    waiter.set_exception(RequestCancelled("superseded"))
+                    lane.waiters.remove((waiter, pinned))
+                    self.stats["superseded"] += 1
+            waiter = asyncio.get_running_loop().create_future()
+            entry = (waiter, not preemptible)
+            lane.waiters.append(entry)
+            self.stats["queued"] += 1
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if entry in lane.waiters:
+                    lane.waiters.remove(entry)
+                if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                    self._release(key, lane)  # The lane was handed over just as we were cancelled
+                raise
+        try:
+            yield
+        finally:
+            self._release(key, lane)
+
+    def _release(self, key: str, lane: _Lane):
+        """Hand the lane to the next waiting turn, or free it"""
+        while lane.waiters:
+            waiter, _ = lane.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        lane.busy = False
+        if self._lanes.get(key) is lane:
+            del self._lanes[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Busy sessions, turns waiting behind them and how turns got their lane"""
+        return {
+            "active": len(self._lanes),
+            "waiting": sum(1 for lane in self._lanes.values() for waiter, _ in lane.waiters if not waiter.done()),
+            **self.stats
+        }
@@ -0,0 +1,71 @@
+"""
+Speculative background tasks scoped to a request.
+Work that is probably needed later in the graph (e.g. screenshot analysis)
+starts early, and is either claimed by the node that needs it or discarded.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class SpeculativeTasks:
+    """Background tasks keyed by request id, claimed when needed or cancelled when not"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.hits = 0
+        self.wasted = 0
+        self.failed = 0
+
+    def start(self, request_id: str, work: Awaitable[Any]) -> bool:
+        """Start work for a request; False if one is already running for it"""
+        if request_id in self._tasks:
+            work.close()
+            return False
+        self._tasks[request_id] = asyncio.create_task(work)
+        self.started += 1
+        logger.info(f"Speculative {self.name} started for request {request_id}")
+        return True
+
+    def claim(self, request_id: str) -> Optional[asyncio.Task]:
+        """Take the speculative task for a request (counted as a hit), or None"""
+        task = self._tasks.pop(request_id, None)
+        if task is not None:
+            self.hits += 1
+        return task
+
+    def discard(self, request_id: str):
+        """Cancel an unclaimed speculative task (counted as waste)"""
+        task = self._tasks.pop(request_id, None)
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Discarded speculative {self.name} had failed: {task.exception()}")
+        self.wasted += 1
+        logger.info(f"Speculative {self.name} for request {request_id} was not needed")
+
+    def record_failure(self):
+        """A claimed task failed and the work had to be redone"""
+        self.failed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Speculation counters and hit/waste rates"""
+        resolved = self.hits + self.wasted
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "wasted": self.wasted,
+            "failed": self.failed,
+            "in_flight": len(self._tasks),
+            "hit_rate": round(self.hits / resolved, 3) if resolved else 0.0,
+            "waste_rate": round(self.wasted / resolved, 3) if resolved else 0.0
+        }
+
+# Screenshot analysis started alongside intent analysis
+speculative_vlm = SpeculativeTasks("vlm")